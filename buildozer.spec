@@ -13,7 +13,7 @@ package.domain = org.trea
 source.dir = .
 
 # (list) Source files to include (let empty to include all the files)
-source.include_exts = py,png,PNG,jpg,kv,atlas,ttf,json
+source.include_exts = py,png,PNG,jpg,kv,atlas,ttf,json,tmap
 
 # (list) List of inclusions using pattern matching
 #source.include_patterns = assets/*,images/*.png
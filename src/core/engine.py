@@ -8,7 +8,10 @@ import base64
 from src.systems.character.player import Player, Profession
 from src.systems.character.cultivation import BodyCultivation
 from src.systems.world.map import Map
+from src.systems.world.spawner import SpawnManager
+from src.systems.world import loot
 from src.systems.world.monster import Monster
+from src.systems.world.targeting import quest_kill_targets
 from src.systems.combat.battle import BattleSystem
 from src.ui.renderer import Renderer
 from src.ui.windows import AttributeWindow, EquipmentWindow, InventoryWindow, SettingsWindow, DialogWindow, QuestWindow, SkillWindow, FloatingText, TreasureWindow, ShopWindow
@@ -22,10 +25,17 @@ from src.data.monsters_db import MONSTERS_DB
 import time
 
 from src.systems.combat.skills import SkillBook
+from src.systems.combat.aoe import area_targets
+from src.systems.combat.resolver import CombatResolver
+from src.systems.combat.cooldowns import CooldownManager
+from src.systems.combat.effects import StatusEffects
+from src.systems.combat.rotation import RotationPlanner
+from src.systems.equipment.auto_equip import AutoEquip
 from src.ui.skill import SkillAnimation
 
 from src.systems.network_manager import NetworkManager
 from src.core.input import handle_input as engine_handle_input
+from src.core.scheduler import Scheduler
 
 # Colors
 WHITE = (255, 255, 255)
@@ -192,6 +202,23 @@ class GameEngine:
         self.auto_save_enabled = False
         self.auto_save_interval = 5 # minutes
         self.last_save_time = time.time()
+
+        # Game-time timers (spawns etc.), advanced by the measured frame time every logic frame
+        self.scheduler = Scheduler()
+        self.max_frame_time = 0.25 # Longer frames (window drag, app in background) are clamped
+        self.spawner = None
+
+        # Hit / damage resolution (matchup tables cached per player stat revision)
+        self.combat = CombatResolver()
+
+        # Poison / fire wall / shields / buffs / root, ticked in batches on the scheduler
+        self.effects = StatusEffects(self.scheduler, get_player=lambda: self.player)
+        self.effects.on_kills = lambda monsters: self.handle_monster_deaths(monsters)
+        self.effects.start()
+
+        # Auto-pilot skill choice: every learned skill ranked against the target (False = active skill only)
+        self.rotation = RotationPlanner(self.combat, self.effects)
+        self.skill_rotation_enabled = True
         
         self.init_game_data()
         
@@ -227,6 +254,8 @@ class GameEngine:
         # Settings
         self.skip_recycle_confirmation = False
         self.auto_recycle_enabled = False # New auto recycle
+        self.auto_equip_enabled = False # Wear the best gear from each drop batch
+        self.auto_equip = AutoEquip()
         self.recycle_qualities = { # Default qualities to recycle
             "普通": False,
             "优良": False,
@@ -270,6 +299,7 @@ class GameEngine:
         self.save_btn_rect = None # Initialize
         self.logout_btn_rect = None # Initialize
         self.target_monster = None # Locked target for auto-pilot
+        self.target_policy = "nearest" # Auto-pilot targeting: nearest / lowest_hp / xp_per_second / quest_first
         self.mp_regen_timer = 0 # Timer for MP regeneration
         self.manual_target_pos = None # (x, y) for manual click movement
         
@@ -295,6 +325,18 @@ class GameEngine:
         if "装备" in self.windows:
             self.windows["装备"].game_engine = self
 
+    @property
+    def target_monster(self):
+        # Locked target is stored by entity ID, so liveness is an O(1) map lookup
+        target_id = getattr(self, 'target_monster_id', None)
+        if target_id is None:
+            return None
+        return self.current_map.get_monster(target_id)
+
+    @target_monster.setter
+    def target_monster(self, monster):
+        self.target_monster_id = monster.entity_id if monster else None
+
     def update_scaling(self):
         screen_w, screen_h = self.screen.get_size()
         
@@ -651,7 +693,9 @@ class GameEngine:
             self.auto_save_enabled = settings.get("enabled", False)
             self.auto_save_interval = settings.get("interval", 5)
             self.skip_recycle_confirmation = settings.get("skip_recycle_confirmation", False)
+            self.target_policy = settings.get("target_policy", "nearest")
             self.auto_recycle_enabled = settings.get("auto_recycle_enabled", False)
+            self.auto_equip_enabled = settings.get("auto_equip_enabled", False)
             saved_qualities = settings.get("recycle_qualities", {})
             if saved_qualities:
                 for k, v in saved_qualities.items():
@@ -688,7 +732,10 @@ class GameEngine:
         char_data = self.characters[slot_index]
         self.current_char_index = slot_index
         
+        # Effects are undone on the player that is leaving, before the switch
+        self.effects.reset()
         self.player = char_data["player"]
+        self.combat.invalidate()
         
         # Load Quest Manager
         if "quest_manager" in char_data and char_data["quest_manager"]:
@@ -699,10 +746,9 @@ class GameEngine:
         # Re-init map (Reset monsters)
         target_map_id = getattr(self.player, 'map_id', 'NoviceVillage')
         if not self.load_map(target_map_id):
-            self.current_map = Map("新手村", 1, width=20, height=15)
+            self.set_current_map(Map("新手村", 1, width=20, height=15))
             self.current_map.add_monster_type(Monster("稻草人", 1, 30, 5, 0, 10))
-            for _ in range(5):
-                self.current_map.spawn_monster()
+            self.start_spawner(None)
 
         # Update NPC Status
         self.update_npc_status()
@@ -732,48 +778,19 @@ class GameEngine:
         self.windows["商店"].player = self.player
         
         # Cleanup Debug Items (One-time fix for existing saves)
-        cleaned_items = [item for item in self.player.inventory.items if item and not item.name.startswith("测试剑")]
-        
-        if self.player.inventory.capacity < 1000:
-            self.player.inventory.capacity = 1000
-            
-        new_items = [None] * self.player.inventory.capacity
-        for i, item in enumerate(cleaned_items):
-            if i < len(new_items):
-                new_items[i] = item
-        self.player.inventory.items = new_items
+        # Only the occupied slots are touched, items keep their slots
+        inventory = self.player.inventory
+        inventory.remove_items(lambda item: item.name.startswith("测试剑"))
 
         # Inventory Backward Compatibility
-        if not hasattr(self.player.inventory, 'unlocked_pages'):
-            self.player.inventory.unlocked_pages = 1
-            self.player.inventory.page_size = 150
-            if self.player.inventory.capacity < 600:
-                self.player.inventory.capacity = 600
-                new_items = [None] * 600
-                for i, item in enumerate(self.player.inventory.items):
-                    if i < 600: new_items[i] = item
-                self.player.inventory.items = new_items
-
-        # Equipment Migration
-        for item in self.player.inventory.items:
-            if item:
-                if isinstance(item, Equipment):
-                    if not hasattr(item, 'enhancement_level'): item.enhancement_level = 0
-                    if not hasattr(item, 'durability'): item.durability = 100
-                    if not hasattr(item, 'max_durability'): item.max_durability = 100
-                
-                # General Item Migration (Cover all items including UpgradeStone)
-                if not hasattr(item, 'locked'): item.locked = False
-        
-        for slot, item in self.player.equipment.items():
-            if item:
-                if isinstance(item, Equipment):
-                    if not hasattr(item, 'enhancement_level'): item.enhancement_level = 0
-                    if not hasattr(item, 'durability'): item.durability = 100
-                    if not hasattr(item, 'max_durability'): item.max_durability = 100
-                
-                if not hasattr(item, 'locked'): item.locked = False
-        
+        if not hasattr(inventory, 'unlocked_pages'):
+            inventory.unlocked_pages = 1
+            inventory.page_size = 150
+        if inventory.capacity < 1000 or len(inventory.items) != inventory.capacity:
+            inventory.resize(max(1000, inventory.capacity))
+
+        # Item fields missing from old saves are filled in by Item.__setstate__ (ITEM_SCHEMA)
+
         # Player Attributes
         if not hasattr(self.player, 'attack_speed'): self.player.attack_speed = 0
         if not hasattr(self.player, 'cooldown_reduction'): self.player.cooldown_reduction = 0.0
@@ -804,27 +821,22 @@ class GameEngine:
              if not self.player.active_skill and self.player.skills:
                  self.player.active_skill = self.player.skills[0]
 
-        # Stackable Items
-        if hasattr(self.player, 'inventory') and hasattr(self.player.inventory, 'items'):
-             for item in self.player.inventory.items:
-                if item:
-                    if not hasattr(item, 'stackable'):
-                        if item.name == "强化石" or item.name == "神话强化石":
-                            item.stackable = True
-                            item.max_stack = 99999
-                        else:
-                            item.stackable = False
-                            item.max_stack = 1
-                    if not hasattr(item, 'count'): item.count = 1
-                        
-        if hasattr(self.player, 'equipment'):
-            for slot, item in self.player.equipment.items():
-                if item:
-                    if not hasattr(item, 'stackable'):
-                        item.stackable = False
-                        item.max_stack = 1
-                    if not hasattr(item, 'count'): item.count = 1
-        
+        # Skill area shapes / status effects (older saves pickled Skill objects without them)
+        fresh_book = SkillBook()
+        for sk in self.player.skills:
+            if sk and not (hasattr(sk, 'area') and hasattr(sk, 'effect')):
+                fresh = fresh_book.get_skill(sk.name)
+                sk.area = fresh.area if fresh else None
+                sk.effect = fresh.effect if fresh else None
+        if not all(hasattr(sk, 'effect') for sk in self.player.skill_book.skills.values()):
+            self.player.skill_book = fresh_book
+
+        # Cooldowns live on the player now (they used to be Skill.last_used)
+        if not hasattr(self.player, 'cooldowns'):
+            self.player.cooldowns = CooldownManager()
+        for sk in self.player.skills:
+            self.player.cooldowns.register(sk)
+
         # Stats Rebalance Migration (Version 4)
         # Randomize with new multiplier logic: [min*mult, max*mult]
         if not hasattr(self.player, 'stats_version') or self.player.stats_version < 4:
@@ -861,8 +873,8 @@ class GameEngine:
                     item.add_stat(stat, val)
             
             # Apply to Inventory
-            for item in self.player.inventory.items:
-                if item and getattr(item, 'is_equipment', False):
+            for _, item in self.player.inventory.occupied():
+                if getattr(item, 'is_equipment', False):
                     migrate_item_v4(item)
                     
             # Apply to Equipment
@@ -889,6 +901,12 @@ class GameEngine:
         if "装备" in self.windows:
             self.windows["装备"].game_engine = self
 
+    def set_current_map(self, new_map):
+        old_map = getattr(self, 'current_map', None)
+        if old_map is not None and old_map is not new_map:
+            old_map.close()
+        self.current_map = new_map
+
     def load_map(self, map_key):
         if map_key not in MAPS_DB:
             print(f"[ERROR] Map {map_key} not found")
@@ -896,33 +914,21 @@ class GameEngine:
             
         map_data = MAPS_DB[map_key]
         
-        # Create Map
-        new_map = Map(map_data["name"], map_data["min_level"], 
-                      width=map_data["width"], height=map_data["height"])
-                      
-        # Add Monster Templates
-        for m_key in map_data["monsters"]:
-            monster = Monster.create_from_db(m_key)
-            if monster:
-                new_map.add_monster_type(monster)
-            else:
-                print(f"[WARN] Monster {m_key} not found in DB")
+        # Create Map (tile map, monster store and templates from MAPS_DB)
+        new_map = Map.from_db(map_key)
                 
         # Set Current Map
-        self.current_map = new_map
-        self.current_map.map_key = map_key # Store key for reference
-        
-        # Spawn Monsters
-        # Density: 5% of tiles
-        count = max(5, int(new_map.width * new_map.height * 0.05))
-        for _ in range(count):
-            self.current_map.spawn_monster()
-            
-        self.log(f"进入地图: {new_map.name} (Lv.{map_data['min_level']}-{map_data['max_level']})")
+        self.set_current_map(new_map)
         
         # Reset player position to safe zone (usually top-left)
+        # Done before spawning so the spawner keeps the area around it clear
         self.player.x = 2
         self.player.y = 2
+
+        # Spawn Monsters (density / species mix / respawn delay from MAPS_DB "spawn")
+        self.start_spawner(map_data.get("spawn"))
+            
+        self.log(f"进入地图: {new_map.name} (Lv.{map_data['min_level']}-{map_data['max_level']})")
         
         # Stop auto-pilot when switching maps
         self.target_monster = None
@@ -930,6 +936,15 @@ class GameEngine:
         
         return True
 
+    def start_spawner(self, spawn_config):
+        # Old map's respawn timers must not fire into the new map
+        if self.spawner:
+            self.spawner.stop()
+        self.spawner = SpawnManager.from_config(self.current_map, self.scheduler, spawn_config,
+                                                get_player_pos=lambda: (self.player.x, self.player.y))
+        self.spawner.start()
+        self.effects.set_map(self.current_map)
+
     def init_game_data(self, name="Hero", gender="男"):
         # Initialize Default Session (for __init__)
         data = self.create_new_character_data(name, gender)
@@ -938,10 +953,9 @@ class GameEngine:
         # Initialize Map from DB
         if not self.load_map("NoviceVillage"):
             # Fallback if DB load fails
-            self.current_map = Map("新手村", 1, width=20, height=15)
+            self.set_current_map(Map("新手村", 1, width=20, height=15))
             self.current_map.add_monster_type(Monster("稻草人", 1, 30, 5, 0, 10))
-            for _ in range(5):
-                self.current_map.spawn_monster()
+            self.start_spawner(None)
             
         # Define NPCs
         self.npc_manager.add_npc(NPC("老兵", "传送", "想去哪里冒险？"))
@@ -1087,12 +1101,7 @@ class GameEngine:
                 attempts += 1
                 continue
                 
-            occupied = False
-            for m in self.current_map.active_monsters:
-                if m.x == rx and m.y == ry:
-                    occupied = True
-                    break
-            if occupied:
+            if self.current_map.occupant(rx, ry):
                 attempts += 1
                 continue
                 
@@ -1200,60 +1209,17 @@ class GameEngine:
             self.windows["宝藏"].rect.center = (self.width // 2, self.height // 2)
 
     def update_ai(self):
-        for monster in self.current_map.active_monsters:
-            if not monster.is_alive(): continue
-            
-            monster.move_timer += 1
-            if monster.move_timer >= monster.move_interval:
-                monster.move_timer = 0
-                if not monster.is_aggro:
-                    monster.move_interval = random.randint(60, 180) # Reset timer normal
-                    # Random move
-                    direction = random.choice([(0, 1), (0, -1), (1, 0), (-1, 0)])
-                else:
-                    # Aggro move (Chase player)
-                    # Simple chase: move towards player
-                    dx, dy = 0, 0
-                    if monster.x < self.player.x: dx = 1
-                    elif monster.x > self.player.x: dx = -1
-                    
-                    if monster.y < self.player.y: dy = 1
-                    elif monster.y > self.player.y: dy = -1
-                    
-                    # Prefer axis with larger distance? Or random axis?
-                    # Let's try moving along one axis at a time to avoid zig-zags stuck
-                    if dx != 0 and dy != 0:
-                        if random.random() < 0.5: dy = 0
-                        else: dx = 0
-                    
-                    direction = (dx, dy)
-
-                dx, dy = direction
-                new_x = monster.x + dx
-                new_y = monster.y + dy
-                
-                # Validate move
-                if self.current_map.is_valid_move(new_x, new_y):
-                    # Check collision with player
-                    if new_x == self.player.x and new_y == self.player.y:
-                        # Attack player
-                        self.combat_round(monster) # Monster attacks player logic inside
-                        # If aggro, keep attacking? Yes.
-                    
-                    # Check collision with other monsters
-                    occupied = False
-                    for other in self.current_map.active_monsters:
-                        if other != monster and other.x == new_x and other.y == new_y:
-                            occupied = True
-                            break
-                    
-                    if not occupied and not (new_x == self.player.x and new_y == self.player.y):
-                        monster.x = new_x
-                        monster.y = new_y
-
-    def update_logic(self):
-        # Auto Potion Check
-        if self.player:
+        # Movement (wander + flow-field chase) is simulated by the map itself,
+        # we only resolve the monsters that bumped into the player.
+        attackers = self.current_map.update_monster_ai(self.player.x, self.player.y)
+        for monster in attackers:
+            if monster.is_alive():
+                self.combat_round(monster) # Monster attacks player logic inside
+
+    def update_logic(self, dt=None):
+        """:param dt: seconds since the last frame, None = measured by the frame clock"""
+        # Auto Potion (only after HP / MP dropped below a threshold)
+        if self.player and self.player.potion_due:
             self.player.check_auto_potion()
 
         # AI Update
@@ -1264,6 +1230,7 @@ class GameEngine:
         self.ui_floating_texts = [ft for ft in self.ui_floating_texts if ft.update()]
         # Update Loot Animations
         active_anims = []
+        picked = [] # Item / bone powder pickups, added to the bag as one batch below
         for anim in self.loot_animations:
             if not anim.update():
                 # Animation Running
@@ -1279,21 +1246,14 @@ class GameEngine:
                 elif anim.item_type == "ingot":
                     self.player.ingots += anim.amount
                     self.log(f"运气爆棚！获得元宝 +{anim.amount}")
-                elif anim.item_type == "item":
-                    if self.player.inventory.add_item(anim.item_data):
-                        self.log(f"获得: {anim.item_data.name} ({anim.item_data.quality.value})")
-                        self.spawn_floating_text(f"+{anim.item_data.name}", self.player.x, self.player.y, GREEN)
-                    else:
-                        self.log("背包已满，无法获取掉落物品。")
-                        self.spawn_floating_text("背包已满", self.player.x, self.player.y, (255, 0, 0))
-                elif anim.item_type == "bone_powder":
-                    if self.player.inventory.add_item(anim.item_data):
-                        self.log(f"获得: 骨粉 x{anim.amount}")
-                        self.spawn_floating_text(f"+骨粉 x{anim.amount}", self.player.x, self.player.y, GREEN)
-                    else:
-                        self.log("背包已满，无法获取骨粉")
+                elif anim.item_type in ("item", "bone_powder"):
+                    picked.append(anim)
         
         self.loot_animations = active_anims
+        new_gear = self.collect_loot(picked) if picked else False
+        # One ranking pass per collected batch, before auto recycle can eat an upgrade
+        if new_gear and self.auto_equip_enabled:
+            self.perform_auto_equip()
         self.skill_animations = [sa for sa in self.skill_animations if sa.update()]
         
         # Auto-Save Check
@@ -1345,14 +1305,46 @@ class GameEngine:
                 self.player.mp = min(self.player.max_mp, self.player.mp + regen_amount)
 
         # Update Monster Animations
-        for m in self.current_map.active_monsters:
-            if hasattr(m, 'update_spawn_animation'):
-                m.update_spawn_animation()
+        self.current_map.update_spawn_animations()
+
+        # Timers (monster respawn runs on the scheduler, see SpawnManager)
+        if dt is None:
+            dt = self.clock.get_time() / 1000.0
+        self.scheduler.advance(min(max(dt, 0.0), self.max_frame_time))
+
+    def collect_loot(self, anims):
+        """
+        Put picked-up items into the bag, one add_items transaction for the whole batch.
+        If the batch does not fit, falls back to one by one so whatever fits is kept.
+        :return: True if any equipment was added
+        """
+        inventory = self.player.inventory
+        if inventory.add_items([anim.item_data for anim in anims]) is not None:
+            added = [(anim, True) for anim in anims]
+        else:
+            added = [(anim, inventory.add_item(anim.item_data)) for anim in anims]
+
+        new_gear = False
+        for anim, ok in added:
+            if anim.item_type == "bone_powder":
+                if ok:
+                    self.log(f"获得: 骨粉 x{anim.amount}")
+                    self.spawn_floating_text(f"+骨粉 x{anim.amount}", self.player.x, self.player.y, GREEN)
+                else:
+                    self.log("背包已满，无法获取骨粉")
+            elif ok:
+                new_gear = new_gear or getattr(anim.item_data, 'is_equipment', False)
+                self.log(f"获得: {anim.item_data.name} ({anim.item_data.quality.value})")
+                self.spawn_floating_text(f"+{anim.item_data.name}", self.player.x, self.player.y, GREEN)
+            else:
+                self.log("背包已满，无法获取掉落物品。")
+                self.spawn_floating_text("背包已满", self.player.x, self.player.y, (255, 0, 0))
+        return new_gear
 
-        # Monster Respawn
-        if len(self.current_map.active_monsters) < 5:
-            if random.random() < 0.05: # 5% chance per frame to respawn if low count
-                self.current_map.spawn_monster()
+    def perform_auto_equip(self):
+        if not self.player: return
+        for item in self.auto_equip.apply(self.player):
+            self.log(f"自动穿戴: {item.name} ({item.quality.value})")
 
     def perform_auto_recycle(self):
         if not self.player: return
@@ -1450,7 +1442,9 @@ class GameEngine:
             "interval": self.auto_save_interval,
             "skip_recycle_confirmation": self.skip_recycle_confirmation,
             "auto_recycle_enabled": self.auto_recycle_enabled,
-            "recycle_qualities": self.recycle_qualities
+            "auto_equip_enabled": self.auto_equip_enabled,
+            "recycle_qualities": self.recycle_qualities,
+            "target_policy": self.target_policy
         }
         
         # Local Save
@@ -1473,50 +1467,27 @@ class GameEngine:
         if local_success:
             self.log("游戏已保存 (本地)。")
 
+    def rotation_skills(self):
+        if self.skill_rotation_enabled:
+            return self.player.skills
+        return [self.player.active_skill] if self.player.active_skill else []
+
     def try_attack(self, monster):
         dist = abs(monster.x - self.player.x) + abs(monster.y - self.player.y)
-        
-        # Check active skill
-        skill = self.player.active_skill
-        
-        # Fallback to melee if MP is low OR skill is on cooldown
-        use_melee = False
-        
-        if skill:
-            # Check MP
-            if self.player.mp < skill.mp_cost:
-                use_melee = True
-            
-            # Check Cooldown
-            current_time = time.time()
-            reduction_pct = min(100.0, max(0.0, self.player.cooldown_reduction))
-            effective_cd = skill.cooldown * (1.0 - reduction_pct / 100.0)
-            if current_time - skill.last_used < effective_cd:
-                use_melee = True
-        else:
-            use_melee = True
-
-        if use_melee:
-            # Not enough MP or CD, treat as melee basic attack
-            # Range = 1
-            if dist <= 1:
-                self.combat_round(monster)
-                return True
-            else:
-                return False # Need to move closer
 
-        if skill:
-            if dist <= skill.range:
-                self.perform_skill_attack(monster, skill)
-                return True
-        
-        return False
+        # Best usable action in reach (skills on cooldown / short on MP are skipped, melee is the fallback)
+        action = self.rotation.choose(self.player, monster, dist, self.rotation_skills())
+        if action is None:
+            return False # Need to move closer
+
+        if action.skill is None:
+            self.combat_round(monster)
+        else:
+            self.perform_skill_attack(monster, action.skill)
+        return True
 
     def auto_pilot_step(self):
-        # 0. Check locked target validity
-        if self.target_monster:
-            if self.target_monster not in self.current_map.active_monsters or not self.target_monster.is_alive():
-                self.target_monster = None
+        # 0. Locked target validity is checked by the target_monster property (entity ID lookup)
 
         # 1. Manual Move Priority
         if self.manual_target_pos:
@@ -1540,7 +1511,7 @@ class GameEngine:
                      if random.random() < 0.5: dy = 0
                      else: dx = 0
                      
-                self.move_player(dx, dy)
+                self.move_player_towards(tx, ty, dx, dy)
                 return # Skip auto-combat if moving manually
         
         # 2. Try to attack locked target or any valid target in range
@@ -1548,17 +1519,12 @@ class GameEngine:
              if self.try_attack(self.target_monster):
                  return
         
-        # 3. Find nearest monster
+        # 3. Find a target (ring search over the occupancy grid, scored by the targeting policy)
         if self.auto_combat_enabled and not self.target_monster:
-            min_dist = 9999
-            nearest_monster = None
-            
-            # Find closest monster (First found if distances are equal)
-            for m in self.current_map.active_monsters:
-                dist = abs(m.x - self.player.x) + abs(m.y - self.player.y)
-                if dist < min_dist:
-                    min_dist = dist
-                    nearest_monster = m
+            context = {"player": self.player, "resolver": self.combat}
+            if self.target_policy == "quest_first":
+                context["quest_targets"] = quest_kill_targets(self.quest_manager)
+            nearest_monster = self.current_map.find_target(self.player.x, self.player.y, self.target_policy, context)
             
             if nearest_monster:
                 self.target_monster = nearest_monster
@@ -1568,27 +1534,9 @@ class GameEngine:
         
         # 4. Move towards target
         if self.target_monster:
-             # Check if we need to move
-             # If using melee fallback (CD or low MP), range is 1.
-             # If skill available, range is skill.range.
-             
-             max_range = 1
-             skill = self.player.active_skill
-             
-             use_melee = False
-             if skill:
-                 # Check MP & CD (Same logic as try_attack)
-                 if self.player.mp < skill.mp_cost: use_melee = True
-                 
-                 current_time = time.time()
-                 reduction_pct = min(100.0, max(0.0, self.player.cooldown_reduction))
-                 effective_cd = skill.cooldown * (1.0 - reduction_pct / 100.0)
-                 if current_time - skill.last_used < effective_cd: use_melee = True
-                 
-                 if not use_melee:
-                     max_range = skill.range
-             else:
-                 max_range = 1
+             # Check if we need to move: range of the action try_attack would pick if it could reach
+             action = self.rotation.choose(self.player, self.target_monster, None, self.rotation_skills())
+             max_range = action.range if action else 1
                 
              dist = abs(self.target_monster.x - self.player.x) + abs(self.target_monster.y - self.player.y)
              
@@ -1601,7 +1549,7 @@ class GameEngine:
                 elif self.target_monster.y > self.player.y: dy = 1
                 elif self.target_monster.y < self.player.y: dy = -1
                 
-                self.move_player(dx, dy)
+                self.move_player_towards(self.target_monster.x, self.target_monster.y, dx, dy)
              else:
                 # In range but try_attack failed? 
                 # Could be because try_attack returned False (out of melee range but we thought we were in skill range?)
@@ -1618,7 +1566,19 @@ class GameEngine:
                     elif self.target_monster.x < self.player.x: dx = -1
                     elif self.target_monster.y > self.player.y: dy = 1
                     elif self.target_monster.y < self.player.y: dy = -1
-                    self.move_player(dx, dy)
+                    self.move_player_towards(self.target_monster.x, self.target_monster.y, dx, dy)
+
+    def move_player_towards(self, tx, ty, dx, dy):
+        # Greedy axis step when it is open, otherwise route around obstacles via a flow field
+        px, py = self.player.x, self.player.y
+        if self.current_map.is_valid_move(px + dx, py + dy):
+            self.move_player(dx, dy)
+            return
+        field = self.current_map.path_field
+        field.update(tx, ty)
+        step = field.next_step(px, py, self.current_map.is_free)
+        if step:
+            self.move_player(step[0] - px, step[1] - py)
 
     def move_player(self, dx, dy):
         new_x = self.player.x + dx
@@ -1629,11 +1589,7 @@ class GameEngine:
             return
 
         # Check for monster collision (Manual move might trigger this)
-        target_monster = None
-        for m in self.current_map.active_monsters:
-            if m.x == new_x and m.y == new_y:
-                target_monster = m
-                break
+        target_monster = self.current_map.occupant(new_x, new_y)
         
         if target_monster:
             self.try_attack(target_monster)
@@ -1643,11 +1599,30 @@ class GameEngine:
             self.check_treasure_event(new_x, new_y)
 
     def handle_monster_death(self, monster):
-        self.log(f"击败了 {monster.name}! +{monster.xp_reward} 经验")
-        self.player.gain_xp(monster.xp_reward)
-        if monster in self.current_map.active_monsters:
-            self.current_map.active_monsters.remove(monster)
-        
+        self.handle_monster_deaths([monster])
+
+    def handle_monster_deaths(self, monsters):
+        # Batch death handling (AoE kills): one XP grant, one map removal pass, then per-monster loot
+        if not monsters:
+            return
+        total_xp = sum(m.xp_reward for m in monsters)
+        if len(monsters) == 1:
+            self.log(f"击败了 {monsters[0].name}! +{total_xp} 经验")
+        else:
+            self.log(f"击败了 {len(monsters)} 个怪物! +{total_xp} 经验")
+        self.player.gain_xp(total_xp)
+        self.current_map.remove_monsters(monsters)
+
+        quest_updated = False
+        for monster in monsters:
+            if self.roll_monster_loot(monster):
+                quest_updated = True
+        if quest_updated:
+            self.log("任务进度更新！")
+            self.update_npc_status()
+
+    def roll_monster_loot(self, monster):
+        # Treasure / loot / quest bookkeeping for one kill, returns True if a quest advanced
         # Update Treasure Pity Counter
         self.kill_count += 1
         
@@ -1666,18 +1641,18 @@ class GameEngine:
             self.kill_count = 0 # Reset counter
         
         # Loot Drop Logic - Modified for Ground Items
-        if random.random() < 0.8: # High drop rate for demo
+        if random.random() < loot.LOOT_CHANCE:
             # Gold Drop
-            gold_amount = random.randint(10, 50)
+            gold_amount = random.randint(*loot.GOLD_RANGE)
             self.spawn_loot_animation(monster.x, monster.y, "gold", amount=gold_amount)
             # self.log("获得金币!") # Log when collected
             
             # Ingot Drop (1% chance)
-            if random.random() < 0.01:
+            if random.random() < loot.INGOT_CHANCE:
                 self.spawn_loot_animation(monster.x, monster.y, "ingot", amount=1)
             
             # Equipment Drop (20% chance)
-            if random.random() < 0.2:
+            if random.random() < loot.EQUIPMENT_CHANCE:
                 # Determine drop parameters
                 drops_list = getattr(monster, 'drops', [])
                 
@@ -1700,17 +1675,15 @@ class GameEngine:
                     self.spawn_loot_animation(monster.x, monster.y, "item", item_data=drop)
             
             # Bone Powder Drop (10% chance, 1-3 count)
-            if random.random() < 0.1:
+            if random.random() < loot.BONE_POWDER_CHANCE:
                 from src.systems.equipment.item import BonePowder
-                count = random.randint(1, 3)
+                count = random.randint(*loot.BONE_POWDER_RANGE)
                 bp = BonePowder()
                 bp.count = count
                 self.spawn_loot_animation(monster.x, monster.y, "bone_powder", item_data=bp, amount=count)
         
         # Quest Update Kill
-        if self.quest_manager.update_kill(monster.name):
-            self.log("任务进度更新！")
-            self.update_npc_status()
+        quest_updated = self.quest_manager.update_kill(monster.name)
             
         # Special Boss Logic
         if monster.name == "蛇妖王":
@@ -1718,14 +1691,11 @@ class GameEngine:
             self.npc_manager.get_npc("世外高人").has_quest_available = True
             self.log("世外高人出现在村子里了！")
 
+        return quest_updated
+
     def perform_skill_attack(self, monster, skill):
         # Check Cooldown
-        current_time = time.time()
-        # Effective Cooldown
-        reduction_pct = min(100.0, max(0.0, self.player.cooldown_reduction))
-        effective_cd = skill.cooldown * (1.0 - reduction_pct / 100.0)
-        
-        if current_time - skill.last_used < effective_cd:
+        if not self.player.cooldowns.is_ready(skill):
             # On Cooldown
             # Log? Or just fail silently? Or use basic attack?
             # User said "Use frequency depends on use time".
@@ -1743,15 +1713,43 @@ class GameEngine:
             return
 
         self.player.mp -= skill.mp_cost
-        skill.last_used = current_time # Update usage time
-        
-        # Calculate Damage
-        damage = int(max(1, (self.player.attack * skill.damage_multiplier) - monster.defense))
-        monster.take_damage(damage)
+        self.player.cooldowns.trigger(skill, self.player.cooldown_reduction) # Start cooldown
+        
+        area = getattr(skill, 'area', None)
+        effect = getattr(skill, 'effect', None)
+        if effect:
+            tiles = area.tiles(self.player.x, self.player.y, monster.x, monster.y) if area else None
+            self.effects.apply_skill(skill, self.player, monster, tiles)
+            if skill.damage_multiplier <= 0:
+                # Pure effect skills (poison, shields, buffs, root) do not hit
+                self.log(f"使用了 {skill.name}")
+                return
+
+        # Targets: the locked monster plus everything inside the skill's area (one occupancy query)
+        targets = [monster]
+        if area:
+            hit = area_targets(self.current_map, area, self.player.x, self.player.y, monster.x, monster.y)
+            targets += [m for m in hit if m is not monster]
+
+        # Calculate & apply damage as one batch
+        total_damage = 0
+        dead = []
+        for target in targets:
+            hit = self.combat.player_attack(self.player, target, skill.damage_multiplier)
+            if not hit.hit:
+                self.spawn_floating_text("MISS", target.x, target.y, GRAY)
+                continue
+            target.take_damage(hit.damage)
+            total_damage += hit.damage
+            self.spawn_floating_text(f"暴击 -{hit.damage}" if hit.crit else f"-{hit.damage}", target.x, target.y, RED)
+            if not target.is_alive():
+                dead.append(target)
         
         # Log
-        self.log(f"使用了 {skill.name} 攻击 {monster.name}，伤害 {damage}")
-        self.spawn_floating_text(f"-{damage}", monster.x, monster.y, RED)
+        if len(targets) == 1:
+            self.log(f"使用了 {skill.name} 攻击 {monster.name}，伤害 {total_damage}")
+        else:
+            self.log(f"使用了 {skill.name} 命中 {len(targets)} 个目标，总伤害 {total_damage}")
         
         # Animation
         if skill.icon:
@@ -1774,22 +1772,33 @@ class GameEngine:
              # Pass size for scaling
              self.skill_animations.append(SkillAnimation(screen_x, screen_y, skill.icon, target_w, target_h))
 
-        if not monster.is_alive():
-             self.handle_monster_death(monster)
+        if dead:
+             self.handle_monster_deaths(dead)
 
     def combat_round(self, monster):
         # Player hits monster
-        damage = max(1, self.player.attack - monster.defense)
-        monster.take_damage(damage)
-        self.spawn_floating_text(f"-{damage}", monster.x, monster.y, RED)
-        self.log(f"你攻击了 {monster.name} 造成 {damage} 点伤害。")
+        hit = self.combat.player_attack(self.player, monster)
+        if hit.hit:
+            monster.take_damage(hit.damage)
+            if hit.crit:
+                self.spawn_floating_text(f"暴击 -{hit.damage}", monster.x, monster.y, RED)
+                self.log(f"你攻击了 {monster.name} 造成 {hit.damage} 点暴击伤害。")
+            else:
+                self.spawn_floating_text(f"-{hit.damage}", monster.x, monster.y, RED)
+                self.log(f"你攻击了 {monster.name} 造成 {hit.damage} 点伤害。")
+        else:
+            self.spawn_floating_text("MISS", monster.x, monster.y, GRAY)
+            self.log(f"{monster.name} 闪避了你的攻击。")
         
         if not monster.is_alive():
             self.handle_monster_death(monster)
             return
 
         # Monster hits player
-        m_damage = max(1, monster.attack - self.player.defense)
+        m_damage = self.effects.absorb(self.combat.monster_attack(monster, self.player))
+        if not m_damage:
+            self.spawn_floating_text("闪避", self.player.x, self.player.y, GRAY)
+            return
         self.player.hp -= m_damage
         self.spawn_floating_text(f"-{m_damage}", self.player.x, self.player.y, RED)
         # self.log(f"{monster.name} hits you for {m_damage} dmg.")
@@ -1797,8 +1806,13 @@ class GameEngine:
         if self.player.hp <= 0:
             self.log("你挂了! 游戏结束。")
             self.player.hp = self.player.max_hp
-            self.player.x = 0
-            self.player.y = 0
+            # Corner may be an obstacle on tile maps, fall back to the map start tile
+            if self.current_map.is_valid_move(0, 0):
+                self.player.x = 0
+                self.player.y = 0
+            else:
+                self.player.x = 2
+                self.player.y = 2
             self.log("原地复活。")
 
     def update_login(self):
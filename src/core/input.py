@@ -228,16 +228,14 @@ def process_single_event(self, event):
         
         if 0 <= grid_x < self.current_map.width and 0 <= grid_y < self.current_map.height:
             # Check for monster
-            target = None
-            for m in self.current_map.active_monsters:
-                if m.x == grid_x and m.y == grid_y:
-                    target = m
-                    break
+            target = self.current_map.occupant(grid_x, grid_y)
             
             if target:
                 # Lock target and attack
                 self.target_monster = target
                 self.try_attack(target)
+            elif not self.current_map.is_valid_move(grid_x, grid_y):
+                self.log("无法到达")
             else:
                 # Move
                 # If manual click, we set a target position for auto-pilot to pathfind?
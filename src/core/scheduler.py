@@ -0,0 +1,56 @@
+import heapq
+import itertools
+
+class ScheduledTask:
+    def __init__(self, due, interval, callback, args):
+        self.due = due
+        self.interval = interval # None for one-shot tasks
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+class Scheduler:
+    """
+    Game-time timer queue (seconds, not frames).
+    The engine advances it by the frame time every update; advancing by a large
+    dt (fast-forward / offline catch-up) runs every due task in order with the
+    same timestamps it would have seen in real time.
+    """
+    def __init__(self):
+        self.now = 0.0
+        self._queue = []
+        self._seq = itertools.count()
+
+    def _push(self, task):
+        heapq.heappush(self._queue, (task.due, next(self._seq), task))
+        return task
+
+    def call_later(self, delay, callback, *args):
+        return self._push(ScheduledTask(self.now + max(0.0, delay), None, callback, args))
+
+    def call_every(self, interval, callback, *args, first_delay=None):
+        delay = interval if first_delay is None else first_delay
+        return self._push(ScheduledTask(self.now + max(0.0, delay), interval, callback, args))
+
+    def advance(self, dt):
+        target = self.now + dt
+        queue = self._queue
+        while queue and queue[0][0] <= target:
+            due, _, task = heapq.heappop(queue)
+            if task.cancelled:
+                continue
+            self.now = due
+            task.callback(*task.args)
+            if task.interval and not task.cancelled:
+                task.due = due + task.interval
+                self._push(task)
+        self.now = target
+
+    def clear(self):
+        self._queue = []
+
+    def __len__(self):
+        return sum(1 for _, _, t in self._queue if not t.cancelled)
@@ -1,5 +1,16 @@
 
 # Legend of Mir 2 Map Database
+# Optional keys:
+#   "vectorized": True -> simulate monsters with the NumPy store (for maps with thousands of monsters)
+#   "spawn": SpawnManager settings, every key optional:
+#       "density": target monsters per tile (default 0.05), "min_count": floor (default 5)
+#       "respawn_delay": seconds after a kill (default 3.0), "safe_radius": tiles kept clear around the player (default 3)
+#       "weights": {monster_key: weight} species mix (unlisted species weigh 1)
+#   "tilemap": file in MAPS_DIR with walkability / terrain / spawn zone layers (see systems/world/tilemap.py)
+
+import os
+
+MAPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "maps")
 
 MAPS_DB = {
     "NoviceVillage": {
@@ -8,6 +19,7 @@ MAPS_DB = {
         "max_level": 10,
         "width": 20,
         "height": 15,
+        "tilemap": "novice_village.tmap",
         "monsters": ["Hen", "Deer", "Scarecrow", "RakeCat", "HookCat"]
     },
     "SkullCave": {
@@ -16,7 +28,9 @@ MAPS_DB = {
         "max_level": 15,
         "width": 20,
         "height": 15,
-        "monsters": ["Skeleton", "SkeletonWarrior", "SkeletonChampion", "SkullElf"]
+        "tilemap": "skull_cave.tmap",
+        "monsters": ["Skeleton", "SkeletonWarrior", "SkeletonChampion", "SkullElf"],
+        "spawn": {"respawn_delay": 3.0, "weights": {"Skeleton": 4, "SkeletonWarrior": 4, "SkeletonChampion": 4, "SkullElf": 1}}
     },
     "Mine": {
         "name": "比奇矿区",
@@ -24,7 +38,9 @@ MAPS_DB = {
         "max_level": 20,
         "width": 20,
         "height": 15,
-        "monsters": ["Zombie", "CrawlerZombie", "CorpseKing"]
+        "tilemap": "mine.tmap",
+        "monsters": ["Zombie", "CrawlerZombie", "CorpseKing"],
+        "spawn": {"respawn_delay": 3.0, "weights": {"Zombie": 4, "CrawlerZombie": 4, "CorpseKing": 1}}
     },
     "CentipedeCave": {
         "name": "蜈蚣洞",
@@ -32,7 +48,9 @@ MAPS_DB = {
         "max_level": 25,
         "width": 20,
         "height": 15,
-        "monsters": ["Centipede", "Maggot", "Tongs", "EvilTongs"]
+        "tilemap": "centipede_cave.tmap",
+        "monsters": ["Centipede", "Maggot", "Tongs", "EvilTongs"],
+        "spawn": {"respawn_delay": 3.0, "weights": {"Centipede": 4, "Maggot": 4, "Tongs": 4, "EvilTongs": 1}}
     },
     "ZumaTemple": {
         "name": "祖玛寺庙",
@@ -40,7 +58,9 @@ MAPS_DB = {
         "max_level": 30,
         "width": 20,
         "height": 15,
-        "monsters": ["ZumaRat", "ZumaArcher", "ZumaGuardian", "ZumaLeader"]
+        "tilemap": "zuma_temple.tmap",
+        "monsters": ["ZumaRat", "ZumaArcher", "ZumaGuardian", "ZumaLeader"],
+        "spawn": {"respawn_delay": 3.0, "weights": {"ZumaRat": 4, "ZumaArcher": 4, "ZumaGuardian": 4, "ZumaLeader": 1}}
     },
     "StoneTomb": {
         "name": "石墓阵",
@@ -48,7 +68,9 @@ MAPS_DB = {
         "max_level": 35,
         "width": 20,
         "height": 15,
-        "monsters": ["BlackBoar", "RedBoar", "WhiteBoar"]
+        "tilemap": "stone_tomb.tmap",
+        "monsters": ["BlackBoar", "RedBoar", "WhiteBoar"],
+        "spawn": {"respawn_delay": 3.0, "weights": {"BlackBoar": 4, "RedBoar": 4, "WhiteBoar": 1}}
     },
     "WoomaTemple": {
         "name": "沃玛寺庙",
@@ -56,7 +78,9 @@ MAPS_DB = {
         "max_level": 40,
         "width": 20,
         "height": 15,
-        "monsters": ["WoomaWarrior", "WoomaFighter", "WoomaLeader"]
+        "tilemap": "wooma_temple.tmap",
+        "monsters": ["WoomaWarrior", "WoomaFighter", "WoomaLeader"],
+        "spawn": {"respawn_delay": 3.0, "weights": {"WoomaWarrior": 4, "WoomaFighter": 4, "WoomaLeader": 1}}
     },
     "RedMoon": {
         "name": "赤月峡谷",
@@ -64,7 +88,9 @@ MAPS_DB = {
         "max_level": 45,
         "width": 20,
         "height": 15,
-        "monsters": ["BlackSpider", "MoonSpider", "RedMoonDemon"]
+        "tilemap": "red_moon.tmap",
+        "monsters": ["BlackSpider", "MoonSpider", "RedMoonDemon"],
+        "spawn": {"respawn_delay": 3.0, "weights": {"BlackSpider": 4, "MoonSpider": 4, "RedMoonDemon": 1}}
     },
     "DragonLand": {
         "name": "火龙巢穴", # Custom high level map
@@ -72,6 +98,7 @@ MAPS_DB = {
         "max_level": 50,
         "width": 20,
         "height": 15,
+        "tilemap": "dragon_land.tmap",
         "monsters": ["RedMoonDemon", "ZumaLeader", "WoomaLeader"] # Recycle bosses for now
     },
     "UnknownDark": {
@@ -80,6 +107,8 @@ MAPS_DB = {
         "max_level": 60,
         "width": 20,
         "height": 15,
-        "monsters": ["Hen", "Deer", "RedMoonDemon"] # Joke map: Weak monsters but real boss stats? Or mix
+        "tilemap": "unknown_dark.tmap",
+        "monsters": ["Hen", "Deer", "RedMoonDemon"], # Joke map: Weak monsters but real boss stats? Or mix
+        "spawn": {"respawn_delay": 3.0, "weights": {"Hen": 4, "Deer": 4, "RedMoonDemon": 1}}
     }
 }
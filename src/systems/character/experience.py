@@ -1,18 +1,59 @@
+from bisect import bisect_right
+
+MAX_LEVEL = 100
+MAX_LEVEL_XP = 999999999 # Shown as "XP to next level" at the cap
+
+def build_xp_table(base_xp, max_level=MAX_LEVEL):
+    """
+    :return: (needed, total) - needed[lvl] is the XP to go from lvl to lvl + 1,
+             total[lvl] the XP it takes to reach lvl from level 0 (ascending, for bisect)
+    """
+    # Exponential growth curve for 100 levels
+    # Level 1: ~100
+    # Level 50: ~100 * 50^2.2 ~ 500,000
+    # Level 99: ~100 * 99^2.5 ~ 10,000,000
+    needed = [int(base_xp * (lvl ** (1.5 + lvl / 100.0))) for lvl in range(max_level)]
+    total = [0]
+    for n in needed:
+        total.append(total[-1] + n)
+    return needed, total
+
 class ExperienceSystem:
     def __init__(self):
         self.base_xp = 100
         self.growth_factor = 1.2  # Exponential growth
+        self._build()
+
+    def _build(self):
+        self._needed, self._total = build_xp_table(self.base_xp)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Tables are rebuilt on load
+        state.pop('_needed', None)
+        state.pop('_total', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build()
 
     def get_xp_for_next_level(self, current_level):
-        if current_level >= 100:
-            return 999999999 # Max level
-            
-        # Exponential growth curve for 100 levels
-        # Level 1: ~100
-        # Level 50: ~100 * 50^2.2 ~ 500,000
-        # Level 99: ~100 * 99^2.5 ~ 10,000,000
-        exponent = 1.5 + (current_level / 100.0)
-        return int(self.base_xp * (current_level ** exponent))
+        if current_level >= MAX_LEVEL:
+            return MAX_LEVEL_XP # Max level
+        return self._needed[max(0, current_level)]
+
+    def levels_for_xp(self, current_xp, current_level):
+        """
+        Where `current_xp` (XP into `current_level`) ends up, any number of levels at once.
+        :return: (new level, XP left into the new level)
+        """
+        if current_level >= MAX_LEVEL:
+            return current_level, current_xp
+        total = self._total
+        xp = total[current_level] + current_xp
+        level = min(MAX_LEVEL, bisect_right(total, xp) - 1)
+        return level, xp - total[level]
 
     def check_level_up(self, current_xp, current_level):
         needed = self.get_xp_for_next_level(current_level)
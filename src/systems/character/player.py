@@ -3,6 +3,11 @@ from src.systems.character.experience import ExperienceSystem
 from src.systems.equipment.inventory import Inventory
 from src.systems.character.cultivation import BodyCultivation
 from src.systems.combat.skills import SkillBook
+from src.systems.combat.cooldowns import CooldownManager
+from src.systems.character.stats import STAT_NAMES, StatModel
+from src.systems.equipment.inventory import POTION_SMALLEST_SUFFICIENT, POTION_PREFERRED
+
+POTION_COOLDOWN = 1.0 # Seconds, shared by HP and MP potions
 
 class Profession(Enum):
     WARRIOR = "战士"
@@ -16,6 +21,10 @@ class Player:
         self.gender = gender
         self.level = 1
         self.current_xp = 0
+        # Absolute HP / MP below which auto-potion kicks in (-1 = off), see refresh_potion_triggers
+        self._hp_trigger = -1
+        self._mp_trigger = -1
+        self.potion_due = False # Set by the hp / mp setters on a drop below a trigger
         self.hp = 100
         self.max_hp = 100
         self.mp = 50
@@ -28,6 +37,7 @@ class Player:
         self.accuracy = 5
         self.dodge = 5
         self.crit = 5
+        self.stats_revision = 0 # Bumped by recalculate_stats, combat caches key on it
         self.luck = 0
         self.attack_speed = 0 # Extra attack speed
         self.cooldown_reduction = 0.0 # Percentage (0-100)
@@ -52,6 +62,10 @@ class Player:
         self.skill_book = SkillBook()
         self.skills = [self.skill_book.get_skill("Hellfire")]
         self.active_skill = self.skills[0]
+        self.cooldowns = CooldownManager()
+        self.cooldowns.register(self.active_skill)
+        self.stat_modifiers = {} # Temporary bonuses from status effects (buffs), stat -> amount
+        self.stat_model = StatModel() # Cached per-slot equipment stats
         self.x = 0
         self.y = 0
         self.map_id = "NoviceVillage" # Default Map ID
@@ -78,13 +92,47 @@ class Player:
             "hp_threshold": 70, # Percent
             "mp_threshold": 30, # Percent
             "hp_potion": "金创药(中)", # Default preference
-            "mp_potion": "魔法药(中)"
+            "mp_potion": "魔法药(中)",
+            "potion_policy": POTION_SMALLEST_SUFFICIENT # Which potion to drink, see inventory.POTION_POLICIES
         }
         self.last_potion_time = 0.0 # Timestamp
         
         self.stats_version = 4 # Current Stats Version
         
         self.initialize_stats()
+        self.refresh_potion_triggers()
+
+    # HP / MP are properties so a drop below the auto-potion threshold flags potion_due right away,
+    # instead of the game loop polling the percentages every frame
+    @property
+    def hp(self):
+        return self._hp
+
+    @hp.setter
+    def hp(self, value):
+        self._hp = value
+        if value < self._hp_trigger:
+            self.potion_due = True
+
+    @property
+    def mp(self):
+        return self._mp
+
+    @mp.setter
+    def mp(self, value):
+        self._mp = value
+        if value < self._mp_trigger:
+            self.potion_due = True
+
+    def refresh_potion_triggers(self):
+        """Recompute the auto-potion triggers, call after max HP/MP or the auto-potion settings change."""
+        settings = self.auto_potion_settings
+        if settings.get("enabled", False):
+            self._hp_trigger = self.max_hp * settings.get("hp_threshold", 70) / 100
+            self._mp_trigger = self.max_mp * settings.get("mp_threshold", 30) / 100
+        else:
+            self._hp_trigger = self._mp_trigger = -1
+        self.potion_due = self._hp < self._hp_trigger or self._mp < self._mp_trigger
 
     def initialize_stats(self):
         # Base stats
@@ -132,8 +180,24 @@ class Player:
         if hasattr(self, 'inventory'):
             self.inventory.max_weight = self.max_bag_weight
 
+    def __getstate__(self):
+        # Status effects are not saved, so the stats are stored without their buffs
+        state = self.__dict__.copy()
+        for stat, amount in state.get('stat_modifiers', {}).items():
+            state[stat] = state[stat] - amount
+        state['stat_modifiers'] = {}
+        state.pop('stat_model', None) # Cache, rebuilt on load
+        return state
+
     def __setstate__(self, state):
         """Handle unpickling of legacy save data"""
+        # hp / mp used to be plain attributes
+        if 'hp' in state:
+            state['_hp'] = state.pop('hp')
+        if 'mp' in state:
+            state['_mp'] = state.pop('mp')
+        self._hp_trigger = self._mp_trigger = -1
+        self.potion_due = False
         self.__dict__.update(state)
         
         # Migration: Add auto_potion_settings if missing
@@ -148,6 +212,20 @@ class Player:
             
         if not hasattr(self, 'last_potion_time'):
             self.last_potion_time = 0.0
+        # Saves from before the policy setting always drank the configured hp_potion / mp_potion
+        self.auto_potion_settings.setdefault("potion_policy", POTION_PREFERRED)
+
+        if not hasattr(self, 'stats_revision'):
+            self.stats_revision = 0
+
+        if not hasattr(self, 'stat_modifiers'):
+            self.stat_modifiers = {}
+        self.stat_model = StatModel()
+
+        if not hasattr(self, 'cooldowns'):
+            self.cooldowns = CooldownManager()
+            for skill in self.__dict__.get('skills') or []:
+                self.cooldowns.register(skill)
             
         # Migration: Add equipment_slot_levels if missing
         if not hasattr(self, 'equipment_slot_levels'):
@@ -156,12 +234,10 @@ class Player:
                 "bracelet_l": 0, "bracelet_r": 0, "ring_l": 0, "ring_r": 0,
                 "belt": 0, "boots": 0, "medal": 0
             }
+        self.refresh_potion_triggers()
 
-    def recalculate_stats(self):
-        # Reset to base stats (level dependent)
-        self.max_hp = self.base_max_hp + (self.level - 1) * 20
-        self.max_mp = getattr(self, 'base_max_mp', 50) + (self.level - 1) * 10
-        
+    def recalculate_stats(self, changed_slots=None):
+        """:param changed_slots: equipment slots that changed (None = check them all)"""
         # Recalculate Weight Limits
         self.max_bag_weight = 50 + self.level * 5
         self.max_wear_weight = 15 + self.level
@@ -171,116 +247,39 @@ class Player:
         if self.inventory:
             self.inventory.max_weight = self.max_bag_weight
 
-        self.attack = self.base_attack
-        self.magic = getattr(self, 'base_magic', 0)
-        self.taoism = getattr(self, 'base_taoism', 0)
-        self.defense = getattr(self, 'base_defense', 5)
-        self.magic_defense = getattr(self, 'base_magic_defense', 0)
-        self.accuracy = 5
-        self.dodge = 5
-        self.crit = 5
-        self.luck = 0
-        self.attack_speed = 0
-        self.cooldown_reduction = 0.0
+        # Base + equipment (cached per slot, only changed slots are rebuilt) + full body / cultivation / buffs
+        # Forging / enhancement rules live in src/systems/character/stats.py
+        for name, value in zip(STAT_NAMES, self.stat_model.compute(self, changed_slots)):
+            setattr(self, name, value)
 
-        # Add equipment stats
-        for slot, item in self.equipment.items():
-            if item:
-                # 1. Item Enhancement: Flat +1 point per level
-                item_enh_level = getattr(item, 'enhancement_level', 0)
-                item_flat_bonus = item_enh_level
-                
-                # 2. Slot Enhancement: Base * (slot_level%)
-                slot_enh_level = self.equipment_slot_levels.get(slot, 0)
-                
-                for k, v in item.stats.items():
-                    base_val = v
-                    
-                    # Calculate Slot Bonus
-                    slot_bonus_val = int(base_val * slot_enh_level * 0.01)
-                    if slot_enh_level > 0 and slot_bonus_val < 1:
-                        slot_bonus_val = 1
-                        
-                    effective_val = base_val + item_flat_bonus + slot_bonus_val
-                    
-                    if k == "hp": self.max_hp += effective_val
-                    elif k == "mp": self.max_mp += effective_val
-                    elif k == "attack": self.attack += effective_val
-                    elif k == "magic": self.magic += effective_val
-                    elif k == "taoism": self.taoism += effective_val
-                    elif k == "defense": self.defense += effective_val
-                    elif k == "magic_defense": self.magic_defense += effective_val
-                    elif k == "accuracy": self.accuracy += effective_val
-                    elif k == "dodge": self.dodge += effective_val
-                    elif k == "crit": self.crit += effective_val
-                    elif k == "luck": self.luck += effective_val
-                    elif k == "attack_speed": self.attack_speed += effective_val
-                    elif k == "cooldown_reduction": self.cooldown_reduction += effective_val
-        
-        # Full Body Enhancement Bonus
-        # If all worn equipment (slots) reach level n, add n% to all stats.
-        # "Depends on the lowest enhancement level of all worn equipment"
-        # We assume this means all 11 main slots must be equipped to have a "Full Body" level > 0.
-        check_slots = ["weapon", "armor", "helmet", "necklace", "bracelet_l", "bracelet_r", "ring_l", "ring_r", "belt", "boots", "medal"]
-        min_enh_level = 15
-        equipped_count = 0
-        
-        for s in check_slots:
-            if self.equipment.get(s):
-                equipped_count += 1
-                lvl = getattr(self.equipment[s], 'enhancement_level', 0)
-                if lvl < min_enh_level:
-                    min_enh_level = lvl
-            else:
-                min_enh_level = 0
-        
-        if equipped_count < len(check_slots):
-            min_enh_level = 0
-            
-        if min_enh_level > 0:
-            multiplier = 1.0 + (min_enh_level * 0.01)
-            # Apply to main attributes
-            self.max_hp = int(self.max_hp * multiplier)
-            self.max_mp = int(self.max_mp * multiplier)
-            self.attack = int(self.attack * multiplier)
-            self.magic = int(self.magic * multiplier)
-            self.taoism = int(self.taoism * multiplier)
-            self.defense = int(self.defense * multiplier)
-            self.magic_defense = int(self.magic_defense * multiplier)
-        
-        # Add cultivation stats
-        if self.body_cultivation:
-            self.attack += self.body_cultivation.stats.get("attack", 0)
-            self.defense += self.body_cultivation.stats.get("defense", 0)
-            # Percentages need to be applied to base + equipment usually, or just base? 
-            # Assuming total for simplicity
-            if self.body_cultivation.stats.get("hp_pct", 0) > 0:
-                self.max_hp = int(self.max_hp * (1 + self.body_cultivation.stats["hp_pct"] / 100.0))
-            if self.body_cultivation.stats.get("mp_pct", 0) > 0:
-                self.max_mp = int(self.max_mp * (1 + self.body_cultivation.stats["mp_pct"] / 100.0))
-        
-        # Add Forging Bonus (Equipment Slot Levels) - Flat 1% per level to total stats? Or Base?
-        # User said: "base stats by 1% per enhancement level" for Enhance.
-        # User said: "Forging... increase base attributes +1%"
-        # The logic above (recalculate_stats loop) already handles item_enh_level + slot_enh_level
-        # total_enh_level = item_enh_level + slot_enh_level
-        # bonus_rate = total_enh_level * 0.01
-        # So it IS applied.
-        
-        # WAIT, if item is None, slot level is ignored in loop above!
-        # Forging is on SLOT, so even if no item, maybe no stats?
-        # Usually forging enhances the ITEM in the slot. If no item, 0 stats from slot.
-        # That makes sense.
-        
-        # Check if the user meant "Forging adds 1% global stats"?
-        # "锻体...增加装备基础属性的百分之1" -> "Increase equipment base stats by 1%"
-        # So it requires equipment.
-        
         # Cap current HP/MP to new max
         if self.hp > self.max_hp:
             self.hp = self.max_hp
         if self.mp > self.max_mp:
             self.mp = self.max_mp
+        self.refresh_potion_triggers()
+
+        self.stats_revision += 1
+
+    def preview_stats(self, changes):
+        """
+        Stats this player would have after hypothetical changes, without applying them.
+        :param changes: {"equip": {slot: item or None}, "forge": {slot: level}, "enhance": {slot: level}}
+        :return: {stat name: value} for every name in STAT_NAMES
+        """
+        vector = self.stat_model.preview(self, changes.get("equip"), changes.get("forge"), changes.get("enhance"))
+        return dict(zip(STAT_NAMES, vector))
+
+    def add_stat_modifier(self, stat, amount):
+        """
+        Add (or with a negative amount take back) a temporary bonus.
+        Applied straight onto the current stat, recalculate_stats re-applies it later.
+        """
+        self.stat_modifiers[stat] = self.stat_modifiers.get(stat, 0) + amount
+        if not self.stat_modifiers[stat]:
+            del self.stat_modifiers[stat]
+        setattr(self, stat, getattr(self, stat) + amount)
+        self.stats_revision += 1
 
     def use_item(self, item, inventory_index=None):
         """
@@ -327,10 +326,7 @@ class Player:
                 if inventory_index is not None:
                     # Logic handled by caller or specific remove logic
                     # If passed object is from inventory list, decrement count
-                    if item.stackable and item.count > 1:
-                        item.count -= 1
-                    else:
-                        self.inventory.items[inventory_index] = None
+                    self.inventory.take(inventory_index)
                 else:
                     # Find and remove if index not provided
                     self.inventory.remove_item(item, count=1)
@@ -367,10 +363,11 @@ class Player:
             
             # Learn
             self.skills.append(skill)
+            self.cooldowns.register(skill)
             
             # Remove Item
             if inventory_index is not None:
-                self.inventory.items[inventory_index] = None
+                self.inventory.set_slot(inventory_index, None)
             else:
                 self.inventory.remove_item(item)
                 
@@ -378,84 +375,42 @@ class Player:
 
         return (False, "该物品无法直接使用")
 
-    def check_auto_potion(self):
+    def check_auto_potion(self, now=None):
         """
-        Check HP/MP and auto use potions if enabled.
-        Should be called in game loop update.
+        Drink an HP / MP potion if a value is below its auto-potion threshold.
+        Only needs calling while potion_due is set (the hp / mp setters set it on a drop).
+        :return: True if a potion was used
         """
-        # Lazy initialization for runtime safety
-        if not hasattr(self, 'auto_potion_settings'):
-            self.auto_potion_settings = {
-                "enabled": False,
-                "hp_threshold": 70,
-                "mp_threshold": 30,
-                "hp_potion": "金创药(中)",
-                "mp_potion": "魔法药(中)"
-            }
-        if not hasattr(self, 'last_potion_time'):
-            self.last_potion_time = 0.0
-
-        if not self.auto_potion_settings.get("enabled", False):
-            return
+        self.potion_due = False
+        settings = self.auto_potion_settings
+        if not settings.get("enabled", False):
+            return False
 
         import time
-        current_time = time.time()
-        if current_time - self.last_potion_time < 1.0: # 1 second global potion cooldown
-            return
-
-        used_any = False
-
-        # Helper to find potion
-        from src.systems.equipment.item import ItemType
-        def find_potion_index(preferred_name, stat_type):
-            # 1. Exact match
-            idx = self.inventory.find_item_index(preferred_name)
-            if idx != -1: return idx
-            
-            # 2. Fuzzy match (Any consumable with stat)
-            # Prioritize lower value potions to save big ones? Or just first found?
-            # Inventory sort puts consumables at end usually.
-            # Let's find *any* suitable potion.
-            for i, item in enumerate(self.inventory.items):
-                if item and item.item_type == ItemType.CONSUMABLE:
-                    if stat_type in item.stats and item.stats[stat_type] > 0:
-                        return i
-            return -1
-
-        # Check HP
-        hp_pct = (self.hp / self.max_hp) * 100
-        threshold_hp = self.auto_potion_settings.get("hp_threshold", 70)
-        
-        if hp_pct < threshold_hp:
-            potion_name = self.auto_potion_settings.get("hp_potion", "")
-            # Find in inventory with fallback
-            idx = find_potion_index(potion_name, "hp")
-            
-            if idx != -1:
-                item = self.inventory.items[idx]
-                success, msg = self.use_item(item, idx)
-                if success:
-                    # print(f"[Auto Potion] Used {item.name}: {msg}")
-                    used_any = True
-
-        # Check MP (if not already used potion, or separate cooldown? Let's share cooldown for now to simulate animation delay)
-        if not used_any:
-            mp_pct = (self.mp / self.max_mp) * 100
-            threshold_mp = self.auto_potion_settings.get("mp_threshold", 30)
-            
-            if mp_pct < threshold_mp:
-                potion_name = self.auto_potion_settings.get("mp_potion", "")
-                idx = find_potion_index(potion_name, "mp")
-                
-                if idx != -1:
-                    item = self.inventory.items[idx]
-                    success, msg = self.use_item(item, idx)
-                    if success:
-                        # print(f"[Auto Potion] Used {item.name}: {msg}")
-                        used_any = True
-        
-        if used_any:
-            self.last_potion_time = current_time
+        now = time.time() if now is None else now
+        if now - self.last_potion_time < POTION_COOLDOWN:
+            self.potion_due = True # Retry once the shared cooldown is over
+            return False
+
+        # HP first, one potion per cooldown
+        policy = settings.get("potion_policy", POTION_SMALLEST_SUFFICIENT)
+        for stat, current, maximum, trigger in (("hp", self._hp, self.max_hp, self._hp_trigger),
+                                                ("mp", self._mp, self.max_mp, self._mp_trigger)):
+            if current >= trigger:
+                continue
+            idx = self.inventory.find_potion(stat, maximum - current, policy, settings.get(stat + "_potion"))
+            if idx == -1:
+                continue
+            success, msg = self.use_item(self.inventory.items[idx], idx)
+            if success:
+                self.last_potion_time = now
+                # Still low (or the other stat is): go again after the cooldown
+                self.potion_due = self._hp < self._hp_trigger or self._mp < self._mp_trigger
+                return True
+        # No potion: keep checking while still low, so potions bought / looted meanwhile get used
+        # (find_potion returns right away on an empty potion index)
+        self.potion_due = self._hp < self._hp_trigger or self._mp < self._mp_trigger
+        return False
 
     def recycle_items(self, recycle_qualities):
         """
@@ -468,8 +423,7 @@ class Player:
         to_remove = []
         rewards = {"gold": 0, "ingots": 0, "stone": 0, "mythic_stone": 0, "count": 0}
         
-        for i, item in enumerate(self.inventory.items):
-            if not item: continue
+        for i, item in self.inventory.occupied():
             
             # Check is_equipment flag
             if not getattr(item, 'is_equipment', False):
@@ -508,17 +462,24 @@ class Player:
                     rewards["stone"] += 5
                     
         # Remove items
-        for idx in to_remove:
-            self.inventory.items[idx] = None
+        self.inventory.remove_items(to_remove)
             
         # Add rewards
         if rewards["gold"] > 0: self.gold += rewards["gold"]
         if rewards["ingots"] > 0: self.ingots += rewards["ingots"]
         
-        for _ in range(rewards["stone"]):
-            self.inventory.add_item(UpgradeStone())
-        for _ in range(rewards["mythic_stone"]):
-            self.inventory.add_item(MythicUpgradeStone())
+        # Stones go in as one batch (the recycled gear always weighed more than they do)
+        stones = []
+        if rewards["stone"] > 0:
+            stone = UpgradeStone()
+            stone.count = rewards["stone"]
+            stones.append(stone)
+        if rewards["mythic_stone"] > 0:
+            stone = MythicUpgradeStone()
+            stone.count = rewards["mythic_stone"]
+            stones.append(stone)
+        if stones:
+            self.inventory.add_items(stones)
             
         return rewards
 
@@ -575,13 +536,14 @@ class Player:
         if slot:
             # Safer swap logic
             # 1. Remove new item from inventory to free up space
+            index = self.inventory.index_of(item)
             if not self.inventory.remove_item(item):
                 return (False, "无法从背包移除物品")
             
             # 2. Unequip existing if any
             if self.equipment[slot]:
-                # Add old item to inventory
-                if not self.inventory.add_item(self.equipment[slot]):
+                # Add old item to inventory, on the page the new one came from
+                if not self.inventory.add_item(self.equipment[slot], page=index // self.inventory.page_size):
                     # Failed to add old item (should rarely happen if we just removed one, unless item size differs or something)
                     # Rollback
                     self.inventory.add_item(item)
@@ -589,7 +551,7 @@ class Player:
             
             # 3. Equip new
             self.equipment[slot] = item
-            self.recalculate_stats()
+            self.recalculate_stats((slot,))
             return (True, "success")
         return (False, "无法佩戴此物品")
 
@@ -598,30 +560,31 @@ class Player:
             item = self.equipment[slot]
             if self.inventory.add_item(item):
                 self.equipment[slot] = None
-                self.recalculate_stats()
+                self.recalculate_stats((slot,))
                 return True
         return False
 
     def gain_xp(self, amount):
+        """:return: number of levels gained (big quest rewards / offline grants can be many)"""
         print(f"{self.name} gained {amount} XP.")
         self.current_xp += amount
-        leveled_up, remaining_xp = self.xp_system.check_level_up(self.current_xp, self.level)
-        if leveled_up:
-            self.level_up(remaining_xp)
-
-    def level_up(self, remaining_xp):
-        self.level += 1
+        new_level, remaining_xp = self.xp_system.levels_for_xp(self.current_xp, self.level)
+        gained = new_level - self.level
+        if gained > 0:
+            self.level_up(remaining_xp, gained)
+        return gained
+
+    def level_up(self, remaining_xp, levels=1):
+        """Apply `levels` level-ups in one go."""
+        self.level += levels
         self.current_xp = remaining_xp
         print(f"Congratulations! {self.name} reached level {self.level}!")
         # Increase stats
-        self.max_hp += 20
-        self.max_mp += 10
+        self.max_hp += 20 * levels
+        self.max_mp += 10 * levels
         self.hp = self.max_hp
         self.mp = self.max_mp
-        # Check for multi-level up
-        leveled_up, remaining_xp = self.xp_system.check_level_up(self.current_xp, self.level)
-        if leveled_up:
-            self.level_up(remaining_xp)
+        self.refresh_potion_triggers()
 
     def __str__(self):
         return f"[{self.profession.value}] {self.name} Lv.{self.level} (HP: {self.hp}/{self.max_hp})"
@@ -686,6 +649,8 @@ class Player:
         # Use update to merge with default to ensure all keys exist
         saved_ap_settings = data.get("auto_potion_settings", {})
         player.auto_potion_settings.update(saved_ap_settings)
+        if saved_ap_settings and "potion_policy" not in saved_ap_settings:
+            player.auto_potion_settings["potion_policy"] = POTION_PREFERRED # Same as __setstate__
         
         # Restore Inventory
         if "inventory" in data:
@@ -711,6 +676,7 @@ class Player:
             skill = player.skill_book.get_skill(name)
             if skill:
                 player.skills.append(skill)
+                player.cooldowns.register(skill)
         
         # Ensure active skill is valid
         if player.skills:
@@ -0,0 +1,172 @@
+"""
+Layered player stats: base (level / profession) + equipment + full-body enhancement
++ cultivation + status-effect modifiers, kept as a fixed-order stat vector.
+
+Each slot's equipment contribution (item stats, item enhancement, slot forging) is cached
+and only rebuilt when that slot's item, enhancement or forge level changes.
+"""
+
+# Fixed order of the stat vector (Player attribute names)
+STAT_NAMES = ("max_hp", "max_mp", "attack", "magic", "taoism", "defense", "magic_defense",
+              "accuracy", "dodge", "crit", "luck", "attack_speed", "cooldown_reduction")
+STAT_INDEX = {name: i for i, name in enumerate(STAT_NAMES)}
+
+# Item stat key -> vector index (items say "hp"/"mp" for max HP/MP), unknown keys are ignored
+ITEM_STAT_INDEX = dict(STAT_INDEX, hp=STAT_INDEX["max_hp"], mp=STAT_INDEX["max_mp"])
+del ITEM_STAT_INDEX["max_hp"], ITEM_STAT_INDEX["max_mp"]
+
+# Slots that must all be worn for the full-body enhancement bonus
+FULL_BODY_SLOTS = ("weapon", "armor", "helmet", "necklace", "bracelet_l", "bracelet_r", "ring_l", "ring_r", "belt", "boots", "medal")
+MAX_FULL_BODY_LEVEL = 15
+# Stats scaled by the full-body bonus
+FULL_BODY_STATS = tuple(STAT_INDEX[n] for n in ("max_hp", "max_mp", "attack", "magic", "taoism", "defense", "magic_defense"))
+
+ZERO = (0,) * len(STAT_NAMES)
+
+def base_vector(player):
+    """Level / profession stats before any gear (STAT_NAMES order)."""
+    lvl = player.level - 1
+    return [player.base_max_hp + lvl * 20, getattr(player, 'base_max_mp', 50) + lvl * 10, player.base_attack,
+            getattr(player, 'base_magic', 0), getattr(player, 'base_taoism', 0), getattr(player, 'base_defense', 5),
+            getattr(player, 'base_magic_defense', 0), 5, 5, 5, 0, 0, 0.0]
+
+def slot_vector(item, slot_level, enhancement=None):
+    """
+    One worn item's contribution: stat + item enhancement (flat) + slot forging (% of the stat, at least 1).
+    Sparse: tuple of (vector index, amount), items only carry a few stats.
+    :param enhancement: overrides the item's enhancement level (previews)
+    """
+    if item is None:
+        return ()
+    flat = getattr(item, 'enhancement_level', 0) if enhancement is None else enhancement
+    result = []
+    for k, base_val in item.stats.items():
+        i = ITEM_STAT_INDEX.get(k)
+        if i is None:
+            continue
+        slot_bonus = int(base_val * slot_level * 0.01)
+        if slot_level > 0 and slot_bonus < 1:
+            slot_bonus = 1
+        result.append((i, base_val + flat + slot_bonus))
+    return tuple(result)
+
+def full_body_level(enh_levels):
+    """:param enh_levels: enhancement level per FULL_BODY_SLOTS slot, None for an empty slot"""
+    if any(lvl is None for lvl in enh_levels):
+        return 0
+    return min(MAX_FULL_BODY_LEVEL, *enh_levels)
+
+def finish(v, full_body, cultivation_stats, modifiers):
+    """Global layers on top of base + equipment, in the order recalculate_stats always applied them."""
+    if full_body > 0:
+        mult = 1.0 + full_body * 0.01
+        for i in FULL_BODY_STATS:
+            v[i] = int(v[i] * mult)
+    if cultivation_stats:
+        v[STAT_INDEX["attack"]] += cultivation_stats.get("attack", 0)
+        v[STAT_INDEX["defense"]] += cultivation_stats.get("defense", 0)
+        if cultivation_stats.get("hp_pct", 0) > 0:
+            v[STAT_INDEX["max_hp"]] = int(v[STAT_INDEX["max_hp"]] * (1 + cultivation_stats["hp_pct"] / 100.0))
+        if cultivation_stats.get("mp_pct", 0) > 0:
+            v[STAT_INDEX["max_mp"]] = int(v[STAT_INDEX["max_mp"]] * (1 + cultivation_stats["mp_pct"] / 100.0))
+    for stat, amount in (modifiers or {}).items():
+        v[STAT_INDEX[stat]] += amount
+    return v
+
+class StatModel:
+    """
+    Per-player cache of the equipment layer.
+    A slot entry is reused while the slot holds the same item object with the same stats,
+    enhancement level and forge level, so re-gearing one slot recomputes one slot.
+    Stats are compared against a copy, so in-place edits (add_stat, migrations) are picked up.
+    """
+    def __init__(self):
+        self._slots = {} # slot -> (item, copy of its stats, enhancement, forge level, sparse slot vector)
+        self._total = list(ZERO) # Sum of all slot vectors
+        self._full_body = None # Full-body enhancement level, None = recompute
+
+    def invalidate(self):
+        self.__init__()
+
+    def _update_slot(self, slot, item, slot_level):
+        entry = self._slots.get(slot)
+        vec = slot_vector(item, slot_level)
+        total = self._total
+        if entry is not None:
+            for i, amount in entry[4]:
+                total[i] -= amount
+        for i, amount in vec:
+            total[i] += amount
+        self._full_body = None
+        if item is None:
+            self._slots[slot] = (None, None, None, slot_level, vec)
+        else:
+            self._slots[slot] = (item, dict(item.stats), getattr(item, 'enhancement_level', 0), slot_level, vec)
+
+    def equipment_vector(self, equipment, slot_levels, changed_slots=None):
+        """
+        Sum of the slot contributions, only slots that changed since the last call are recomputed.
+        :param changed_slots: slots the caller touched; None checks every slot
+        """
+        slots = self._slots
+        # The hint is only valid once every slot is cached (fresh model after load / invalidate)
+        if changed_slots is None or any(slot not in slots for slot in equipment):
+            changed = equipment.items()
+        else:
+            changed = [(slot, equipment[slot]) for slot in changed_slots]
+        for slot, item in changed:
+            level = slot_levels.get(slot, 0)
+            entry = slots.get(slot)
+            if entry is not None and entry[0] is item and entry[3] == level and (
+                    item is None or (entry[1] == item.stats and entry[2] == getattr(item, 'enhancement_level', 0))):
+                continue
+            self._update_slot(slot, item, level)
+        return self._total
+
+    def full_body_level(self):
+        # Enhancement levels straight from the slot cache (valid right after equipment_vector)
+        if self._full_body is None:
+            slots = self._slots
+            self._full_body = full_body_level([slots[s][2] if s in slots else None for s in FULL_BODY_SLOTS])
+        return self._full_body
+
+    def preview(self, player, equip=None, forge=None, enhance=None):
+        """
+        Stat vector with hypothetical changes, player state is not touched.
+        Starts from the cached equipment total and only recomputes the slots being changed.
+        :param equip: {slot: item or None}
+        :param forge: {slot: forge level}
+        :param enhance: {slot: enhancement level of the item in that slot}
+        """
+        equip = equip or {}
+        forge = forge or {}
+        enhance = enhance or {}
+        equipment = player.equipment
+        slot_levels = player.equipment_slot_levels
+        total = list(self.equipment_vector(equipment, slot_levels))
+        slots = self._slots
+
+        enh_levels = {s: slots[s][2] for s in FULL_BODY_SLOTS if s in slots}
+        for slot in set(equip) | set(forge) | set(enhance):
+            item = equip[slot] if slot in equip else equipment.get(slot)
+            level = forge.get(slot, slot_levels.get(slot, 0))
+            enh = enhance.get(slot) if item is not None else None
+            entry = slots.get(slot)
+            if entry is not None:
+                for i, amount in entry[4]:
+                    total[i] -= amount
+            for i, amount in slot_vector(item, level, enh):
+                total[i] += amount
+            enh_levels[slot] = None if item is None else (getattr(item, 'enhancement_level', 0) if enh is None else enh)
+
+        v = [a + b for a, b in zip(base_vector(player), total)]
+        full_body = full_body_level([enh_levels.get(s) for s in FULL_BODY_SLOTS])
+        cultivation = player.body_cultivation.stats if player.body_cultivation else None
+        return finish(v, full_body, cultivation, getattr(player, 'stat_modifiers', None))
+
+    def compute(self, player, changed_slots=None):
+        """Final stat vector for the player's current gear / level / cultivation / modifiers."""
+        equip = self.equipment_vector(player.equipment, player.equipment_slot_levels, changed_slots)
+        v = [a + b for a, b in zip(base_vector(player), equip)]
+        cultivation = player.body_cultivation.stats if player.body_cultivation else None
+        return finish(v, self.full_body_level(), cultivation, getattr(player, 'stat_modifiers', None))
@@ -0,0 +1,78 @@
+SHAPE_CONE = "cone" # Widening arc in front of the caster
+SHAPE_LINE = "line" # Straight line from the caster towards the target
+SHAPE_RADIUS = "radius" # Filled square around the anchor (chebyshev distance <= size)
+SHAPE_AROUND = "around" # Filled square around the anchor without the centre tile (the caster)
+# Shape names pickled by older saves
+_LEGACY_SHAPES = {"ring": SHAPE_AROUND}
+
+ANCHOR_SELF = "self"
+ANCHOR_TARGET = "target"
+
+# (shape, size, direction) -> tuple of (dx, dy), shared by every cast
+_OFFSET_CACHE = {}
+
+def facing(dx, dy):
+    # Snap a delta onto one of the 4 movement directions
+    if dx == 0 and dy == 0:
+        return (1, 0)
+    if abs(dx) >= abs(dy):
+        return (1 if dx > 0 else -1, 0)
+    return (0, 1 if dy > 0 else -1)
+
+def shape_offsets(shape, size, direction=(1, 0)):
+    key = (shape, size, direction)
+    offsets = _OFFSET_CACHE.get(key)
+    if offsets is not None:
+        return offsets
+
+    fx, fy = direction
+    lx, ly = -fy, fx # Lateral axis
+    shape = _LEGACY_SHAPES.get(shape, shape)
+    result = []
+    if shape == SHAPE_CONE:
+        for f in range(1, size + 1):
+            for l in range(-f, f + 1):
+                result.append((fx * f + lx * l, fy * f + ly * l))
+    elif shape == SHAPE_LINE:
+        for f in range(1, size + 1):
+            result.append((fx * f, fy * f))
+    elif shape == SHAPE_RADIUS:
+        for dy in range(-size, size + 1):
+            for dx in range(-size, size + 1):
+                result.append((dx, dy))
+    elif shape == SHAPE_AROUND:
+        for dy in range(-size, size + 1):
+            for dx in range(-size, size + 1):
+                if dx or dy:
+                    result.append((dx, dy))
+    else:
+        raise ValueError(f"Unknown AoE shape: {shape}")
+
+    offsets = tuple(result)
+    _OFFSET_CACHE[key] = offsets
+    return offsets
+
+class AreaOfEffect:
+    """
+    Shape template of an area skill.
+    :param anchor: ANCHOR_SELF (centred on / pointing away from the caster) or ANCHOR_TARGET
+    """
+    def __init__(self, shape, size=1, anchor=ANCHOR_SELF):
+        self.shape = shape
+        self.size = size
+        self.anchor = anchor
+
+    def tiles(self, caster_x, caster_y, target_x, target_y):
+        if self.anchor == ANCHOR_TARGET:
+            ox, oy = target_x, target_y
+        else:
+            ox, oy = caster_x, caster_y
+        direction = facing(target_x - caster_x, target_y - caster_y)
+        return [(ox + dx, oy + dy) for dx, dy in shape_offsets(self.shape, self.size, direction)]
+
+    def __repr__(self):
+        return f"AreaOfEffect({self.shape}, {self.size}, {self.anchor})"
+
+def area_targets(game_map, area, caster_x, caster_y, target_x, target_y):
+    """All live monsters covered by the area: one occupancy lookup per tile."""
+    return game_map.monsters_at(area.tiles(caster_x, caster_y, target_x, target_y))
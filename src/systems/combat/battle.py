@@ -1,17 +1,34 @@
 import random
 from src.systems.character.player import Player
 from src.systems.world.monster import Monster
+from src.systems.combat.resolver import default_resolver
 
 class BattleSystem:
     @staticmethod
-    def fight(player: Player, monster: Monster):
+    def predict(player: Player, monster: Monster, potion_heal=0, samples=None, resolver=None):
+        """
+        Fight outcome without touching either side.
+        :param potion_heal: HP per potion, used for the potions estimate (0 = no potions)
+        :param samples: Monte Carlo fights when hit / crit / dodge rolls decide whether the player dies
+                        (None = default count, 0 = expectation only)
+        :return: FightPrediction(turns, damage_taken, potions, death_chance, exact)
+        """
+        resolver = resolver or default_resolver
+        return resolver.predict(player, monster, potion_heal, samples)
+
+    @staticmethod
+    def fight(player: Player, monster: Monster, resolver=None):
+        resolver = resolver or default_resolver
         print(f"Battle started: {player.name} vs {monster.name}")
         
         while player.hp > 0 and monster.is_alive():
             # Player turn
-            damage = max(1, player.attack - monster.defense)
-            monster.take_damage(damage)
-            print(f"You hit {monster.name} for {damage} damage.")
+            hit = resolver.player_attack(player, monster)
+            if hit.hit:
+                monster.take_damage(hit.damage)
+                print(f"You hit {monster.name} for {hit.damage} damage." + (" (crit)" if hit.crit else ""))
+            else:
+                print(f"{monster.name} dodged your attack.")
             
             if not monster.is_alive():
                 print(f"You defeated {monster.name}!")
@@ -19,9 +36,12 @@ class BattleSystem:
                 return True
 
             # Monster turn
-            m_damage = max(1, monster.attack - player.defense)
-            player.hp -= m_damage
-            print(f"{monster.name} hits you for {m_damage} damage. Your HP: {player.hp}/{player.max_hp}")
+            m_damage = resolver.monster_attack(monster, player)
+            if m_damage:
+                player.hp -= m_damage
+                print(f"{monster.name} hits you for {m_damage} damage. Your HP: {player.hp}/{player.max_hp}")
+            else:
+                print(f"You dodged {monster.name}'s attack.")
             
             if player.hp <= 0:
                 print("You have been defeated...")
@@ -0,0 +1,92 @@
+import heapq
+import time
+
+def effective_cooldown(cooldown, reduction_pct):
+    reduction_pct = min(100.0, max(0.0, reduction_pct))
+    return cooldown * (1.0 - reduction_pct / 100.0)
+
+class CooldownManager:
+    """
+    Per-player skill cooldowns, kept apart from the shared Skill definitions.
+    Effective cooldowns are cached until the cooldown reduction changes; skills
+    that are cooling down sit in a min-heap of ready times.
+    """
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.known = set() # Skill names this player can use
+        self.ready = set() # Known skills that are usable right now (as of the last expire)
+        self.ready_at = {} # Skill name -> timestamp it becomes usable (only while cooling)
+        self._heap = [] # (ready_at, name), stale entries are skipped lazily
+        self._reduction = None
+        self._effective = {} # Skill name -> effective cooldown at self._reduction
+
+    def register(self, skill):
+        if skill is not None and skill.name not in self.known:
+            self.known.add(skill.name)
+            self.ready.add(skill.name)
+
+    def effective_cooldown(self, skill, reduction_pct):
+        if reduction_pct != self._reduction:
+            self._reduction = reduction_pct
+            self._effective = {}
+        cd = self._effective.get(skill.name)
+        if cd is None:
+            cd = effective_cooldown(skill.cooldown, reduction_pct)
+            self._effective[skill.name] = cd
+        return cd
+
+    def remaining(self, skill, now=None):
+        ready = self.ready_at.get(skill.name)
+        if ready is None:
+            return 0.0
+        now = self.clock() if now is None else now
+        return max(0.0, ready - now)
+
+    def is_ready(self, skill, now=None):
+        return self.remaining(skill, now) <= 0.0
+
+    def trigger(self, skill, reduction_pct, now=None):
+        """Start the skill's cooldown, returns the time it is ready again."""
+        now = self.clock() if now is None else now
+        self.known.add(skill.name)
+        ready = now + self.effective_cooldown(skill, reduction_pct)
+        if ready > now:
+            self.ready_at[skill.name] = ready
+            self.ready.discard(skill.name)
+            heapq.heappush(self._heap, (ready, skill.name))
+        else:
+            self.ready_at.pop(skill.name, None)
+            self.ready.add(skill.name)
+        return ready
+
+    def _expire(self, now):
+        heap = self._heap
+        while heap:
+            ready, name = heap[0]
+            if self.ready_at.get(name) != ready:
+                heapq.heappop(heap) # Superseded by a later trigger
+            elif ready <= now:
+                heapq.heappop(heap)
+                del self.ready_at[name]
+                self.ready.add(name)
+            else:
+                break
+
+    def next_ready(self, now=None):
+        """
+        (skill name, time) of the next usable skill; time is `now` when one is usable already.
+        (None, None) if no skills are registered.
+        """
+        now = self.clock() if now is None else now
+        self._expire(now)
+        if self.ready:
+            return (next(iter(self.ready)), now)
+        if self._heap:
+            ready, name = self._heap[0]
+            return (name, ready)
+        return (None, None)
+
+    def reset(self):
+        self.ready_at = {}
+        self._heap = []
+        self.ready = set(self.known)
@@ -0,0 +1,243 @@
+import heapq
+from array import array
+from collections import namedtuple
+
+EFFECT_POISON = "poison" # Damage over time on one monster
+EFFECT_BURN = "burn" # Damage over time on every monster standing in a ground zone
+EFFECT_SHIELD = "shield" # Percentage of incoming damage absorbed (player)
+EFFECT_BUFF = "buff" # Flat stat bonus (player)
+EFFECT_ROOT = "root" # Monster cannot move
+
+TICK_INTERVAL = 1.0 # Seconds of game time between batched ticks
+PLAYER_TARGET = -1 # Target id used for the player, monsters use their entity_id
+MAX_SHIELD_PCT = 80
+
+# What a skill applies when cast.
+# power + scale * caster attribute (`scale_by`) gives the magnitude: damage per tick,
+# absorbed % or stat bonus. `stat` is the buffed Player attribute for EFFECT_BUFF.
+EffectSpec = namedtuple("EffectSpec", ["kind", "duration", "power", "scale", "scale_by", "stat"],
+                        defaults=(0, 0.0, None, None))
+
+def effect_magnitude(spec, caster):
+    bonus = getattr(caster, spec.scale_by, 0) * spec.scale if spec.scale_by and caster is not None else 0
+    value = int(spec.power + bonus)
+    if spec.kind == EFFECT_SHIELD:
+        value = min(MAX_SHIELD_PCT, value)
+    return max(0, value)
+
+class EffectTable:
+    """
+    All active effects of one kind, stored column-wise.
+    Rows are swap-removed so the columns stay dense and a tick is one pass over them.
+    """
+    def __init__(self, kind):
+        self.kind = kind
+        self.handles = array("l")
+        self.targets = array("l")
+        self.magnitude = array("l")
+        self.expires = array("d")
+        self.extra = [] # Per-row payload: zone tiles (burn) or stat name (buff)
+        self._row = {} # handle -> row
+
+    def __len__(self):
+        return len(self.handles)
+
+    def find(self, target, extra=None):
+        # Tables hold a handful of rows, a linear scan is fine
+        for i, t in enumerate(self.targets):
+            if t == target and self.extra[i] == extra:
+                return self.handles[i]
+        return None
+
+    def add(self, handle, target, magnitude, expires, extra=None):
+        self._row[handle] = len(self.handles)
+        self.handles.append(handle)
+        self.targets.append(target)
+        self.magnitude.append(magnitude)
+        self.expires.append(expires)
+        self.extra.append(extra)
+
+    def row(self, handle):
+        return self._row.get(handle)
+
+    def remove(self, handle):
+        i = self._row.pop(handle, None)
+        if i is None:
+            return None
+        last = len(self.handles) - 1
+        removed = (self.targets[i], self.magnitude[i], self.extra[i])
+        if i != last:
+            for col in (self.handles, self.targets, self.magnitude, self.expires, self.extra):
+                col[i] = col[last]
+            self._row[self.handles[i]] = i
+        for col in (self.handles, self.targets, self.magnitude, self.expires, self.extra):
+            col.pop()
+        return removed
+
+    def clear(self):
+        self.__init__(self.kind)
+
+class StatusEffects:
+    """
+    Poison / burn / shield / buff / root effects for the current map and the player.
+    Every kind lives in its own EffectTable; damage ticks run for all rows at once on
+    the game scheduler, and expiry goes through one min-heap of (expires, handle).
+    Buffs go through Player.add_stat_modifier, so a tick never needs recalculate_stats.
+    """
+    def __init__(self, scheduler, get_player=None, tick=TICK_INTERVAL):
+        self.scheduler = scheduler
+        self.get_player = get_player or (lambda: None)
+        self.tick_interval = tick
+        self.game_map = None
+        self.tables = {kind: EffectTable(kind) for kind in (EFFECT_POISON, EFFECT_BURN, EFFECT_SHIELD, EFFECT_BUFF, EFFECT_ROOT)}
+        self._heap = []
+        self._kind_of = {} # handle -> kind
+        self._next_handle = 1
+        self._task = None
+        self.on_kills = None # Callback(list of monsters) for monsters killed by a tick
+
+    def start(self):
+        if self._task is None:
+            self._task = self.scheduler.call_every(self.tick_interval, self.tick)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def set_map(self, game_map):
+        # Monster effects belong to the old map, player effects carry over
+        for kind in (EFFECT_POISON, EFFECT_BURN, EFFECT_ROOT):
+            for handle in list(self.tables[kind].handles):
+                self.remove(handle)
+        self.game_map = game_map
+
+    def reset(self):
+        # Character switch / re-entry: take back the buffs of the player leaving (it stays in memory
+        # in the character list), call before swapping the player
+        for handle in list(self._kind_of):
+            self.remove(handle)
+        for table in self.tables.values():
+            table.clear()
+        self._heap = []
+        self._kind_of = {}
+
+    # --- Applying ---
+
+    def apply(self, spec, target, caster=None, tiles=None):
+        """
+        Apply an effect, re-applying the same kind on the same target refreshes it.
+        :param target: a Monster, or None for the player
+        :param tiles: ground tiles for EFFECT_BURN
+        :return: effect handle
+        """
+        table = self.tables[spec.kind]
+        now = self.scheduler.now
+        expires = now + spec.duration
+        magnitude = effect_magnitude(spec, caster)
+        target_id = PLAYER_TARGET if target is None else target.entity_id
+        extra = tuple(tiles) if spec.kind == EFFECT_BURN else spec.stat
+
+        # Zones never merge, everything else refreshes in place
+        handle = None if spec.kind == EFFECT_BURN else table.find(target_id, extra)
+        if handle is not None:
+            i = table.row(handle)
+            if spec.kind == EFFECT_BUFF and magnitude != table.magnitude[i]:
+                self._buff_delta(spec.stat, magnitude - table.magnitude[i])
+            table.magnitude[i] = magnitude
+            table.expires[i] = expires
+        else:
+            handle = self._next_handle
+            self._next_handle += 1
+            table.add(handle, target_id, magnitude, expires, extra)
+            self._kind_of[handle] = spec.kind
+            if spec.kind == EFFECT_BUFF:
+                self._buff_delta(spec.stat, magnitude)
+            elif spec.kind == EFFECT_ROOT and target is not None:
+                target.rooted = True # Skips movement (and bumping into the player) in the map AI
+        heapq.heappush(self._heap, (expires, handle))
+        return handle
+
+    def apply_skill(self, skill, caster, monster, tiles=None):
+        spec = getattr(skill, 'effect', None)
+        if spec is None:
+            return None
+        if spec.kind in (EFFECT_SHIELD, EFFECT_BUFF):
+            return self.apply(spec, None, caster)
+        if spec.kind == EFFECT_BURN:
+            return self.apply(spec, None, caster, tiles or [(monster.x, monster.y)])
+        return self.apply(spec, monster, caster)
+
+    def remove(self, handle):
+        kind = self._kind_of.pop(handle, None)
+        if kind is None:
+            return
+        removed = self.tables[kind].remove(handle)
+        target_id, magnitude, extra = removed
+        if kind == EFFECT_BUFF:
+            self._buff_delta(extra, -magnitude)
+        elif kind == EFFECT_ROOT and self.game_map is not None:
+            monster = self.game_map.monsters_by_id.get(target_id)
+            if monster is not None:
+                monster.rooted = False
+
+    def _buff_delta(self, stat, delta):
+        player = self.get_player()
+        if player is not None and delta:
+            player.add_stat_modifier(stat, delta)
+
+    # --- Queries ---
+
+    def absorb(self, damage):
+        """Damage the player actually takes after shields."""
+        table = self.tables[EFFECT_SHIELD]
+        if not damage or not len(table):
+            return damage
+        pct = min(MAX_SHIELD_PCT, sum(table.magnitude))
+        return max(0, damage - damage * pct // 100)
+
+    def has(self, kind, target=None, extra=None):
+        """:param extra: buffed stat for EFFECT_BUFF"""
+        target_id = PLAYER_TARGET if target is None else target.entity_id
+        return self.tables[kind].find(target_id, extra) is not None
+
+    # --- Ticking ---
+
+    def _expire(self, now):
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires, handle = heapq.heappop(heap)
+            kind = self._kind_of.get(handle)
+            if kind is None:
+                continue
+            table = self.tables[kind]
+            # A refresh pushed a later entry, this one is stale
+            if table.expires[table.row(handle)] == expires:
+                self.remove(handle)
+
+    def tick(self):
+        """Batched damage tick for poison and burn, then expiry."""
+        game_map = self.game_map
+        killed = []
+        if game_map is not None:
+            get = game_map.monsters_by_id.get
+            # Poison ignores defense (it is not a hit), dead targets are dropped at expiry
+            poison = self.tables[EFFECT_POISON]
+            for target_id, dmg in zip(poison.targets, poison.magnitude):
+                monster = get(target_id)
+                if monster is not None and monster.is_alive():
+                    monster.hp -= dmg
+                    if not monster.is_alive():
+                        killed.append(monster)
+
+            burn = self.tables[EFFECT_BURN]
+            for tiles, dmg in zip(burn.extra, burn.magnitude):
+                for monster in game_map.monsters_at(tiles):
+                    monster.hp -= dmg
+                    if not monster.is_alive():
+                        killed.append(monster)
+
+        self._expire(self.scheduler.now)
+        if killed and self.on_kills is not None:
+            self.on_kills(killed)
+        return killed
@@ -0,0 +1,239 @@
+import math
+import random
+from collections import namedtuple
+
+# Hit / crit tuning
+BASE_HIT_CHANCE = 0.95
+HIT_PER_POINT = 0.01 # Per point of accuracy over the defender's dodge
+MIN_HIT_CHANCE = 0.5
+MAX_HIT_CHANCE = 1.0
+CRIT_PER_POINT = 0.01
+MAX_CRIT_CHANCE = 0.75
+CRIT_MULTIPLIER = 1.5
+
+# Monsters have no accuracy / dodge / crit columns in MONSTERS_DB yet
+MONSTER_ACCURACY = 5
+MONSTER_DODGE = 5
+
+CombatStats = namedtuple("CombatStats", ["attack", "defense", "accuracy", "dodge", "crit"])
+HitResult = namedtuple("HitResult", ["damage", "hit", "crit"])
+# Fight outcome: player swings needed, HP lost, potions to stay alive, chance to die without potions
+FightPrediction = namedtuple("FightPrediction", ["turns", "damage_taken", "potions", "death_chance", "exact"])
+
+MAX_SIMULATED_TURNS = 10000
+PREDICTION_SAMPLES = 256 # Monte Carlo fights when the rolls decide whether the player dies
+PREDICTION_SWING_BUDGET = 50000 # Simulated swings per prediction, long fights get fewer samples
+
+# One (player stats, monster species, skill multiplier) matchup, everything a hit roll needs
+Matchup = namedtuple("Matchup", ["template", "multiplier", "damage", "crit_damage", "hit_chance", "crit_chance",
+                                 "monster_damage", "monster_hit_chance"])
+
+# --- Formulas ---
+# Plain arithmetic + clip() only, so they work on scalars and on NumPy arrays alike
+# (the balance simulator feeds them whole arrays).
+
+def clip(value, low, high):
+    if hasattr(value, "clip"):
+        return value.clip(low, high)
+    return min(high, max(low, value))
+
+def hit_damage(attack, multiplier, defense):
+    # Same rounding as the old inline formula: int(max(1, attack * mult - defense))
+    raw = attack * multiplier - defense
+    if hasattr(raw, "astype"):
+        return raw.clip(1, None).astype(int)
+    return int(max(1, raw))
+
+def crit_damage(damage):
+    if hasattr(damage, "astype"):
+        return (damage * CRIT_MULTIPLIER).astype(int)
+    return int(damage * CRIT_MULTIPLIER)
+
+def hit_chance(accuracy, dodge):
+    return clip(BASE_HIT_CHANCE + (accuracy - dodge) * HIT_PER_POINT, MIN_HIT_CHANCE, MAX_HIT_CHANCE)
+
+def crit_chance(crit):
+    return clip(crit * CRIT_PER_POINT, 0.0, MAX_CRIT_CHANCE)
+
+# --- Snapshots ---
+
+def player_stats(player):
+    return CombatStats(player.attack, player.defense,
+                       getattr(player, 'accuracy', 5), getattr(player, 'dodge', 5), getattr(player, 'crit', 5))
+
+def monster_stats(template):
+    return CombatStats(template.attack, template.defense, MONSTER_ACCURACY, MONSTER_DODGE, 0)
+
+def build_matchup(p, m, template, multiplier=1.0):
+    damage = hit_damage(p.attack, multiplier, m.defense)
+    return Matchup(
+        template=template,
+        multiplier=multiplier,
+        damage=damage,
+        crit_damage=crit_damage(damage),
+        hit_chance=hit_chance(p.accuracy, m.dodge),
+        crit_chance=crit_chance(p.crit),
+        monster_damage=hit_damage(m.attack, 1.0, p.defense),
+        monster_hit_chance=hit_chance(m.accuracy, p.dodge),
+    )
+
+class CombatResolver:
+    """
+    Resolves player <-> monster hits from cached matchup tables.
+    Tables are keyed by (monster template, skill multiplier) and are only thrown
+    away when the player's stats_revision changes (recalculate_stats).
+    """
+    def __init__(self, rng=None):
+        self.rng = rng or random
+        self._player_key = None
+        self._player_stats = None
+        self._table = {}
+
+    def invalidate(self):
+        self._player_key = None
+        self._table = {}
+
+    def matchup(self, player, monster, multiplier=1.0):
+        key = (id(player), player.stats_revision)
+        if key != self._player_key:
+            self._player_key = key
+            self._player_stats = player_stats(player)
+            self._table = {}
+
+        template = monster.template
+        entry = self._table.get((id(template), multiplier))
+        if entry is None or entry.template is not template:
+            entry = build_matchup(self._player_stats, monster_stats(template), template, multiplier)
+            self._table[(id(template), multiplier)] = entry
+        return entry
+
+    def player_attack(self, player, monster, multiplier=1.0):
+        """Roll one player hit. damage is what gets passed to monster.take_damage (0 on a miss)."""
+        m = self.matchup(player, monster, multiplier)
+        rng = self.rng
+        if m.hit_chance < 1.0 and rng.random() >= m.hit_chance:
+            return HitResult(0, False, False)
+        if m.crit_chance > 0 and rng.random() < m.crit_chance:
+            return HitResult(m.crit_damage, True, True)
+        return HitResult(m.damage, True, False)
+
+    def predict(self, player, monster, potion_heal=0, samples=None):
+        m = self.matchup(player, monster)
+        return predict_fight(m, monster.hp, monster.defense, player.hp, potion_heal, samples, self.rng)
+
+    def expected_turns(self, player, monster):
+        """Mean player swings to kill `monster`, closed form (no sampling)."""
+        return expected_turns(self.matchup(player, monster), monster.hp, monster.defense)
+
+    def monster_attack(self, monster, player):
+        """Roll one monster hit on the player, returns the HP damage (0 when dodged)."""
+        m = self.matchup(player, monster)
+        if m.monster_hit_chance < 1.0 and self.rng.random() >= m.monster_hit_chance:
+            return 0
+        return m.monster_damage
+
+# --- Fight prediction ---
+
+def effective_hit(damage, monster_defense):
+    # Monster.take_damage subtracts defense once more from the resolved hit
+    return max(0, damage - monster_defense)
+
+def expected_hit(m, monster_defense):
+    """Mean HP one swing takes off the monster, misses and crits included."""
+    eff = effective_hit(m.damage, monster_defense)
+    eff_crit = effective_hit(m.crit_damage, monster_defense)
+    return m.hit_chance * ((1 - m.crit_chance) * eff + m.crit_chance * eff_crit)
+
+def expected_turns(m, monster_hp, monster_defense):
+    # Mean damage of a landed hit, crits included
+    avg_hit = (1 - m.crit_chance) * effective_hit(m.damage, monster_defense) + (
+        m.crit_chance * effective_hit(m.crit_damage, monster_defense))
+    if avg_hit <= 0 or m.hit_chance <= 0:
+        return math.inf
+    turns = math.ceil(monster_hp / avg_hit)
+    return turns if m.hit_chance >= 1.0 else turns / m.hit_chance # Misses included
+
+def settled_death(m, eff, eff_crit, monster_hp, player_hp):
+    """
+    1.0 / 0.0 when no sequence of rolls can change whether the player dies, None when it can.
+    The player dies once the monster lands ceil(player_hp / monster_damage) hits.
+    """
+    if not m.monster_damage or m.monster_hit_chance <= 0:
+        return 0.0
+    lethal_hits = math.ceil(player_hp / m.monster_damage)
+    # The monster swings after every player swing that does not kill
+    best = max(eff, eff_crit) if m.crit_chance > 0 else eff
+    fewest_swings = math.ceil(monster_hp / best)
+    most_swings = math.ceil(monster_hp / eff) if eff > 0 and m.hit_chance >= 1.0 else math.inf
+    if most_swings - 1 < lethal_hits:
+        return 0.0
+    if m.monster_hit_chance >= 1.0 and fewest_swings - 1 >= lethal_hits:
+        return 1.0
+    return None
+
+def potions_needed(damage_taken, player_hp, potion_heal):
+    if not potion_heal or damage_taken < player_hp:
+        return 0
+    if damage_taken == math.inf:
+        return math.inf
+    return math.ceil((damage_taken - player_hp + 1) / potion_heal)
+
+def predict_fight(m, monster_hp, monster_defense, player_hp, potion_heal=0, samples=None, rng=None):
+    """
+    Outcome of a player-first melee exchange (same turn order as BattleSystem.fight).
+    Closed form when no roll can change the result. Otherwise turns / damage are expectations
+    and death_chance is a Monte Carlo estimate, unless the rolls cannot change whether the
+    player dies (then it is exactly 0 or 1).
+    :param samples: Monte Carlo fights, None = PREDICTION_SAMPLES (fewer for very long fights),
+                    0 = no sampling (death_chance is then only a verdict on the expected damage)
+    """
+    eff = effective_hit(m.damage, monster_defense)
+    eff_crit = effective_hit(m.crit_damage, monster_defense)
+    deterministic = (m.hit_chance >= 1.0 and m.monster_hit_chance >= 1.0
+                     and (m.crit_chance <= 0 or eff == eff_crit))
+
+    avg_hit = (1 - m.crit_chance) * eff + m.crit_chance * eff_crit
+    if avg_hit <= 0 or m.hit_chance <= 0:
+        # Cannot get through the monster's defense
+        taken = math.inf if m.monster_damage else 0
+        return FightPrediction(math.inf, taken, potions_needed(taken, player_hp, potion_heal),
+                               1.0 if m.monster_damage else 0.0, deterministic)
+
+    turns = expected_turns(m, monster_hp, monster_defense)
+    taken = max(0, turns - 1) * m.monster_damage * m.monster_hit_chance
+    death = 1.0 if taken >= player_hp else 0.0
+    if not deterministic:
+        settled = settled_death(m, eff, eff_crit, monster_hp, player_hp)
+        if settled is None and samples != 0:
+            if samples is None:
+                samples = max(16, min(PREDICTION_SAMPLES, int(PREDICTION_SWING_BUDGET // turns)))
+            return _sample_fights(m, eff, eff_crit, monster_hp, player_hp, potion_heal, samples, rng)
+        if settled is not None:
+            death = settled
+    return FightPrediction(turns, taken, potions_needed(taken, player_hp, potion_heal), death, deterministic)
+
+def _sample_fights(m, eff, eff_crit, monster_hp, player_hp, potion_heal, samples, rng):
+    rng = rng or random
+    total_turns = 0
+    total_taken = 0
+    deaths = 0
+    for _ in range(samples):
+        hp = monster_hp
+        taken = 0
+        turns = 0
+        while hp > 0 and turns < MAX_SIMULATED_TURNS:
+            turns += 1
+            if rng.random() < m.hit_chance:
+                hp -= eff_crit if rng.random() < m.crit_chance else eff
+            if hp > 0 and rng.random() < m.monster_hit_chance:
+                taken += m.monster_damage
+        total_turns += turns
+        total_taken += taken
+        if taken >= player_hp:
+            deaths += 1
+    mean_taken = total_taken / samples
+    return FightPrediction(total_turns / samples, mean_taken, potions_needed(mean_taken, player_hp, potion_heal),
+                           deaths / samples, False)
+
+# Shared default for callers without their own (BattleSystem)
+default_resolver = CombatResolver()
@@ -0,0 +1,91 @@
+from collections import namedtuple
+
+from src.systems.combat.effects import EFFECT_BUFF, EFFECT_BURN, EFFECT_POISON, EFFECT_SHIELD, effect_magnitude
+from src.systems.combat.resolver import expected_hit
+from src.systems.combat.skills import SkillType
+from src.systems.world.targeting import ACTION_TIME
+
+MELEE_RANGE = 1
+LOW_MP_RATIO = 0.3 # Below this MP fraction skills are ranked by damage per MP instead of DPS
+
+# skill None = melee. dps is the expected damage of the action spread over one auto-pilot action.
+Action = namedtuple("Action", ["skill", "range", "dps", "damage_per_mp"])
+
+class RotationPlanner:
+    """
+    Picks the auto-pilot action for the current target, one pass over the player's skills.
+    Damage comes from the resolver's cached matchup tables, readiness from the player's
+    CooldownManager, so a decision is O(skills) dictionary lookups.
+
+    Order: missing self buffs / shields, then the damaging action with the best DPS
+    (damage per MP when MP runs low); melee when it kills anyway or nothing else is usable.
+    """
+    def __init__(self, resolver, effects=None):
+        self.resolver = resolver
+        self.effects = effects
+
+    def melee(self, player, monster):
+        m = self.resolver.matchup(player, monster)
+        dps = expected_hit(m, monster.defense) / ACTION_TIME
+        return Action(None, MELEE_RANGE, dps, float("inf"))
+
+    def rank(self, player, monster, skill):
+        """Action for one skill, None if it does nothing useful against this target."""
+        if skill is None or skill.skill_type == SkillType.PASSIVE:
+            return None
+        spec = getattr(skill, 'effect', None)
+        damage = 0.0
+        if skill.damage_multiplier > 0:
+            m = self.resolver.matchup(player, monster, skill.damage_multiplier)
+            damage = expected_hit(m, monster.defense)
+        if spec is not None and spec.kind in (EFFECT_POISON, EFFECT_BURN):
+            # Re-poisoning only refreshes the running effect
+            active = spec.kind == EFFECT_POISON and self.effects is not None and self.effects.has(EFFECT_POISON, monster)
+            if not active:
+                # Whole damage-over-time of one cast, the target cannot lose more than it has
+                ticks = spec.duration / (self.effects.tick_interval if self.effects is not None else 1.0)
+                damage = min(monster.hp, damage + effect_magnitude(spec, player) * ticks)
+        if damage <= 0:
+            return None
+        return Action(skill, skill.range, damage / ACTION_TIME, damage / max(1, skill.mp_cost))
+
+    def choose(self, player, monster, dist=None, skills=None):
+        """
+        Best action against `monster`.
+        :param dist: current distance, only actions that reach are considered (None = ignore range)
+        :param skills: candidates, defaults to every learned skill
+        :return: Action, or None when nothing reaches
+        """
+        skills = player.skills if skills is None else skills
+        cooldowns = player.cooldowns
+        mp = player.mp
+        low_mp = mp < player.max_mp * LOW_MP_RATIO
+        melee = self.melee(player, monster)
+
+        best = None
+        best_key = None
+        for skill in skills:
+            if skill is None or mp < skill.mp_cost or not cooldowns.is_ready(skill):
+                continue
+            spec = getattr(skill, 'effect', None)
+            if spec is not None and spec.kind in (EFFECT_SHIELD, EFFECT_BUFF):
+                # Self cast, range does not matter
+                if self.effects is not None and not low_mp and not self.effects.has(spec.kind, None, spec.stat):
+                    return Action(skill, skill.range, 0.0, 0.0)
+                continue
+            if dist is not None and dist > skill.range:
+                continue
+            action = self.rank(player, monster, skill)
+            if action is None or action.dps <= melee.dps:
+                continue
+            key = (action.damage_per_mp, action.dps) if low_mp else (action.dps, action.damage_per_mp)
+            if best is None or key > best_key:
+                best = action
+                best_key = key
+
+        # Melee finishes it anyway: keep the MP
+        if best is not None and melee.dps * ACTION_TIME < monster.hp:
+            return best
+        if dist is not None and dist > MELEE_RANGE:
+            return best
+        return melee
@@ -0,0 +1,249 @@
+"""
+Balance simulator: Monte Carlo DPS / time-to-kill / XP and gold per hour for every
+(profession, level, gear tier, skill, monster) combination.
+
+    python -m src.systems.combat.simulator --levels 1,10,20,30,40 --format html -o balance.html
+
+Player stats come from the real Player.recalculate_stats with EQUIPMENT_DB gear,
+hits from the resolver formulas, loot from world.loot; nothing is re-implemented here.
+"""
+import argparse
+import csv
+import html
+import io
+import math
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.systems.character.player import Player, Profession
+from src.systems.combat import resolver
+from src.systems.combat.skills import SkillBook, SkillType
+from src.systems.equipment.database import EQUIPMENT_DB
+from src.systems.equipment.item import Equipment, ItemQuality, ItemType
+from src.systems.world import loot
+from src.systems.world.monster import get_template
+from src.systems.world.targeting import ACTION_TIME
+from src.data.monsters_db import MONSTERS_DB
+
+# Gear slots filled for a build (bracelets / rings twice)
+GEAR_TYPES = [ItemType.WEAPON, ItemType.ARMOR, ItemType.HELMET, ItemType.NECKLACE, ItemType.BRACELET, ItemType.BRACELET,
+              ItemType.RING, ItemType.RING, ItemType.BELT, ItemType.BOOTS, ItemType.MEDAL]
+
+MELEE = "普攻"
+MAX_SWINGS = 2000 # Longer fights are reported as censored
+BLOCK_ELEMENTS = 4000000 # Random draws per NumPy batch
+
+COLUMNS = ["profession", "level", "tier", "skill", "monster", "monster_level", "attack", "dps", "ttk_s",
+           "damage_taken", "death_pct", "xp_per_hour", "gold_per_hour", "censored_pct"]
+
+def midpoint_roll(low, high):
+    # Expected stat instead of a random roll, so gear tiers compare like for like
+    return (low + high) // 2
+
+def build_player(profession, level, quality):
+    """A Player of the given level wearing the best EQUIPMENT_DB item per slot at that quality."""
+    player = Player("sim", profession)
+    player.level = level
+    player.recalculate_stats()
+    for item_type in GEAR_TYPES:
+        candidates = sorted((data["level"], name) for name, data in EQUIPMENT_DB.items()
+                            if data["type"] == item_type and data["level"] <= level)
+        # Highest level first, fall back when weight limits refuse it
+        for _, name in reversed(candidates):
+            item = Equipment.from_db(name, quality, roll=midpoint_roll)
+            player.inventory.add_item(item)
+            ok, _ = player.equip_item(item)
+            if ok:
+                break
+            player.inventory.remove_item(item)
+    return player
+
+def player_skills(player, skill_book):
+    """(name, damage multiplier, cooldown) of every damaging skill the player could use, melee included."""
+    skills = [(MELEE, 1.0, 0.0)]
+    for name, skill in skill_book.skills.items():
+        if skill.name != name: # Legacy aliases
+            continue
+        if skill.profession != player.profession.name or skill.level_req > player.level:
+            continue
+        if skill.damage_multiplier <= 0 or skill.skill_type == SkillType.PASSIVE:
+            continue
+        skills.append((skill.name, skill.damage_multiplier, skill.cooldown))
+    return skills
+
+def build_combos(professions, levels, tiers, monster_keys):
+    """Row metadata plus the per-row arrays the vectorized kernel needs."""
+    skill_book = SkillBook()
+    templates = [get_template(k) for k in monster_keys]
+    rows = []
+    cols = {k: [] for k in ("hp", "xp", "eff_m", "crit_m", "eff_s", "crit_s", "hit_p", "crit_p", "skill_f",
+                             "m_dmg", "m_hit_p", "player_hp")}
+    for profession in professions:
+        for level in levels:
+            for quality in tiers:
+                player = build_player(profession, level, quality)
+                stats = resolver.player_stats(player)
+                for skill_name, mult, cooldown in player_skills(player, skill_book):
+                    # Rotation: the skill whenever it is ready, melee in between
+                    skill_f = 1.0 if cooldown <= ACTION_TIME else ACTION_TIME / cooldown
+                    for template in templates:
+                        m_stats = resolver.monster_stats(template)
+                        melee = resolver.build_matchup(stats, m_stats, template, 1.0)
+                        cast = resolver.build_matchup(stats, m_stats, template, mult)
+                        rows.append((profession.value, level, quality.value, skill_name, template.name, template.level, stats.attack))
+                        cols["hp"].append(template.max_hp)
+                        cols["xp"].append(template.xp_reward)
+                        cols["eff_m"].append(resolver.effective_hit(melee.damage, template.defense))
+                        cols["crit_m"].append(resolver.effective_hit(melee.crit_damage, template.defense))
+                        cols["eff_s"].append(resolver.effective_hit(cast.damage, template.defense))
+                        cols["crit_s"].append(resolver.effective_hit(cast.crit_damage, template.defense))
+                        cols["hit_p"].append(cast.hit_chance)
+                        cols["crit_p"].append(cast.crit_chance)
+                        cols["skill_f"].append(skill_f)
+                        cols["m_dmg"].append(cast.monster_damage)
+                        cols["m_hit_p"].append(cast.monster_hit_chance)
+                        cols["player_hp"].append(player.max_hp)
+    arrays = {k: np.asarray(v, dtype=np.float64) for k, v in cols.items()}
+    return rows, arrays
+
+def simulate(arrays, fights, rng):
+    """
+    Monte Carlo over `fights` fights per row, processed in blocks of rows.
+    :return: dict of per-row result arrays and the number of simulated swings
+    """
+    n = len(arrays["hp"])
+    a = arrays
+    # Expected damage per swing bounds how many swings a row can need
+    per_swing = a["hit_p"] * (a["skill_f"] * ((1 - a["crit_p"]) * a["eff_s"] + a["crit_p"] * a["crit_s"])
+                              + (1 - a["skill_f"]) * ((1 - a["crit_p"]) * a["eff_m"] + a["crit_p"] * a["crit_m"]))
+    feasible = per_swing > 0
+    need = np.where(feasible, np.ceil(a["hp"] / np.where(feasible, per_swing, 1)) * 3 + 5, MAX_SWINGS)
+    need = np.minimum(need, MAX_SWINGS).astype(np.int64)
+
+    out = {k: np.full(n, np.nan) for k in ("dps", "swings", "taken", "death", "censored")}
+    simulated = 0
+    # Rows that cannot hurt the monster are not simulated; similar fight lengths share a block
+    order = np.flatnonzero(feasible)
+    order = order[np.argsort(need[order], kind="stable")]
+    m = len(order)
+    start = 0
+    while start < m:
+        # Rows are sorted by length, so the block's last row sets its size
+        size = m - start
+        while size > 1 and size * fights * int(need[order[start + size - 1]]) > BLOCK_ELEMENTS:
+            size = max(1, BLOCK_ELEMENTS // (fights * int(need[order[start + size - 1]])))
+        idx = order[start:start + size]
+        swings = int(need[idx].max())
+        start += len(idx)
+
+        shape = (len(idx), fights, swings)
+        col = lambda k: a[k][idx][:, None, None]
+        hit = rng.random(shape) < col("hit_p")
+        crit = rng.random(shape) < col("crit_p")
+        use_skill = rng.random(shape) < col("skill_f")
+        dmg = np.where(use_skill, np.where(crit, col("crit_s"), col("eff_s")),
+                       np.where(crit, col("crit_m"), col("eff_m")))
+        dmg = np.where(hit, dmg, 0.0)
+        simulated += dmg.size
+
+        killed = np.cumsum(dmg, axis=2) >= col("hp")
+        done = killed.any(axis=2)
+        n_swings = np.where(done, killed.argmax(axis=2) + 1, swings)
+        # Monster swings back after every player swing that did not kill
+        taken = rng.binomial(np.maximum(n_swings - 1, 0), a["m_hit_p"][idx][:, None]) * a["m_dmg"][idx][:, None]
+
+        out["dps"][idx] = dmg.mean(axis=(1, 2)) / ACTION_TIME
+        out["swings"][idx] = n_swings.mean(axis=1)
+        out["taken"][idx] = taken.mean(axis=1)
+        out["death"][idx] = (taken >= a["player_hp"][idx][:, None]).mean(axis=1)
+        out["censored"][idx] = 1.0 - done.mean(axis=1)
+    out["swings"][~feasible] = math.inf
+    out["dps"][~feasible] = 0.0
+    out["taken"][~feasible] = math.inf
+    out["death"][~feasible] = 1.0
+    out["censored"][~feasible] = 0.0
+    return out, simulated
+
+def run(professions, levels, tiers, monster_keys, fights=100, walk_seconds=1.5, seed=None):
+    if np is None:
+        raise RuntimeError("the balance simulator requires numpy")
+    rows, arrays = build_combos(professions, levels, tiers, monster_keys)
+    if not rows:
+        return [], 0
+    out, simulated = simulate(arrays, fights, np.random.default_rng(seed))
+
+    ttk = out["swings"] * ACTION_TIME
+    cycle = ttk + walk_seconds # Kill plus walking to the next monster
+    xp_h = np.where(np.isfinite(cycle), arrays["xp"] * 3600.0 / cycle, 0.0)
+    gold_h = np.where(np.isfinite(cycle), loot.expected_gold_per_kill() * 3600.0 / cycle, 0.0)
+
+    results = []
+    for i, meta in enumerate(rows):
+        results.append(list(meta) + [
+            round(float(out["dps"][i]), 2), round(float(ttk[i]), 2), round(float(out["taken"][i]), 1),
+            round(float(out["death"][i]) * 100, 1), round(float(xp_h[i])), round(float(gold_h[i])),
+            round(float(out["censored"][i]) * 100, 1),
+        ])
+    return results, simulated
+
+def write_csv(results, fp):
+    writer = csv.writer(fp)
+    writer.writerow(COLUMNS)
+    writer.writerows(results)
+
+def write_html(results, fp):
+    fp.write("<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Balance report</title>\n")
+    fp.write("<style>table{border-collapse:collapse;font:12px sans-serif}td,th{border:1px solid #ccc;padding:2px 6px}"
+             "td{text-align:right}tr:nth-child(even){background:#f4f4f4}</style></head><body>\n<table>\n<tr>")
+    fp.write("".join(f"<th>{html.escape(c)}</th>" for c in COLUMNS))
+    fp.write("</tr>\n")
+    for row in results:
+        fp.write("<tr>" + "".join(f"<td>{html.escape(str(v))}</td>" for v in row) + "</tr>\n")
+    fp.write("</table>\n</body></html>\n")
+
+def parse_list(value, convert=str):
+    return [convert(v.strip()) for v in value.split(",") if v.strip()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo DPS / TTK / XP and gold per hour balance report")
+    parser.add_argument("--professions", default="WARRIOR,MAGE,TAOIST")
+    parser.add_argument("--levels", default="1,5,10,15,20,25,30,35,40")
+    parser.add_argument("--tiers", default=",".join(q.name for q in ItemQuality), help="ItemQuality names")
+    parser.add_argument("--monsters", default="", help="MONSTERS_DB keys (default: all)")
+    parser.add_argument("--fights", type=int, default=100, help="simulated fights per combination")
+    parser.add_argument("--walk-seconds", type=float, default=1.5, help="time between kills")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--format", choices=("csv", "html"), default="csv")
+    parser.add_argument("-o", "--output", default="-", help="file path, - for stdout")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("numpy is required: pip install numpy", file=sys.stderr)
+        return 1
+
+    professions = [Profession[p] for p in parse_list(args.professions)]
+    tiers = [ItemQuality[t] for t in parse_list(args.tiers)]
+    monster_keys = parse_list(args.monsters) or list(MONSTERS_DB)
+
+    start = time.perf_counter()
+    results, simulated = run(professions, parse_list(args.levels, int), tiers, monster_keys,
+                             fights=args.fights, walk_seconds=args.walk_seconds, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    buf = io.StringIO()
+    (write_html if args.format == "html" else write_csv)(results, buf)
+    if args.output == "-":
+        sys.stdout.write(buf.getvalue())
+    else:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            f.write(buf.getvalue())
+    print(f"{len(results)} combinations, {simulated} simulated swings in {elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Best-in-slot ranking for the whole bag.
+
+Every equippable item gets a score = its slot contribution (item stats, enhancement and the
+target slot's forging, same rules as the stat model) dotted with the profession's stat weights.
+Items the player cannot wear (min_level, wear / hand weight) are masked out. Slots are
+independent, so the best loadout is the top item per slot (top two for rings / bracelets).
+Full-body enhancement and cultivation are not part of the score.
+"""
+from src.systems.character.stats import ITEM_STAT_INDEX, STAT_NAMES, slot_vector
+from src.systems.equipment.item import ItemType
+
+# NumPy is optional (not bundled in the Android build), the plain loop gives the same ranking
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Value of one point of each stat, per profession (Player attribute names)
+DEFAULT_WEIGHTS = {
+    "WARRIOR": {"attack": 1.0, "defense": 0.6, "magic_defense": 0.4, "max_hp": 0.1, "accuracy": 0.5, "dodge": 0.4,
+                "crit": 0.6, "luck": 0.5, "attack_speed": 0.5},
+    "MAGE": {"magic": 1.0, "attack": 0.6, "defense": 0.4, "magic_defense": 0.5, "max_hp": 0.1, "max_mp": 0.05,
+             "accuracy": 0.4, "dodge": 0.4, "crit": 0.5, "luck": 0.5, "cooldown_reduction": 0.8},
+    "TAOIST": {"taoism": 1.0, "attack": 0.6, "defense": 0.5, "magic_defense": 0.5, "max_hp": 0.1, "max_mp": 0.05,
+               "accuracy": 0.4, "dodge": 0.4, "crit": 0.5, "luck": 0.5, "cooldown_reduction": 0.6},
+}
+
+# Item type -> slots it can go into
+TYPE_SLOTS = {
+    ItemType.WEAPON: ("weapon",),
+    ItemType.ARMOR: ("armor",),
+    ItemType.HELMET: ("helmet",),
+    ItemType.NECKLACE: ("necklace",),
+    ItemType.BRACELET: ("bracelet_l", "bracelet_r"),
+    ItemType.RING: ("ring_l", "ring_r"),
+    ItemType.BELT: ("belt",),
+    ItemType.BOOTS: ("boots",),
+    ItemType.MEDAL: ("medal",),
+}
+SLOT_TYPE = {slot: t for t, slots in TYPE_SLOTS.items() for slot in slots}
+
+def weight_vector(profession_name, weights=None):
+    weights = weights or DEFAULT_WEIGHTS.get(profession_name, DEFAULT_WEIGHTS["WARRIOR"])
+    return [weights.get(name, 0.0) for name in STAT_NAMES]
+
+def item_type_of(item):
+    # Same tolerance as Player.equip_item for pickled enums from older builds
+    itype = getattr(item, 'item_type', None)
+    if itype in TYPE_SLOTS:
+        return itype
+    name = getattr(itype, 'name', None)
+    return ItemType[name] if name in ItemType.__members__ and ItemType[name] in TYPE_SLOTS else None
+
+def can_wear(player, item, itype):
+    if player.level < getattr(item, 'min_level', 1):
+        return False
+    limit = player.max_hand_weight if itype == ItemType.WEAPON else player.max_wear_weight
+    return getattr(item, 'weight', 0) <= limit
+
+class AutoEquip:
+    """
+    Scores bag + worn gear and picks the best loadout.
+    Scores are cached per item (same item object, stats, enhancement, forge level and weights),
+    so after the first pass a new drop batch only scores the new items.
+    """
+    def __init__(self, weights=None):
+        self.weights = weights # {profession name: {stat: weight}}, None = DEFAULT_WEIGHTS
+        self._scores = {} # id(item) -> (item, copy of its stats, enhancement, (forge level, weights), score)
+
+    def _score_rows(self, items, level, w):
+        """Vectorized slot_vector . w for a block of items."""
+        base = np.zeros((len(items), len(STAT_NAMES)))
+        present = np.zeros_like(base)
+        for row, item in enumerate(items):
+            for k, v in item.stats.items():
+                i = ITEM_STAT_INDEX.get(k)
+                if i is not None:
+                    base[row, i] += v
+                    present[row, i] += 1
+        enh = np.array([getattr(item, 'enhancement_level', 0) for item in items], dtype=np.float64)
+        # base + flat enhancement + forging (at least 1 when forged), per stat the item has
+        forge = np.floor(base * level * 0.01)
+        if level > 0:
+            forge = np.maximum(forge, 1.0)
+        return ((base + present * (enh[:, None] + forge)) @ np.asarray(w)).tolist()
+
+    def candidates(self, player):
+        """[(item, item type)] of everything wearable in the bag and on the body."""
+        # Worn gear first: on equal scores the current item wins, so nothing gets swapped back and forth
+        result = [(item, SLOT_TYPE.get(slot)) for slot, item in player.equipment.items() if item is not None]
+        for _, item in player.inventory.occupied():
+            if not getattr(item, 'is_equipment', False):
+                continue
+            itype = item_type_of(item)
+            if itype is not None and can_wear(player, item, itype):
+                result.append((item, itype))
+        return result
+
+    def score(self, player, items, slot):
+        """Scores of `items` if worn in `slot` (forge level of that slot applies)."""
+        w = tuple(weight_vector(player.profession.name, (self.weights or {}).get(player.profession.name)))
+        level = player.equipment_slot_levels.get(slot, 0)
+        key = (level, w)
+        cache = self._scores
+        scores = []
+        missing = []
+        for n, item in enumerate(items):
+            entry = cache.get(id(item))
+            if entry is not None and entry[0] is item and entry[1] == item.stats and entry[3] == key and (
+                    entry[2] == getattr(item, 'enhancement_level', 0)):
+                scores.append(entry[4])
+            else:
+                scores.append(None)
+                missing.append(n)
+        if not missing:
+            return scores
+
+        new = [items[n] for n in missing]
+        if np is not None and len(new) >= 32:
+            values = self._score_rows(new, level, w)
+        else:
+            values = [sum(w[i] * amount for i, amount in slot_vector(item, level)) for item in new]
+        for n, item, value in zip(missing, new, values):
+            scores[n] = value
+            cache[id(item)] = (item, dict(item.stats), getattr(item, 'enhancement_level', 0), key, value)
+        return scores
+
+    def best_loadout(self, player):
+        """
+        :return: {slot: item} best wearable item per slot (worn items count as candidates,
+                 so the result never scores lower than the current gear)
+        """
+        by_type = {}
+        candidates = self.candidates(player)
+        # Drop cache entries of sold / recycled items now and then
+        if len(self._scores) > 2 * len(candidates) + 64:
+            keep = {id(item) for item, _ in candidates}
+            self._scores = {k: e for k, e in self._scores.items() if k in keep}
+        for item, itype in candidates:
+            if itype is not None:
+                by_type.setdefault(itype, []).append(item)
+
+        loadout = {}
+        for itype, slots in TYPE_SLOTS.items():
+            items = by_type.get(itype)
+            if not items:
+                continue
+            if len(slots) == 1:
+                scores = self.score(player, items, slots[0])
+                loadout[slots[0]] = items[max(range(len(items)), key=scores.__getitem__)]
+                continue
+            # Paired slots: the two best (ranked with the left slot's forging), worn items keep their side
+            scores = self.score(player, items, slots[0])
+            top = sorted(range(len(items)), key=scores.__getitem__, reverse=True)[:2]
+            chosen = [items[i] for i in top]
+            free = list(slots)
+            for slot in slots:
+                if player.equipment.get(slot) in chosen:
+                    loadout[slot] = player.equipment[slot]
+                    chosen.remove(player.equipment[slot])
+                    free.remove(slot)
+            for slot, item in zip(free, chosen):
+                loadout[slot] = item
+        return loadout
+
+    def changes(self, player, loadout=None):
+        """[(slot, item)] needed to go from the current gear to the best loadout."""
+        loadout = self.best_loadout(player) if loadout is None else loadout
+        return [(slot, item) for slot, item in loadout.items() if player.equipment.get(slot) is not item]
+
+    def apply(self, player):
+        """Equip the best loadout, returns the items that were put on."""
+        equipped = []
+        for slot, item in self.changes(player):
+            ok, _ = player.equip_item(item, target_slot=slot)
+            if ok:
+                equipped.append(item)
+        return equipped
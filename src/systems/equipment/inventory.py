@@ -1,8 +1,102 @@
+from bisect import bisect_left, insort
+from collections import namedtuple
+
 from src.systems.equipment.item import Item, ItemType, ItemQuality
 
+# Which potion auto-potion drinks
+POTION_SMALLEST_SUFFICIENT = "smallest_sufficient" # Weakest one that still covers the missing amount
+POTION_LARGEST = "largest"
+POTION_PREFERRED = "preferred" # The configured potion name, smallest sufficient if there is none
+POTION_POLICIES = (POTION_SMALLEST_SUFFICIENT, POTION_LARGEST, POTION_PREFERRED)
+POTION_STATS = ("hp", "mp")
+
+# Result of a bulk add / remove: slots = {slot index: item now in it (None = emptied)},
+# removed = the items taken out. Enough for the UI to redraw / log just those slots.
+ChangeSet = namedtuple("ChangeSet", ["slots", "removed"])
+
+# Re-count the whole bag after every slot write and compare with the running totals (slow, debugging only)
+DEBUG_CHECKS = False
+
+def slot_weight(item):
+    # Stackable items only count as 1 unit of weight per stack (slot)
+    if item is None:
+        return 0
+    if getattr(item, 'stackable', False):
+        return getattr(item, 'weight', 1)
+    return getattr(item, 'weight', 1) * getattr(item, 'count', 1)
+
+def potion_stats(item):
+    """(stat, potency) pairs an item restores, empty for anything that is not a potion."""
+    if item is None or getattr(item, 'item_type', None) != ItemType.CONSUMABLE:
+        return ()
+    return tuple((stat, item.stats[stat]) for stat in POTION_STATS if item.stats.get(stat, 0) > 0)
+
+class SlotStore:
+    """
+    Fixed-size slot list that only stores occupied slots ({slot index: item}).
+    Reads like the old [None] * capacity list: len() is the capacity, empty slots read as None,
+    iteration yields every slot. Memory, pickles and occupied() scale with the items, not the capacity.
+    """
+    __slots__ = ("capacity", "_slots")
+
+    def __init__(self, capacity, slots=None):
+        self.capacity = capacity
+        self._slots = dict(slots) if slots else {}
+
+    @classmethod
+    def from_list(cls, items, capacity=None):
+        # Old saves pickled the full list
+        capacity = len(items) if capacity is None else capacity
+        return cls(capacity, {i: item for i, item in enumerate(items) if item is not None and i < capacity})
+
+    def __reduce__(self):
+        # Only the occupied slots go into the pickle
+        return (SlotStore, (self.capacity, self._slots))
+
+    def _check(self, index):
+        if index < 0:
+            index += self.capacity
+        if not 0 <= index < self.capacity:
+            raise IndexError("slot index out of range")
+        return index
+
+    def __len__(self):
+        return self.capacity
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._slots.get(i) for i in range(*index.indices(self.capacity))]
+        return self._slots.get(self._check(index))
+
+    def __setitem__(self, index, item):
+        index = self._check(index)
+        if item is None:
+            self._slots.pop(index, None)
+        else:
+            self._slots[index] = item
+
+    def __iter__(self):
+        get = self._slots.get
+        return (get(i) for i in range(self.capacity))
+
+    def __contains__(self, item):
+        if item is None:
+            return len(self._slots) < self.capacity
+        return any(x is item or x == item for x in self._slots.values())
+
+    def occupied(self):
+        """[(slot index, item)] of the non-empty slots, in slot order."""
+        return sorted(self._slots.items(), key=lambda pair: pair[0])
+
+    def resize(self, capacity):
+        # Items past a smaller capacity are dropped, same as truncating the old list
+        if capacity < self.capacity:
+            self._slots = {i: item for i, item in self._slots.items() if i < capacity}
+        self.capacity = capacity
+
 class Inventory:
     def __init__(self, capacity=600):
-        self.capacity = 600
+        self.capacity = capacity
         # Instead of unlocked_slots count, we track unlocked pages.
         # Page 1 (0-149) unlocked by default.
         # Pages 2, 3, 4 locked.
@@ -10,8 +104,27 @@ class Inventory:
         self.page_size = 150
         self.max_weight = 100000 # Default high, updated by Player
         
-        # Initialize fixed size list with None
-        self.items = [None] * self.capacity
+        # Sparse, only occupied slots are stored
+        self.items = SlotStore(self.capacity)
+        self.reindex()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Indexes / totals are rebuilt on load
+        state.pop('_potions', None)
+        state.pop('_potencies', None)
+        state.pop('_weight', None)
+        state.pop('_names', None)
+        state.pop('_counts', None)
+        state.pop('_stacks', None)
+        state.pop('_free', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if isinstance(self.items, list):
+            self.items = SlotStore.from_list(self.items)
+        self.reindex()
 
     def __getattr__(self, name):
         if name == 'max_weight':
@@ -20,26 +133,39 @@ class Inventory:
 
     @property
     def current_weight(self):
-        w = 0
-        for item in self.items:
-            if item:
-                if getattr(item, 'stackable', False):
-                    # Stackable items only count as 1 unit of weight per stack (slot)
-                    w += getattr(item, 'weight', 1)
-                else:
-                    w += getattr(item, 'weight', 1) * getattr(item, 'count', 1)
-        return w
+        # Running total kept by set_slot / reindex
+        return self._weight
+
+    def check_weight(self):
+        """Full re-count against the running totals / indexes, for debugging."""
+        occupied = self.items.occupied()
+        actual = sum(slot_weight(item) for _, item in occupied)
+        assert actual == self._weight, f"Inventory weight drifted: running {self._weight}, actual {actual}"
+        counts = {}
+        for _, item in occupied:
+            counts[item.name] = counts.get(item.name, 0) + item.count
+        assert counts == self._counts, f"Inventory counts drifted: {self._counts} != {counts}"
 
     @property
     def unlocked_slots(self):
         return self.unlocked_pages * self.page_size
 
+    def occupied(self):
+        """[(slot index, item)] of the non-empty slots, in slot order."""
+        return self.items.occupied()
+
+    def resize(self, capacity):
+        """Change the capacity in place, slots keep their items (anything past a smaller capacity is dropped)."""
+        self.capacity = capacity
+        self.items.resize(capacity)
+        self.reindex()
+
     def sort_items(self):
         # Sort items only within unlocked pages? Or globally?
         # Usually globally and then pack them into first available slots.
         
         # 1. Collect valid items
-        raw_items = [item for item in self.items if item is not None]
+        raw_items = [item for _, item in self.items.occupied()]
         
         # 2. Sort
         quality_priority = {
@@ -91,9 +217,8 @@ class Inventory:
             merged_items.append(current_item)
         
         # 4. Re-populate self.items
-        self.items = [None] * self.capacity
-        for i, item in enumerate(merged_items):
-            self.items[i] = item
+        self.items = SlotStore(self.capacity, enumerate(merged_items))
+        self.reindex()
             
         print("Inventory sorted and stacked.")
 
@@ -103,17 +228,17 @@ class Inventory:
             return True
         return False
         
-    def add_item(self, item: Item):
+    def add_item(self, item: Item, page=None):
+        """
+        :param page: put a new stack on this page if it has room (page-preferred), else the first
+                     free slot of the unlocked pages (first-fit)
+        """
         limit = self.unlocked_pages * self.page_size
         
         # Check weight
         # For stackable items, we assume worst case (new slot) which adds 1 unit of weight.
         # If it merges, it adds 0 weight under new rules.
-        item_weight = getattr(item, 'weight', 1)
-        if getattr(item, 'stackable', False):
-             weight_to_add = item_weight
-        else:
-             weight_to_add = item_weight * getattr(item, 'count', 1)
+        weight_to_add = slot_weight(item)
         
         if self.current_weight + weight_to_add > self.max_weight:
             # Only block if we strictly exceed limit even with optimal stacking?
@@ -127,14 +252,10 @@ class Inventory:
             # Let's verify if we can merge first.
             can_merge = False
             if item.stackable:
-                 for i in range(limit):
-                    existing = self.items[i]
-                    if (existing and existing.stackable and 
-                        existing.name == item.name and 
-                        existing.quality == item.quality):
-                        if existing.count < existing.max_stack:
-                            can_merge = True
-                            break
+                for i in self._stack_slots(item, limit):
+                    if self.items[i].count < self.items[i].max_stack:
+                        can_merge = True
+                        break
             
             if not can_merge:
                  # If we can't merge, we definitely add weight
@@ -145,74 +266,306 @@ class Inventory:
 
         # 1. Try to stack
         if item.stackable:
-            for i in range(limit):
+            for i in self._stack_slots(item, limit):
                 existing = self.items[i]
-                if (existing and existing.stackable and 
-                    existing.name == item.name and 
-                    existing.quality == item.quality):
-                    
-                    space = existing.max_stack - existing.count
-                    if space > 0:
-                        to_add = min(space, item.count)
-                        existing.count += to_add
-                        item.count -= to_add
-                        
-                        if item.count <= 0:
-                            return True
+                space = existing.max_stack - existing.count
+                if space > 0:
+                    to_add = min(space, item.count)
+                    existing.count += to_add
+                    self._counts[existing.name] += to_add
+                    item.count -= to_add
+
+                    if item.count <= 0:
+                        return True
                             
         # 2. Find empty slot for remainder
         if item.count > 0:
-            for i in range(limit):
-                if self.items[i] is None:
-                    self.items[i] = item
-                    return True
+            i = self.first_free(page)
+            if i != -1:
+                self.set_slot(i, item)
+                return True
         return False
 
+    def index_of(self, item):
+        """Slot holding this exact object, -1 if it is not in the bag."""
+        # Only the slots holding that name can hold the object
+        for i in sorted(self._names.get(item.name, ())):
+            if self.items[i] is item:
+                return i
+        return -1
+
     def remove_item(self, item: Item, count=1):
-        if item in self.items:
-            # If stackable and count specified, reduce count
-            if item.stackable and item.count > count:
-                item.count -= count
-                return True
-            else:
-                # Remove entirely
-                idx = self.items.index(item)
-                self.items[idx] = None
-                return True
-        return False
+        i = self.index_of(item)
+        if i == -1:
+            return False
+        # If stackable and count specified, reduce count, else remove entirely
+        return self.take(i, count)
+
+    def remove_by_name(self, item_name, count):
+        """
+        Take `count` of `item_name` out of the bag, first stacks first.
+        :return: False (and nothing taken) if there are not enough
+        """
+        if self._counts.get(item_name, 0) < count:
+            return False
+        for i in sorted(self._names[item_name]):
+            if count <= 0:
+                break
+            taken = min(count, self.items[i].count)
+            self.take(i, taken)
+            count -= taken
+        return True
         
+    def add_items(self, items, page=None):
+        """
+        Add a batch as one transaction: stacks are merged and free slots / weight are checked
+        for the whole batch in one pass, then either everything goes in or nothing changes.
+        Stack merging and the weight rule are the same as add_item.
+        :param page: preferred page for new stacks
+        :return: ChangeSet, None if the batch does not fit
+        """
+        items = list(items)
+        limit = self.unlocked_slots
+        free = self._free & ((1 << limit) - 1)
+        counts = {} # slot -> planned stack count, existing stacks and the batch's new ones
+        placed = {} # slot -> batch item that gets its own slot
+        new_stacks = {} # (name, quality) -> slots of stacks this batch opens
+        added_weight = 0
+
+        # Plan
+        for item in items:
+            remaining = item.count
+            if item.stackable:
+                key = (item.name, item.quality)
+                for i in list(self._stack_slots(item, limit)) + new_stacks.get(key, []):
+                    stack = placed.get(i) or self.items[i]
+                    current = counts.get(i, stack.count)
+                    to_add = min(stack.max_stack - current, remaining)
+                    if to_add > 0:
+                        counts[i] = current + to_add
+                        remaining -= to_add
+                        if remaining <= 0:
+                            break
+            if remaining > 0:
+                i = self._lowest_free(free, page)
+                if i == -1:
+                    return None
+                free &= ~(1 << i)
+                placed[i] = item
+                counts[i] = remaining
+                added_weight += slot_weight(item)
+                if item.stackable:
+                    new_stacks.setdefault((item.name, item.quality), []).append(i)
+        if self._weight + added_weight > self.max_weight:
+            return None
+
+        # Commit
+        for item in items:
+            item.count = 0 # Fully merged, placed items get their stack count below
+        for i, count in counts.items():
+            if i in placed:
+                placed[i].count = count
+                self.set_slot(i, placed[i])
+            else:
+                stack = self.items[i]
+                self._counts[stack.name] += count - stack.count
+                stack.count = count
+        if DEBUG_CHECKS:
+            self.check_weight()
+        return ChangeSet({i: self.items[i] for i in counts}, [])
+
+    def remove_items(self, selector):
+        """
+        Take whole stacks out as one transaction.
+        :param selector: predicate(item) or an iterable of slot indexes
+        :return: ChangeSet, None (nothing removed) if an index is out of range or empty
+        """
+        if callable(selector):
+            indexes = [i for i, item in self.items.occupied() if selector(item)]
+        else:
+            indexes = sorted(set(selector))
+            if any(not 0 <= i < len(self.items) or self.items[i] is None for i in indexes):
+                return None
+        removed = []
+        for i in indexes:
+            removed.append(self.items[i])
+            self.set_slot(i, None)
+        return ChangeSet({i: None for i in indexes}, removed)
+
     def move_item(self, from_index, to_index):
         limit = self.unlocked_pages * self.page_size
         if 0 <= from_index < limit and 0 <= to_index < limit:
-            self.items[from_index], self.items[to_index] = self.items[to_index], self.items[from_index]
+            moved = self.items[from_index]
+            self.set_slot(from_index, self.items[to_index])
+            self.set_slot(to_index, moved)
             return True
         return False
 
     def list_items(self):
         pass
 
+    # --- Slot writes ---
+    # Everything that puts an item into a slot, empties one or changes a stack count goes through
+    # set_slot / take (or add_item / remove_* which use them), so the indexes below stay in sync.
+    # Code that swaps the whole `items` store calls reindex().
+
+    def set_slot(self, index, item):
+        old = self.items[index]
+        if old is not None:
+            self._weight -= slot_weight(old)
+            self._unindex_name(old, index)
+            for stat, potency in potion_stats(old):
+                self._unindex_potion(stat, potency, index)
+        self.items[index] = item
+        if item is None:
+            self._free |= 1 << index
+        else:
+            self._free &= ~(1 << index)
+            self._weight += slot_weight(item)
+            self._index_name(item, index)
+            for stat, potency in potion_stats(item):
+                self._index_potion(stat, potency, index)
+        if DEBUG_CHECKS:
+            self.check_weight()
+
+    def take(self, index, count=1):
+        """Remove `count` from the stack in `index`, emptying the slot when nothing is left."""
+        item = self.items[index]
+        if item is None:
+            return False
+        if item.stackable and item.count > count:
+            item.count -= count
+            self._counts[item.name] -= count
+        else:
+            self.set_slot(index, None)
+        return True
+
+    # --- Indexes / totals ---
+
+    def reindex(self):
+        occupied = self.items.occupied()
+        self._weight = sum(slot_weight(item) for _, item in occupied)
+        # Free-slot bitmap, bit i set = slot i is empty. Covers every slot, locked pages are masked off
+        # in first_free, so unlocking a page needs no update.
+        used = 0
+        for i, _ in occupied:
+            used |= 1 << i
+        self._free = ((1 << len(self.items)) - 1) & ~used
+        self._names = {} # name -> set of slot indexes
+        self._counts = {} # name -> total count over all stacks
+        self._stacks = {} # (name, quality) -> slot indexes of stackable items
+        self._potions = {stat: {} for stat in POTION_STATS} # stat -> potency -> set of slot indexes
+        self._potencies = {stat: [] for stat in POTION_STATS} # stat -> sorted potencies in the bag
+        for i, item in occupied:
+            self._index_name(item, i)
+            for stat, potency in potion_stats(item):
+                self._index_potion(stat, potency, i)
+
+    def _index_name(self, item, index):
+        name = item.name
+        slots = self._names.get(name)
+        if slots is None:
+            slots = self._names[name] = set()
+        slots.add(index)
+        self._counts[name] = self._counts.get(name, 0) + item.count
+        if item.stackable:
+            self._stacks.setdefault((name, item.quality), set()).add(index)
+
+    def _unindex_name(self, item, index):
+        name = item.name
+        slots = self._names[name]
+        slots.discard(index)
+        self._counts[name] -= item.count
+        if not slots:
+            del self._names[name]
+            del self._counts[name]
+        if item.stackable:
+            key = (name, item.quality)
+            stacks = self._stacks[key]
+            stacks.discard(index)
+            if not stacks:
+                del self._stacks[key]
+
+    def first_free(self, page=None):
+        """
+        First empty slot on the unlocked pages, -1 if the bag is full.
+        Lowest set bit of the bitmap, no slot scan.
+        :param page: look on this page first
+        """
+        return self._lowest_free(self._free & ((1 << self.unlocked_slots) - 1), page)
+
+    def _lowest_free(self, bits, page=None):
+        if page is not None and 0 <= page < self.unlocked_pages:
+            start = page * self.page_size
+            on_page = (bits >> start) & ((1 << self.page_size) - 1)
+            if on_page:
+                return start + (on_page & -on_page).bit_length() - 1
+        if not bits:
+            return -1
+        return (bits & -bits).bit_length() - 1
+
+    def _stack_slots(self, item, limit):
+        """Slots (in order, unlocked pages only) of stacks `item` could merge into."""
+        stacks = self._stacks.get((item.name, item.quality))
+        if not stacks:
+            return ()
+        return sorted(i for i in stacks if i < limit)
+
+    def _index_potion(self, stat, potency, index):
+        slots = self._potions[stat].get(potency)
+        if slots is None:
+            slots = self._potions[stat][potency] = set()
+            insort(self._potencies[stat], potency)
+        slots.add(index)
+
+    def _unindex_potion(self, stat, potency, index):
+        slots = self._potions[stat].get(potency)
+        if slots is None:
+            return
+        slots.discard(index)
+        if not slots:
+            del self._potions[stat][potency]
+            self._potencies[stat].remove(potency)
+
+    def find_potion(self, stat, need=0, policy=POTION_SMALLEST_SUFFICIENT, preferred=None):
+        """
+        Slot of the potion to drink, -1 if there is none.
+        Only looks at the handful of distinct potencies in the bag, not at the slots.
+        :param stat: "hp" or "mp"
+        :param need: amount missing, for POTION_SMALLEST_SUFFICIENT
+        :param preferred: potion name for POTION_PREFERRED
+        """
+        potencies = self._potencies[stat]
+        if not potencies:
+            return -1
+        buckets = self._potions[stat]
+        if policy == POTION_PREFERRED and preferred:
+            for potency in potencies:
+                named = [i for i in buckets[potency] if self.items[i].name == preferred]
+                if named:
+                    return min(named)
+        if policy == POTION_LARGEST:
+            potency = potencies[-1]
+        else:
+            pos = bisect_left(potencies, need)
+            potency = potencies[pos] if pos < len(potencies) else potencies[-1]
+        return min(buckets[potency])
+
     def find_item_index(self, item_name):
         """Find the first index of an item with the given name."""
-        for i, item in enumerate(self.items):
-            if item and item.name == item_name:
-                return i
-        return -1
+        slots = self._names.get(item_name)
+        return min(slots) if slots else -1
 
     def get_item_count(self, item_name):
-        count = 0
-        for item in self.items:
-            if item and item.name == item_name:
-                count += item.count
-        return count
+        return self._counts.get(item_name, 0)
 
     def to_dict(self):
         # Convert items to list of dicts (filtering None)
         items_data = []
-        for i, item in enumerate(self.items):
-            if item:
-                item_data = item.to_dict()
-                item_data["slot_index"] = i # Track slot index to restore position
-                items_data.append(item_data)
+        for i, item in self.items.occupied():
+            item_data = item.to_dict()
+            item_data["slot_index"] = i # Track slot index to restore position
+            items_data.append(item_data)
         
         return {
             "capacity": self.capacity,
@@ -233,7 +586,7 @@ class Inventory:
             slot_index = item_data.get("slot_index", -1)
             
             if 0 <= slot_index < len(inv.items):
-                inv.items[slot_index] = item
+                inv.set_slot(slot_index, item)
             else:
                 # Fallback if slot index invalid
                 inv.add_item(item)
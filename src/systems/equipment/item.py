@@ -24,7 +24,36 @@ class ItemQuality(Enum):
     MYTHIC = "史诗"     # Red
     DIVINE = "神话"     # Rainbow/Gradient
 
+# Stat multiplier per drop quality
+QUALITY_MULTIPLIERS = {
+    ItemQuality.NORMAL: 1.0,
+    ItemQuality.HIGH: 2.0,
+    ItemQuality.RARE: 3.0,
+    ItemQuality.EPIC: 4.0,
+    ItemQuality.LEGENDARY: 5.0,
+    ItemQuality.MYTHIC: 6.0,
+    ItemQuality.DIVINE: 7.0,
+}
+
+# Pickled layout of Item / Equipment, bump it when fields change and handle the old layout in _migrate.
+# 1 = the old plain __dict__ objects (their state has no "schema" key)
+ITEM_SCHEMA = 2
+
+_FIELDS = {} # class -> every slot name along its MRO
+
+def item_fields(cls):
+    fields = _FIELDS.get(cls)
+    if fields is None:
+        fields = _FIELDS[cls] = tuple(name for klass in reversed(cls.__mro__) for name in klass.__dict__.get('__slots__', ()))
+    return fields
+
 class Item:
+    # Fixed layout instead of a per-object __dict__, bags hold up to 1000 of these
+    __slots__ = ("name", "item_type", "quality", "price", "stats", "stackable", "max_stack", "count", "weight",
+                 "is_equipment", "locked")
+    # Values for fields missing from older saves
+    _defaults = {"price": 0, "stackable": False, "max_stack": 1, "count": 1, "weight": 1, "is_equipment": False, "locked": False}
+
     def __init__(self, name, item_type: ItemType, quality: ItemQuality = ItemQuality.NORMAL, price=0, stackable=False, max_stack=1, weight=1):
         self.name = name
         self.item_type = item_type
@@ -38,6 +67,33 @@ class Item:
         self.is_equipment = False # Flag for recycle logic
         self.locked = False # Locked items cannot be recycled
 
+    def __getstate__(self):
+        # (schema, field values in item_fields order), no per-object key names in the save
+        return (ITEM_SCHEMA,) + tuple(getattr(self, name) for name in item_fields(type(self)))
+
+    def __setstate__(self, state):
+        fields = item_fields(type(self))
+        if isinstance(state, dict) or state[0] != ITEM_SCHEMA:
+            state = self._migrate(state)
+            values = [state[name] for name in fields]
+        else:
+            values = state[1:]
+        for name, value in zip(fields, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def _migrate(cls, state):
+        """
+        Bring an older pickled state up to ITEM_SCHEMA, runs once per item at load.
+        :param state: the __dict__ of a schema 1 item
+        :return: {field: value}
+        """
+        state = dict(state)
+        for name, value in cls._defaults.items():
+            state.setdefault(name, value)
+        state.setdefault("stats", {})
+        return state
+
     def add_stat(self, stat_name, value):
         self.stats[stat_name] = value
 
@@ -98,6 +154,9 @@ class Item:
         return f"[{self.quality.value}] {self.name} ({self.item_type.value}) x{self.count} - {stats_str}"
 
 class Equipment(Item):
+    __slots__ = ("min_level", "durability", "max_durability", "enhancement_level")
+    _defaults = dict(Item._defaults, is_equipment=True, min_level=1, durability=100, max_durability=100, enhancement_level=0)
+
     def __init__(self, name, item_type: ItemType, quality: ItemQuality = ItemQuality.NORMAL, min_level=1, weight=1):
         super().__init__(name, item_type, quality, stackable=False, max_stack=1, weight=weight)
         self.min_level = min_level
@@ -209,47 +268,64 @@ class Equipment(Item):
             elif roll < 0.50: q = ItemQuality.HIGH
             else: q = ItemQuality.NORMAL
         
-        # Determine Multiplier based on final quality
-        if q == ItemQuality.DIVINE: mult = 7.0
-        elif q == ItemQuality.MYTHIC: mult = 6.0
-        elif q == ItemQuality.LEGENDARY: mult = 5.0
-        elif q == ItemQuality.EPIC: mult = 4.0
-        elif q == ItemQuality.RARE: mult = 3.0
-        elif q == ItemQuality.HIGH: mult = 2.0
-        else: mult = 1.0
+        return Equipment.from_db(name, q)
+
+    @staticmethod
+    def stat_range(min_v, max_v, quality):
+        """Rollable [min, max] of one EQUIPMENT_DB stat at the given quality."""
+        # User Request: 
+        # 1. Base min at least 1
+        # 2. Multiply range [min, max] by multiplier first, then random
+        mult = QUALITY_MULTIPLIERS.get(quality, 1.0)
+        
+        # Ensure base min is at least 1
+        base_min = max(1, min_v)
+        base_max = max(base_min, max_v) # Ensure max >= min
+        
+        # Calculate new range
+        return int(base_min * mult), int(base_max * mult)
+
+    @staticmethod
+    def from_db(name, quality=None, roll=None):
+        """
+        Build an EQUIPMENT_DB item at a given quality.
+        :param roll: callable(low, high) picking each stat value, default random.randint
+        """
+        from src.systems.equipment.database import EQUIPMENT_DB
+        data = EQUIPMENT_DB[name]
+        quality = quality or ItemQuality.NORMAL
+        roll = roll or random.randint
 
         weight = data.get("weight", 1)
-        item = Equipment(name, data["type"], q, data["level"], weight)
+        item = Equipment(name, data["type"], quality, data["level"], weight)
         
         # Apply stats
         for stat, (min_v, max_v) in data["stats"].items():
-            # User Request: 
-            # 1. Base min at least 1
-            # 2. Multiply range [min, max] by multiplier first, then random
-            
-            # Ensure base min is at least 1
-            base_min = max(1, min_v)
-            base_max = max(base_min, max_v) # Ensure max >= min
-            
-            # Calculate new range
-            scaled_min = int(base_min * mult)
-            scaled_max = int(base_max * mult)
-            
             # Randomize within scaled range
-            val = random.randint(scaled_min, scaled_max)
-            
-            item.add_stat(stat, val)
+            item.add_stat(stat, roll(*Equipment.stat_range(min_v, max_v, quality)))
                 
         return item
 
+# Materials were always created stackable, older saves without the fields get the same
+_STACKABLE_DEFAULTS = dict(Item._defaults, stackable=True, max_stack=99999)
+
 class UpgradeStone(Item):
+    __slots__ = ()
+    _defaults = _STACKABLE_DEFAULTS
+
     def __init__(self):
         super().__init__("强化石", ItemType.MATERIAL, ItemQuality.NORMAL, stackable=True, max_stack=99999)
 
 class MythicUpgradeStone(Item):
+    __slots__ = ()
+    _defaults = _STACKABLE_DEFAULTS
+
     def __init__(self):
         super().__init__("神话强化石", ItemType.MATERIAL, ItemQuality.MYTHIC, stackable=True, max_stack=99999)
 
 class BonePowder(Item):
+    __slots__ = ()
+    _defaults = _STACKABLE_DEFAULTS
+
     def __init__(self):
         super().__init__("骨粉", ItemType.MATERIAL, ItemQuality.RARE, stackable=True, max_stack=99999)
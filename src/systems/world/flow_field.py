@@ -0,0 +1,101 @@
+from collections import deque
+import random
+
+# 4-way movement, same as the player and the old greedy chase
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+UNREACHABLE = -1
+
+class FlowField:
+    """
+    Shared distance field towards a single target tile (the player).
+    Rebuilt with one BFS only when the target tile (or the map layout) changes,
+    every chasing monster then reads its next step from it in O(1).
+    """
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.width = game_map.width
+        self.height = game_map.height
+        self.distances = [UNREACHABLE] * (self.width * self.height)
+        self.target = None # (x, y) the field currently points to
+        self.layout_version = -1 # Map.layout_version the field was built against
+
+    def update(self, target_x, target_y):
+        # Cheap early out: the field is only stale when the player changed tile
+        layout_version = getattr(self.game_map, 'layout_version', 0)
+        if self.target == (target_x, target_y) and self.layout_version == layout_version:
+            return False
+
+        self.target = (target_x, target_y)
+        self.layout_version = layout_version
+
+        w, h = self.width, self.height
+        dist = [UNREACHABLE] * (w * h)
+        self.distances = dist
+
+        if not (0 <= target_x < w and 0 <= target_y < h):
+            return True
+
+        # BFS over walkable tiles. Monsters are NOT obstacles here, otherwise the
+        # field would go stale on every monster step; occupancy is resolved per step.
+        is_walkable = self.game_map.is_valid_move
+        start = target_y * w + target_x
+        dist[start] = 0
+        queue = deque([(target_x, target_y)])
+        while queue:
+            x, y = queue.popleft()
+            d = dist[y * w + x] + 1
+            for dx, dy in DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < w and 0 <= ny < h:
+                    idx = ny * w + nx
+                    if dist[idx] == UNREACHABLE and is_walkable(nx, ny):
+                        dist[idx] = d
+                        queue.append((nx, ny))
+        return True
+
+    def distance(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.distances[y * self.width + x]
+        return UNREACHABLE
+
+    def next_step(self, x, y, is_free):
+        """
+        Best neighbouring tile for an entity at (x, y), or None if it should wait.
+        :param is_free: callable(x, y) -> bool, used to skip occupied tiles
+        """
+        w, h = self.width, self.height
+        dist = self.distances
+        here = dist[y * w + x] if (0 <= x < w and 0 <= y < h) else UNREACHABLE
+        if here == UNREACHABLE:
+            return None
+
+        best = []
+        best_d = here
+        sidesteps = []
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < w and 0 <= ny < h):
+                continue
+            d = dist[ny * w + nx]
+            if d == UNREACHABLE:
+                continue
+            if d == 0:
+                # Adjacent to the target: always "step" into it (that is an attack)
+                return (nx, ny)
+            if d > here or not is_free(nx, ny):
+                continue
+            if d == here:
+                sidesteps.append((nx, ny))
+            elif d < best_d:
+                best_d = d
+                best = [(nx, ny)]
+            elif d == best_d:
+                best.append((nx, ny))
+
+        if best:
+            return best[0] if len(best) == 1 else random.choice(best)
+        # Every closer tile is taken: slide sideways around the blocker instead of bunching up
+        if sidesteps:
+            return random.choice(sidesteps)
+        return None
@@ -0,0 +1,10 @@
+# Kill loot tuning, shared by GameEngine.roll_monster_loot and the balance simulator
+LOOT_CHANCE = 0.8 # Chance a kill drops anything at all (high drop rate for demo)
+GOLD_RANGE = (10, 50)
+INGOT_CHANCE = 0.01
+EQUIPMENT_CHANCE = 0.2
+BONE_POWDER_CHANCE = 0.1
+BONE_POWDER_RANGE = (1, 3)
+
+def expected_gold_per_kill():
+    return LOOT_CHANCE * (GOLD_RANGE[0] + GOLD_RANGE[1]) / 2.0
@@ -1,4 +1,8 @@
-from src.systems.world.monster import Monster
+from src.systems.world.monster import Monster, MonsterTemplate, get_template
+from src.systems.world.flow_field import FlowField
+from src.systems.world.targeting import get_policy, ring_offsets
+from src.systems.world.tilemap import TileMap, LAYER_WALKABLE, TERRAIN_GROUND
+import os
 import random
 
 class Map:
@@ -7,35 +11,355 @@ class Map:
         self.min_level = min_level
         self.width = width
         self.height = height
-        self.monster_templates = []
-        
+        self.monster_templates = [] # Shared MonsterTemplate objects
+
+        # Dead instances kept for reuse on respawn (avoids allocation churn while idling)
+        self.monster_pool = []
+        self.max_pool_size = 256
+
         # Treasure Events
         # Key: (x, y), Value: {'quality': ItemQuality, 'timestamp': float}
         self.treasure_events = {}
         self.active_monsters = []
 
-    def add_monster_type(self, monster_template: Monster):
+        # Entity IDs: O(1) liveness checks for locked targets
+        self.monsters_by_id = {}
+        self.next_entity_id = 1
+
+        # Occupancy Grid: one monster (or None) per tile, index = y * width + x
+        self.occupancy = [None] * (width * height)
+        # Bumped whenever walkability changes so cached fields know to rebuild
+        self.layout_version = 0
+
+        # Terrain / obstacles (see set_tilemap). None = open field, every tile walkable
+        self.tilemap = None
+        self.walkable = None # Walkability byte layer, same indexing as occupancy
+
+        # Shared chase field towards the player (rebuilt only when the player changes tile)
+        self.flow_field = FlowField(self)
+        # Player route towards its current move / attack goal (used when the direct step is blocked)
+        self.path_field = FlowField(self)
+
+        # Optional NumPy struct-of-arrays simulation (see enable_monster_store)
+        self.monster_store = None
+
+        # SpawnManager keeping this map populated (set by the spawner itself)
+        self.spawner = None
+
+    @classmethod
+    def from_db(cls, map_key):
+        """Build a map from its MAPS_DB entry (no monsters spawned yet). None if the key is unknown."""
+        from src.data.maps_db import MAPS_DB, MAPS_DIR
+        map_data = MAPS_DB.get(map_key)
+        if map_data is None:
+            return None
+
+        new_map = cls(map_data["name"], map_data["min_level"],
+                      width=map_data["width"], height=map_data["height"])
+        new_map.map_key = map_key # Store key for reference
+
+        # Terrain / obstacles (memory-mapped, layers decoded lazily)
+        if map_data.get("tilemap"):
+            try:
+                new_map.set_tilemap(TileMap.load(os.path.join(MAPS_DIR, map_data["tilemap"])))
+            except (OSError, ValueError) as e:
+                print(f"[WARN] Tile map for {map_key} not loaded, using open field: {e}")
+
+        # Large maps can opt into the NumPy monster store (falls back silently without numpy)
+        if map_data.get("vectorized", False):
+            new_map.enable_monster_store()
+
+        # Add Monster Templates
+        for m_key in map_data["monsters"]:
+            template = get_template(m_key)
+            if template:
+                new_map.add_monster_type(template)
+            else:
+                print(f"[WARN] Monster {m_key} not found in DB")
+        return new_map
+
+    def set_tilemap(self, tilemap):
+        if (tilemap.width, tilemap.height) != (self.width, self.height):
+            raise ValueError(f"Tile map is {tilemap.width}x{tilemap.height}, map is {self.width}x{self.height}")
+        self.tilemap = tilemap
+        self.walkable = tilemap.layer(LAYER_WALKABLE)
+        self.layout_version += 1
+
+    def set_walkable(self, x, y, walkable):
+        if self.tilemap is None:
+            self.set_tilemap(TileMap.blank(self.width, self.height))
+        self.tilemap.set_walkable(x, y, walkable)
+        self.walkable = self.tilemap.layer(LAYER_WALKABLE)
+        self.layout_version += 1
+
+    def close(self):
+        # Map switch: give back the tile map's file mapping
+        if self.tilemap is not None:
+            self.tilemap.close()
+
+    def terrain_at(self, x, y):
+        if self.tilemap is None:
+            return TERRAIN_GROUND
+        return self.tilemap.terrain(x, y)
+
+    def enable_monster_store(self, seed=None):
+        """Switch to vectorized monster simulation. Returns False if numpy is unavailable."""
+        from src.systems.world import monster_store
+        if not monster_store.is_available():
+            return False
+        if self.monster_store is None:
+            self.monster_store = monster_store.MonsterStore(self, seed=seed)
+        return True
+
+    def add_monster_type(self, monster_template):
+        # Accepts a MonsterTemplate or (legacy) a Monster instance
+        if not isinstance(monster_template, MonsterTemplate):
+            monster_template = monster_template.template
         self.monster_templates.append(monster_template)
 
-    def spawn_monster(self):
+    def spawn_monster(self, template_id=None, pos=None):
         if not self.monster_templates:
             return None
-        template = random.choice(self.monster_templates)
+        if template_id is None:
+            template_id = random.randrange(len(self.monster_templates))
+        template = self.monster_templates[template_id]
+
+        # Find a valid spawn location (free tile)
+        if pos is None:
+            pos = self.find_free_tile()
+        if pos is None or not self.is_spawnable(pos[0], pos[1]):
+            return None
+
         # Return a new instance based on template
-        new_monster = Monster(template.name, template.level, template.max_hp, template.attack, template.defense, template.xp_reward)
-        
-        # Find a valid spawn location
-        new_monster.x = random.randint(0, self.width - 1)
-        new_monster.y = random.randint(0, self.height - 1)
-        
-        self.active_monsters.append(new_monster)
+        if self.monster_store is not None:
+            new_monster = self.monster_store.allocate(template_id, template)
+        elif self.monster_pool:
+            new_monster = self.monster_pool.pop()
+            new_monster.reset(template)
+        else:
+            new_monster = Monster.from_template(template)
+
+        self.place_monster(new_monster, pos[0], pos[1])
+        self.register_monster(new_monster)
         return new_monster
 
+    def register_monster(self, monster):
+        monster.entity_id = self.next_entity_id
+        self.next_entity_id += 1
+        self.monsters_by_id[monster.entity_id] = monster
+        self.active_monsters.append(monster)
+
+    def find_free_tile(self, attempts=20, exclude=None):
+        """
+        Random free tile a monster may spawn on, None if there is none.
+        :param exclude: predicate(x, y) for tiles to skip (e.g. around the player)
+        """
+        # Random probing is O(1) on sparse maps, fall back to a full scan when crowded
+        for _ in range(attempts):
+            x = random.randint(0, self.width - 1)
+            y = random.randint(0, self.height - 1)
+            if self.is_spawnable(x, y) and not (exclude and exclude(x, y)):
+                return (x, y)
+        w = self.width
+        free = [i for i, m in enumerate(self.occupancy)
+                if m is None and self.is_spawnable(i % w, i // w) and not (exclude and exclude(i % w, i // w))]
+        if not free:
+            return None
+        i = random.choice(free)
+        return (i % self.width, i // self.width)
+
+    # --- Occupancy ---
+
+    def occupant(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.occupancy[y * self.width + x]
+        return None
+
+    def is_free(self, x, y):
+        return self.is_valid_move(x, y) and self.occupancy[y * self.width + x] is None
+
+    def is_spawnable(self, x, y):
+        if not self.is_free(x, y):
+            return False
+        return self.tilemap is None or self.tilemap.spawn_zone(x, y) != 0
+
+    def walkable_count(self):
+        if self.tilemap is None:
+            return self.width * self.height
+        return self.tilemap.walkable_count()
+
+    def place_monster(self, monster, x, y):
+        monster.x = x
+        monster.y = y
+        self.occupancy[y * self.width + x] = monster
+
+    def move_monster(self, monster, x, y):
+        if not self.is_free(x, y):
+            return False
+        idx = monster.y * self.width + monster.x
+        if self.occupancy[idx] is monster:
+            self.occupancy[idx] = None
+        self.place_monster(monster, x, y)
+        return True
+
+    def remove_monster(self, monster):
+        idx = monster.y * self.width + monster.x
+        if 0 <= idx < len(self.occupancy) and self.occupancy[idx] is monster:
+            self.occupancy[idx] = None
+        if self.monsters_by_id.pop(monster.entity_id, None) is not None:
+            self.active_monsters.remove(monster)
+            self.recycle_monster(monster)
+            if self.spawner is not None:
+                self.spawner.on_monster_removed(monster)
+
+    def remove_monsters(self, monsters):
+        # Batch removal: the active list is rebuilt once instead of one list.remove per monster
+        removed = set()
+        for monster in monsters:
+            idx = monster.y * self.width + monster.x
+            if 0 <= idx < len(self.occupancy) and self.occupancy[idx] is monster:
+                self.occupancy[idx] = None
+            if self.monsters_by_id.pop(monster.entity_id, None) is not None:
+                removed.add(id(monster))
+                self.recycle_monster(monster)
+                if self.spawner is not None:
+                    self.spawner.on_monster_removed(monster)
+        if removed:
+            self.active_monsters = [m for m in self.active_monsters if id(m) not in removed]
+
     def remove_dead_monsters(self):
+        for m in self.active_monsters:
+            if not m.is_alive():
+                idx = m.y * self.width + m.x
+                if self.occupancy[idx] is m:
+                    self.occupancy[idx] = None
+                if self.monsters_by_id.pop(m.entity_id, None) is not None:
+                    self.recycle_monster(m)
+                    if self.spawner is not None:
+                        self.spawner.on_monster_removed(m)
         self.active_monsters = [m for m in self.active_monsters if m.is_alive()]
 
+    def recycle_monster(self, monster):
+        if self.monster_store is not None:
+            self.monster_store.release(monster)
+        elif len(self.monster_pool) < self.max_pool_size:
+            self.monster_pool.append(monster)
+
+    def get_monster(self, entity_id):
+        # None once the monster died or was removed
+        monster = self.monsters_by_id.get(entity_id)
+        if monster is not None and monster.is_alive():
+            return monster
+        return None
+
+    # --- Target Query ---
+
+    def monsters_at(self, tiles):
+        """Live monsters standing on any of the given (x, y) tiles."""
+        w, h = self.width, self.height
+        occupancy = self.occupancy
+        result = []
+        for x, y in tiles:
+            if 0 <= x < w and 0 <= y < h:
+                m = occupancy[y * w + x]
+                if m is not None and m.is_alive():
+                    result.append(m)
+        return result
+
+    def find_target(self, x, y, policy="nearest", context=None, max_radius=None):
+        """
+        Ring search outwards from (x, y) over the occupancy grid.
+        The search stops policy.slack rings after the first monster is found,
+        so the cost depends on how close monsters are, not how many exist.
+        Policies with their own lookup (policy.direct, e.g. quest_first) go first.
+        """
+        if not self.monsters_by_id:
+            return None
+        if isinstance(policy, str):
+            policy = get_policy(policy)
+        context = context or {}
+        if max_radius is None:
+            max_radius = self.width + self.height
+        target = policy.direct(self, x, y, context, max_radius)
+        if target is not None:
+            return target
+
+        best = None
+        best_score = None
+        first_hit = None
+        w, h = self.width, self.height
+        occupancy = self.occupancy
+        for r in range(max_radius + 1):
+            if first_hit is not None and r > first_hit + policy.slack:
+                break
+            for dx, dy in ring_offsets(r):
+                tx, ty = x + dx, y + dy
+                if not (0 <= tx < w and 0 <= ty < h):
+                    continue
+                m = occupancy[ty * w + tx]
+                if m is None or not m.is_alive():
+                    continue
+                if first_hit is None:
+                    first_hit = r
+                score = policy.score(m, r, context)
+                if best is None or score < best_score:
+                    best = m
+                    best_score = score
+        return best
+
+    # --- AI ---
+
+    def update_monster_ai(self, player_x, player_y):
+        """
+        Advance monster movement by one frame.
+        :return: list of monsters that bumped into the player this frame (they attack)
+        """
+        if self.monster_store is not None:
+            return self.monster_store.update_ai(player_x, player_y)
+
+        attackers = []
+        for monster in self.active_monsters:
+            if not monster.is_alive(): continue
+
+            monster.move_timer += 1
+            if monster.move_timer < monster.move_interval or monster.rooted:
+                continue
+            monster.move_timer = 0
+
+            if not monster.is_aggro:
+                monster.move_interval = random.randint(60, 180) # Reset timer normal
+                # Random move
+                dx, dy = random.choice([(0, 1), (0, -1), (1, 0), (-1, 0)])
+                new_x = monster.x + dx
+                new_y = monster.y + dy
+            else:
+                # Aggro move (Chase player) via the shared flow field
+                self.flow_field.update(player_x, player_y)
+                step = self.flow_field.next_step(monster.x, monster.y, self.is_free)
+                if step is None:
+                    continue
+                new_x, new_y = step
+
+            # Check collision with player
+            if new_x == player_x and new_y == player_y:
+                if self.is_valid_move(new_x, new_y):
+                    attackers.append(monster)
+                continue
+
+            self.move_monster(monster, new_x, new_y)
+        return attackers
+
+    def update_spawn_animations(self):
+        if self.monster_store is not None:
+            self.monster_store.update_spawn_animation()
+            return
+        for m in self.active_monsters:
+            m.update_spawn_animation()
+
     def is_valid_move(self, x, y):
-        return 0 <= x < self.width and 0 <= y < self.height
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.walkable is None or self.walkable[y * self.width + x] != 0
+        return False
 
     def __str__(self):
         return f"Map: {self.name} (Recommended Level: {self.min_level})"
@@ -1,26 +1,85 @@
 import random
+from collections import namedtuple
+
+# Immutable per-species data, shared by reference between every instance of that species
+MonsterTemplate = namedtuple("MonsterTemplate", ["key", "name", "level", "max_hp", "attack", "defense", "xp_reward", "drops", "type"])
+
+# MONSTERS_DB key -> MonsterTemplate (built once per species)
+_TEMPLATE_CACHE = {}
+
+def get_template(monster_key):
+    template = _TEMPLATE_CACHE.get(monster_key)
+    if template is None:
+        from src.data.monsters_db import MONSTERS_DB
+        data = MONSTERS_DB.get(monster_key)
+        if not data:
+            return None
+        template = MonsterTemplate(
+            key=monster_key,
+            name=data["name"],
+            level=data["level"],
+            max_hp=data["hp"],
+            attack=data["attack"],
+            defense=data["defense"],
+            xp_reward=data["xp"],
+            drops=tuple(data.get("drops", [])),
+            type=data.get("type", "")
+        )
+        _TEMPLATE_CACHE[monster_key] = template
+    return template
 
 class Monster:
+    # Fixed layout instead of a per-object __dict__ (maps keep hundreds of these pooled).
+    # Monsters are never saved, so there is no schema to migrate.
+    __slots__ = ("template", "hp", "x", "y", "entity_id", "move_timer", "move_interval", "is_aggro", "rooted",
+                 "spawn_anim_progress")
+    spawn_anim_speed = 0.05 # Speed of animation
+
     def __init__(self, name, level, hp, attack, defense, xp_reward, drops=None):
-        self.name = name
-        self.level = level
-        self.max_hp = hp
-        self.hp = hp
-        self.attack = attack
-        self.defense = defense
-        self.xp_reward = xp_reward
-        self.drops = drops or []
+        # Ad-hoc species (not from MONSTERS_DB)
+        template = MonsterTemplate(None, name, level, hp, attack, defense, xp_reward, tuple(drops or ()), "")
+        self.reset(template)
+
+    def reset(self, template):
+        """(Re)initialise all mutable state, used both for new and recycled instances."""
+        self.template = template
+        self.hp = template.max_hp
         self.x = 0
         self.y = 0
-        
+        self.entity_id = 0 # Assigned by Map when spawned
+
         # Movement AI
         self.move_timer = 0
         self.move_interval = random.randint(60, 180) # 1-3 seconds (assuming 60 FPS)
         self.is_aggro = False # Aggro state
-        
+        self.rooted = False # Held in place by a status effect (困魔咒)
+
         # Spawn Animation
         self.spawn_anim_progress = 0.0 # 0.0 to 1.0
-        self.spawn_anim_speed = 0.05 # Speed of animation
+
+    @classmethod
+    def from_template(cls, template):
+        monster = cls.__new__(cls)
+        monster.reset(template)
+        return monster
+
+    # Species data is read through the shared template
+    @property
+    def name(self): return self.template.name
+    @property
+    def level(self): return self.template.level
+    @property
+    def max_hp(self): return self.template.max_hp
+    @property
+    def attack(self): return self.template.attack
+    @property
+    def defense(self): return self.template.defense
+    @property
+    def xp_reward(self): return self.template.xp_reward
+    @property
+    def drops(self): return self.template.drops
+    @property
+    def type(self): return self.template.type
 
     def update_spawn_animation(self):
         if self.spawn_anim_progress < 1.0:
@@ -35,14 +94,14 @@ class Monster:
         damage = max(0, amount - self.defense)
         self.hp -= damage
         print(f"{self.name} took {damage} damage. HP: {self.hp}/{self.max_hp}")
-        
+
         # Trigger Aggro
         if not self.is_aggro:
             self.is_aggro = True
             # Speed up movement (0.5s = 30 frames)
             self.move_interval = 30
             self.move_timer = 0 # Act immediately or reset
-            
+
         return damage
 
     def __str__(self):
@@ -50,18 +109,7 @@ class Monster:
 
     @staticmethod
     def create_from_db(monster_key):
-        from src.data.monsters_db import MONSTERS_DB
-        data = MONSTERS_DB.get(monster_key)
-        if not data:
+        template = get_template(monster_key)
+        if not template:
             return None
-        
-        m = Monster(
-            name=data["name"],
-            level=data["level"],
-            hp=data["hp"],
-            attack=data["attack"],
-            defense=data["defense"],
-            xp_reward=data["xp"],
-            drops=data.get("drops", [])
-        )
-        return m
+        return Monster.from_template(template)
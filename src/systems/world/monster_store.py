@@ -0,0 +1,262 @@
+from src.systems.world.monster import Monster
+
+# NumPy is optional (not bundled in the Android build), the store is only used when it imports
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Same order as the scalar AI: down, up, right, left
+DIR_X = (0, 0, 1, -1)
+DIR_Y = (1, -1, 0, 0)
+
+FAR = 1 << 30 # Distance used for unreachable / blocked neighbours
+
+# Per-row state a MonsterView reads
+ROW_FIELDS = ("x", "y", "hp", "move_timer", "move_interval", "aggro", "rooted", "spawn_anim")
+
+def is_available():
+    return np is not None
+
+class RowSnapshot:
+    """
+    Frozen copy of a released row (as one-row arrays). A released view reads from this,
+    so a stale reference (e.g. a kept target) still sees the dead monster it was
+    instead of whatever gets spawned into the row next.
+    """
+    def __init__(self, store, index):
+        for name in ROW_FIELDS:
+            setattr(self, name, getattr(store, name)[index:index + 1].copy())
+
+class MonsterView(Monster):
+    """
+    Thin Monster facade over one row of a MonsterStore.
+    Species data comes from the shared template, per-frame state lives in the store arrays,
+    so existing code (take_damage, draw_entity, combat) keeps working unchanged.
+    """
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index, template):
+        # Do not call Monster.__init__: mutable state is already initialised in the store row
+        self._store = store
+        self._index = index
+        self.template = template
+        self.entity_id = 0
+
+    @property
+    def x(self): return int(self._store.x[self._index])
+    @x.setter
+    def x(self, value): self._store.x[self._index] = value
+
+    @property
+    def y(self): return int(self._store.y[self._index])
+    @y.setter
+    def y(self, value): self._store.y[self._index] = value
+
+    @property
+    def hp(self): return int(self._store.hp[self._index])
+    @hp.setter
+    def hp(self, value): self._store.hp[self._index] = value
+
+    @property
+    def move_timer(self): return int(self._store.move_timer[self._index])
+    @move_timer.setter
+    def move_timer(self, value): self._store.move_timer[self._index] = value
+
+    @property
+    def move_interval(self): return int(self._store.move_interval[self._index])
+    @move_interval.setter
+    def move_interval(self, value): self._store.move_interval[self._index] = value
+
+    @property
+    def is_aggro(self): return bool(self._store.aggro[self._index])
+    @is_aggro.setter
+    def is_aggro(self, value): self._store.aggro[self._index] = value
+
+    @property
+    def rooted(self): return bool(self._store.rooted[self._index])
+    @rooted.setter
+    def rooted(self, value): self._store.rooted[self._index] = value
+
+    @property
+    def spawn_anim_progress(self): return float(self._store.spawn_anim[self._index])
+    @spawn_anim_progress.setter
+    def spawn_anim_progress(self, value): self._store.spawn_anim[self._index] = value
+
+class MonsterStore:
+    """
+    Struct-of-arrays monster storage for one map.
+    Timers, wander, flow-field chase and spawn animation are updated in NumPy batches;
+    only the monsters that actually moved this frame touch Python objects.
+    """
+    def __init__(self, game_map, capacity=256, seed=None):
+        if np is None:
+            raise RuntimeError("MonsterStore requires numpy")
+        self.game_map = game_map
+        self.rng = np.random.default_rng(seed)
+        self.spawn_anim_speed = Monster.spawn_anim_speed
+        self.capacity = 0
+        self.free_rows = []
+        self.views = []
+        self._dist = None # Flow field distances as an array
+        self._dist_key = None
+        self._walk = None # Walkability as a bool array
+        self._walk_key = None
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        def extend(arr, dtype, fill=0):
+            new = np.full(capacity, fill, dtype=dtype)
+            if arr is not None:
+                new[:len(arr)] = arr
+            return new
+
+        first = self.capacity == 0
+        self.x = extend(None if first else self.x, np.int32)
+        self.y = extend(None if first else self.y, np.int32)
+        self.hp = extend(None if first else self.hp, np.int32)
+        self.move_timer = extend(None if first else self.move_timer, np.int32)
+        self.move_interval = extend(None if first else self.move_interval, np.int32, 60)
+        self.aggro = extend(None if first else self.aggro, np.bool_, False)
+        self.rooted = extend(None if first else self.rooted, np.bool_, False)
+        self.template_id = extend(None if first else self.template_id, np.int16, -1)
+        self.spawn_anim = extend(None if first else self.spawn_anim, np.float32, 1.0)
+        self.in_use = extend(None if first else self.in_use, np.bool_, False)
+
+        self.free_rows.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.views.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def allocate(self, template_id, template):
+        if not self.free_rows:
+            self._grow(self.capacity * 2)
+        i = self.free_rows.pop()
+        self.hp[i] = template.max_hp
+        self.move_timer[i] = 0
+        self.move_interval[i] = self.rng.integers(60, 181)
+        self.aggro[i] = False
+        self.rooted[i] = False
+        self.template_id[i] = template_id
+        self.spawn_anim[i] = 0.0
+        self.in_use[i] = True
+        # A fresh view per spawn, views of earlier occupants were detached on release
+        view = MonsterView(self, i, template)
+        self.views[i] = view
+        return view
+
+    def release(self, view):
+        i = view._index
+        if view._store is self and self.in_use[i] and self.views[i] is view:
+            self.in_use[i] = False
+            self.free_rows.append(i)
+            self.views[i] = None
+            view._store = RowSnapshot(self, i)
+            view._index = 0
+
+    def update_spawn_animation(self):
+        growing = self.in_use & (self.spawn_anim < 1.0)
+        if growing.any():
+            self.spawn_anim[growing] = np.minimum(self.spawn_anim[growing] + self.spawn_anim_speed, 1.0)
+
+    def _distance_array(self, player_x, player_y):
+        field = self.game_map.flow_field
+        field.update(player_x, player_y)
+        key = (field.target, field.layout_version)
+        if self._dist_key != key:
+            dist = np.asarray(field.distances, dtype=np.int64)
+            dist[dist < 0] = FAR
+            self._dist = dist
+            self._dist_key = key
+        return self._dist
+
+    def _walkable_array(self):
+        game_map = self.game_map
+        if self._walk_key != game_map.layout_version:
+            if game_map.walkable is None:
+                self._walk = np.ones(game_map.width * game_map.height, dtype=bool)
+            else:
+                self._walk = np.frombuffer(bytes(game_map.walkable), dtype=np.uint8) != 0
+            self._walk_key = game_map.layout_version
+        return self._walk
+
+    def update_ai(self, player_x, player_y):
+        """Vectorized equivalent of Map.update_monster_ai, returns attacking monsters."""
+        game_map = self.game_map
+        w, h = game_map.width, game_map.height
+        live = self.in_use & (self.hp > 0)
+        self.move_timer[live] += 1
+        ready = np.flatnonzero(live & ~self.rooted & (self.move_timer >= self.move_interval))
+        if ready.size == 0:
+            return []
+        self.move_timer[ready] = 0
+
+        # Occupancy as a row-index grid, rebuilt from the coordinate arrays in one pass
+        rows = np.flatnonzero(live)
+        occ = np.full(w * h, -1, dtype=np.int64)
+        occ[self.y[rows] * w + self.x[rows]] = rows
+
+        dir_x = np.array(DIR_X)
+        dir_y = np.array(DIR_Y)
+
+        chase = ready[self.aggro[ready]]
+        wander = ready[~self.aggro[ready]]
+
+        # Wander: new random interval and a random direction
+        self.move_interval[wander] = self.rng.integers(60, 181, size=wander.size)
+        d = self.rng.integers(0, 4, size=wander.size)
+        wander_x = self.x[wander] + dir_x[d]
+        wander_y = self.y[wander] + dir_y[d]
+
+        # Chase: read the 4 neighbours from the shared flow field, pick the closest free one
+        chase_x = self.x[chase].copy()
+        chase_y = self.y[chase].copy()
+        moving = np.zeros(chase.size, dtype=bool)
+        if chase.size:
+            dist = self._distance_array(player_x, player_y)
+            nx = chase_x[:, None] + dir_x[None, :]
+            ny = chase_y[:, None] + dir_y[None, :]
+            inside = (nx >= 0) & (nx < w) & (ny >= 0) & (ny < h)
+            flat = np.where(inside, ny * w + nx, 0)
+            nd = np.where(inside, dist[flat], FAR)
+            here = dist[chase_y * w + chase_x]
+            blocked = (occ[flat] >= 0) & (nd != 0)
+            nd = np.where(blocked | (nd > here[:, None]), FAR, nd)
+            # Random tie-break between equally good tiles (same as the scalar random.choice)
+            pick = np.argmin(nd * 4 + self.rng.integers(0, 4, size=nd.shape), axis=1)
+            best = nd[np.arange(chase.size), pick]
+            moving = (best < FAR) & (here < FAR)
+            chase_x = np.where(moving, chase_x + dir_x[pick], chase_x)
+            chase_y = np.where(moving, chase_y + dir_y[pick], chase_y)
+
+        movers = np.concatenate([wander, chase[moving]])
+        new_x = np.concatenate([wander_x, chase_x[moving]])
+        new_y = np.concatenate([wander_y, chase_y[moving]])
+
+        valid = (new_x >= 0) & (new_x < w) & (new_y >= 0) & (new_y < h)
+        movers, new_x, new_y = movers[valid], new_x[valid], new_y[valid]
+        walkable = self._walkable_array()[new_y * w + new_x]
+        movers, new_x, new_y = movers[walkable], new_x[walkable], new_y[walkable]
+
+        # Bumping into the player is an attack, not a move
+        hits_player = (new_x == player_x) & (new_y == player_y)
+        attackers = [self.views[i] for i in movers[hits_player]]
+        movers, new_x, new_y = movers[~hits_player], new_x[~hits_player], new_y[~hits_player]
+
+        # Target tile must be free now and claimed by only one mover (first one wins)
+        target = new_y * w + new_x
+        free = occ[target] < 0
+        movers, new_x, new_y, target = movers[free], new_x[free], new_y[free], target[free]
+        _, first = np.unique(target, return_index=True)
+        movers, new_x, new_y = movers[first], new_x[first], new_y[first]
+
+        # Apply: arrays in one shot, then keep the map's object occupancy grid in sync for movers only
+        occupancy = game_map.occupancy
+        old_flat = self.y[movers] * w + self.x[movers]
+        self.x[movers] = new_x
+        self.y[movers] = new_y
+        for i, old, new in zip(movers.tolist(), old_flat.tolist(), (new_y * w + new_x).tolist()):
+            view = self.views[i]
+            if occupancy[old] is view:
+                occupancy[old] = None
+            occupancy[new] = view
+        return attackers
@@ -0,0 +1,185 @@
+import multiprocessing
+import os
+import random
+import time
+from array import array
+
+from src.core.scheduler import Scheduler
+from src.systems.world.map import Map
+from src.systems.world.spawner import SpawnManager
+
+FRAME_TIME = 1.0 / 60
+
+# Snapshot record per monster: entity_id, template_id, x, y, hp (int32 each)
+SNAPSHOT_FIELDS = 5
+NO_PLAYER = (-1, -1)
+
+def encode_snapshot(game_map):
+    template_ids = {id(t): i for i, t in enumerate(game_map.monster_templates)}
+    data = array("i")
+    for m in game_map.active_monsters:
+        data.extend((m.entity_id, template_ids.get(id(m.template), -1), m.x, m.y, m.hp))
+    return data.tobytes()
+
+def decode_snapshot(payload):
+    data = array("i")
+    data.frombytes(payload)
+    return [tuple(data[i:i + SNAPSHOT_FIELDS]) for i in range(0, len(data), SNAPSHOT_FIELDS)]
+
+class MapShard:
+    """One map simulated inside a worker: monsters, AI and spawner on the worker's own scheduler."""
+    def __init__(self, map_key, scheduler, density=None):
+        self.map_key = map_key
+        self.game_map = Map.from_db(map_key)
+        self.player_pos = NO_PLAYER
+        from src.data.maps_db import MAPS_DB
+        config = dict(MAPS_DB[map_key].get("spawn") or {})
+        if density is not None:
+            config["density"] = density
+        self.spawner = SpawnManager.from_config(self.game_map, scheduler, config,
+                                                get_player_pos=lambda: self.player_pos)
+        self.spawner.start()
+        self.attacks = 0 # Player bumps since the last report
+
+    def step(self):
+        px, py = self.player_pos
+        attackers = self.game_map.update_monster_ai(px, py)
+        self.attacks += len(attackers)
+        self.game_map.update_spawn_animations()
+
+    def apply_damage(self, entity_id, amount):
+        monster = self.game_map.get_monster(entity_id)
+        if monster is None:
+            return False
+        monster.take_damage(amount)
+        if not monster.is_alive():
+            self.game_map.remove_monster(monster)
+        return True
+
+    def report(self, with_snapshot):
+        state = {
+            "monsters": len(self.game_map.active_monsters),
+            "attacks": self.attacks,
+        }
+        if with_snapshot:
+            state["snapshot"] = encode_snapshot(self.game_map)
+        self.attacks = 0
+        return state
+
+def _worker_main(conn, map_keys, seed, density):
+    # Headless: only world modules are imported here, never pygame
+    random.seed(seed)
+    scheduler = Scheduler()
+    shards = {key: MapShard(key, scheduler, density) for key in map_keys}
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            break
+        cmd = msg[0]
+        if cmd == "step":
+            _, frames, players, with_snapshot = msg
+            for key, pos in players.items():
+                if key in shards:
+                    shards[key].player_pos = pos
+            start = time.perf_counter()
+            for _ in range(frames):
+                for shard in shards.values():
+                    shard.step()
+                scheduler.advance(FRAME_TIME)
+            elapsed = time.perf_counter() - start
+            conn.send(("state", {key: shard.report(with_snapshot) for key, shard in shards.items()}, elapsed))
+        elif cmd == "damage":
+            _, events = msg
+            # events: [(map_key, entity_id, amount), ...]
+            results = [shards[key].apply_damage(eid, amount) for key, eid, amount in events if key in shards]
+            conn.send(("damage", results))
+        elif cmd == "stop":
+            conn.send(("stopped",))
+            break
+    conn.close()
+
+class ShardedWorld:
+    """
+    Maps spread over worker processes (round-robin, one process per core by default).
+    Every call fans the command out to all workers first and then collects the
+    replies, so the workers simulate in parallel.
+    """
+    def __init__(self, map_keys, workers=None, seed=None, density=None):
+        workers = max(1, min(workers or os.cpu_count() or 1, len(map_keys)))
+        assignment = [map_keys[i::workers] for i in range(workers)]
+        seed = seed if seed is not None else random.randrange(1 << 30)
+
+        self.map_owner = {}
+        self.workers = []
+        for i, keys in enumerate(assignment):
+            parent, child = multiprocessing.Pipe()
+            proc = multiprocessing.Process(target=_worker_main, args=(child, keys, seed + i, density), daemon=True)
+            proc.start()
+            child.close()
+            self.workers.append((proc, parent))
+            for key in keys:
+                self.map_owner[key] = parent
+
+    def step(self, frames=1, players=None, with_snapshot=False):
+        """
+        Advance every map by `frames` logic frames.
+        :param players: {map_key: (x, y)} player positions (maps without one just wander)
+        :return: ({map_key: state}, slowest worker time in seconds)
+        """
+        players = players or {}
+        for _, conn in self.workers:
+            conn.send(("step", frames, players, with_snapshot))
+        states = {}
+        slowest = 0.0
+        for _, conn in self.workers:
+            _, worker_states, elapsed = conn.recv()
+            states.update(worker_states)
+            slowest = max(slowest, elapsed)
+        return states, slowest
+
+    def apply_damage(self, events):
+        """Forward (map_key, entity_id, amount) hits to the owning workers."""
+        by_conn = {}
+        for event in events:
+            conn = self.map_owner.get(event[0])
+            if conn is not None:
+                by_conn.setdefault(id(conn), (conn, []))[1].append(event)
+        for conn, batch in by_conn.values():
+            conn.send(("damage", batch))
+        results = []
+        for conn, _ in by_conn.values():
+            results.extend(conn.recv()[1])
+        return results
+
+    def close(self):
+        for proc, conn in self.workers:
+            try:
+                conn.send(("stop",))
+                conn.recv()
+            except (EOFError, OSError, BrokenPipeError):
+                pass
+            proc.join(timeout=5)
+        self.workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+if __name__ == "__main__":
+    # Headless throughput check: python -m src.systems.world.shard [workers] [frames] [density]
+    import sys
+    from src.data.maps_db import MAPS_DB
+
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    density = float(sys.argv[3]) if len(sys.argv) > 3 else None
+    with ShardedWorld(list(MAPS_DB), workers=workers, seed=1, density=density) as world:
+        start = time.perf_counter()
+        states, slowest = world.step(frames)
+        wall = time.perf_counter() - start
+        total = sum(s["monsters"] for s in states.values())
+        print(f"{len(world.workers)} workers, {len(states)} maps, {total} monsters, "
+              f"{frames} frames in {wall:.2f}s ({frames * total / wall:.0f} monster-frames/s)")
@@ -0,0 +1,103 @@
+import random
+
+class SpawnManager:
+    """
+    Keeps a map populated at a target density.
+    Runs on the game-time Scheduler instead of per frame, so respawn speed is the
+    same at any frame rate and under fast-forward.
+    """
+    def __init__(self, game_map, scheduler, get_player_pos=None, density=0.05, min_count=5,
+                 respawn_delay=3.0, safe_radius=3, weights=None, check_interval=1.0):
+        self.game_map = game_map
+        self.scheduler = scheduler
+        self.get_player_pos = get_player_pos
+        self.density = density
+        self.min_count = min_count
+        self.respawn_delay = respawn_delay
+        self.safe_radius = safe_radius
+        self.check_interval = check_interval
+
+        # Per-species mix: weights aligned with game_map.monster_templates (by MONSTERS_DB key)
+        weights = weights or {}
+        self.template_weights = [weights.get(t.key, 1) for t in game_map.monster_templates]
+
+        self.pending = 0 # Respawns already scheduled
+        self.tasks = []
+        game_map.spawner = self
+
+    @classmethod
+    def from_config(cls, game_map, scheduler, config, get_player_pos=None):
+        """Build from a MAPS_DB "spawn" entry (all keys optional)."""
+        config = config or {}
+        return cls(game_map, scheduler, get_player_pos,
+                   density=config.get("density", 0.05),
+                   min_count=config.get("min_count", 5),
+                   respawn_delay=config.get("respawn_delay", 3.0),
+                   safe_radius=config.get("safe_radius", 3),
+                   weights=config.get("weights"))
+
+    @property
+    def target_count(self):
+        return max(self.min_count, int(self.game_map.walkable_count() * self.density))
+
+    def start(self):
+        # Initial population, then a slow top-up check (covers monsters removed without a death event)
+        self.fill()
+        self.tasks.append(self.scheduler.call_every(self.check_interval, self._top_up))
+
+    def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+        self.pending = 0
+        if getattr(self.game_map, 'spawner', None) is self:
+            self.game_map.spawner = None
+
+    def fill(self):
+        missing = self.target_count - len(self.game_map.active_monsters)
+        for _ in range(missing):
+            if not self.spawn_one():
+                break
+
+    def on_monster_removed(self, monster):
+        self._schedule_respawn()
+
+    def _schedule_respawn(self):
+        self.pending += 1
+        self.tasks.append(self.scheduler.call_later(self.respawn_delay, self._respawn))
+
+    def _respawn(self):
+        self.pending = max(0, self.pending - 1)
+        if len(self.game_map.active_monsters) < self.target_count:
+            self.spawn_one()
+
+    def _top_up(self):
+        # Drop finished one-shot tasks so the list does not grow over a long session
+        self.tasks = [t for t in self.tasks if t.interval or not t.cancelled and t.due > self.scheduler.now]
+        missing = self.target_count - len(self.game_map.active_monsters) - self.pending
+        for _ in range(missing):
+            self._schedule_respawn()
+
+    def pick_template_id(self):
+        templates = self.game_map.monster_templates
+        if not templates:
+            return None
+        return random.choices(range(len(templates)), weights=self.template_weights, k=1)[0]
+
+    def is_safe_tile(self, x, y, player_pos):
+        if player_pos is None:
+            return False
+        return abs(x - player_pos[0]) + abs(y - player_pos[1]) <= self.safe_radius
+
+    def sample_free_tile(self):
+        player_pos = self.get_player_pos() if self.get_player_pos else None
+        return self.game_map.find_free_tile(exclude=lambda x, y: self.is_safe_tile(x, y, player_pos))
+
+    def spawn_one(self):
+        template_id = self.pick_template_id()
+        if template_id is None:
+            return None
+        pos = self.sample_free_tile()
+        if pos is None:
+            return None
+        return self.game_map.spawn_monster(template_id=template_id, pos=pos)
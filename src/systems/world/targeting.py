@@ -0,0 +1,99 @@
+import math
+
+# Seconds between auto-pilot actions (auto_pilot_interval = 30 frames @ 60 FPS)
+ACTION_TIME = 0.5
+
+class TargetPolicy:
+    """
+    Scores candidate monsters for auto-pilot target selection (lower is better).
+    slack: how many rings beyond the first hit the ring search keeps looking,
+    0 means "closest wins" and the search stops at the first occupied ring.
+    """
+    name = "base"
+    slack = 0
+
+    def score(self, monster, dist, context):
+        return dist
+
+    def direct(self, game_map, x, y, context, max_radius):
+        """Target found without the ring search (None = use the ring search)."""
+        return None
+
+class NearestPolicy(TargetPolicy):
+    name = "nearest"
+    slack = 0
+
+class LowestHpPolicy(TargetPolicy):
+    name = "lowest_hp"
+    slack = 3
+
+    def score(self, monster, dist, context):
+        return (monster.hp, dist)
+
+class XpPerSecondPolicy(TargetPolicy):
+    name = "xp_per_second"
+    slack = 5
+
+    def score(self, monster, dist, context):
+        player = context.get("player")
+        resolver = context.get("resolver")
+        if player is not None and resolver is not None:
+            # O(1) closed-form estimate from the cached matchup table
+            hits = resolver.expected_turns(player, monster)
+            if hits == math.inf:
+                return math.inf
+        else:
+            attack = getattr(player, 'attack', 1) if player else 1
+            hits = math.ceil(monster.hp / max(1, attack - monster.defense))
+        # Walking there costs one action per tile (minus the attack range of 1)
+        seconds = (hits + max(0, dist - 1)) * ACTION_TIME
+        return -(monster.xp_reward / max(ACTION_TIME, seconds))
+
+class QuestTargetPolicy(TargetPolicy):
+    """Nearest quest monster anywhere on the map, the nearest monster when there is none."""
+    name = "quest_first"
+    slack = 0
+
+    def direct(self, game_map, x, y, context, max_radius):
+        # Quest monsters are a handful of the map's monsters, scan them instead of the grid
+        quest_targets = context.get("quest_targets")
+        if not quest_targets:
+            return None
+        best = None
+        best_dist = max_radius + 1
+        for m in game_map.active_monsters:
+            if m.name in quest_targets and m.is_alive():
+                dist = abs(m.x - x) + abs(m.y - y)
+                if dist < best_dist:
+                    best = m
+                    best_dist = dist
+        return best
+
+TARGET_POLICIES = {
+    p.name: p for p in (NearestPolicy(), LowestHpPolicy(), XpPerSecondPolicy(), QuestTargetPolicy())
+}
+
+def get_policy(name):
+    return TARGET_POLICIES.get(name, TARGET_POLICIES["nearest"])
+
+def ring_offsets(r):
+    """Tiles at exactly Manhattan distance r from the origin."""
+    if r == 0:
+        yield (0, 0)
+        return
+    for i in range(r):
+        yield (r - i, i)
+        yield (-i, r - i)
+        yield (-r + i, -i)
+        yield (i, -r + i)
+
+def quest_kill_targets(quest_manager):
+    """Monster names the active quests currently want killed."""
+    targets = set()
+    if not quest_manager:
+        return targets
+    for quest in quest_manager.active_quests:
+        stage = quest.get_current_stage()
+        if stage and stage.type == "kill" and stage.target:
+            targets.add(stage.target)
+    return targets
@@ -0,0 +1,252 @@
+import mmap
+import os
+import random
+import struct
+from collections import deque
+
+# .tmap file layout (little endian):
+#   header: magic b"TMAP", version u8, width u16, height u16, layer count u8
+#   per layer: tag 4 bytes, encoding u8, payload length u32, payload
+# Layers are one byte per tile (index = y * width + x). RLE payloads are (run u8, value u8) pairs.
+MAGIC = b"TMAP"
+VERSION = 1
+HEADER = struct.Struct("<4sBHHB")
+LAYER_HEADER = struct.Struct("<4sBI")
+
+ENCODING_RAW = 0
+ENCODING_RLE = 1
+
+LAYER_WALKABLE = b"WALK" # 1 = walkable, 0 = blocked
+LAYER_TERRAIN = b"TERR" # Terrain type (see TERRAIN_*)
+LAYER_SPAWN = b"SPWN" # Spawn zone id, 0 = monsters never spawn here
+
+TERRAIN_GROUND = 0
+TERRAIN_GRASS = 1
+TERRAIN_WATER = 2
+TERRAIN_ROCK = 3
+
+def encode_rle(data):
+    out = bytearray()
+    i = 0
+    n = len(data)
+    while i < n:
+        value = data[i]
+        run = 1
+        while i + run < n and run < 255 and data[i + run] == value:
+            run += 1
+        out.append(run)
+        out.append(value)
+        i += run
+    return bytes(out)
+
+def decode_rle(payload, size):
+    out = bytearray(size)
+    pos = 0
+    for i in range(0, len(payload), 2):
+        run = payload[i]
+        value = payload[i + 1]
+        if value:
+            out[pos:pos + run] = bytes([value]) * run
+        pos += run
+    if pos != size:
+        raise ValueError(f"RLE layer decodes to {pos} tiles, expected {size}")
+    return out
+
+class TileMap:
+    """
+    Per-tile layers stored as flat byte arrays, no per-tile Python objects.
+    Raw layers are read straight out of a memory-mapped file; RLE layers are
+    decoded on first access. Every query is a single index into a byte array.
+    """
+    def __init__(self, width, height, layers=None):
+        self.width = width
+        self.height = height
+        self._layers = dict(layers or {}) # tag -> bytes-like (decoded)
+        self._pending = {} # tag -> (encoding, payload view) not decoded yet
+        self._mmap = None
+        self._view = None # memoryview over the whole mmap, layer payloads are slices of it
+        self._walkable_count = None
+
+    @classmethod
+    def blank(cls, width, height):
+        size = width * height
+        return cls(width, height, {
+            LAYER_WALKABLE: bytearray(b"\x01" * size),
+            LAYER_TERRAIN: bytearray(size),
+            LAYER_SPAWN: bytearray(b"\x01" * size),
+        })
+
+    @classmethod
+    def load(cls, path):
+        f = open(path, "rb")
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            f.close()
+        view = memoryview(buf)
+        magic, version, width, height, count = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a v{VERSION} tile map")
+
+        tilemap = cls(width, height)
+        tilemap._mmap = buf
+        tilemap._view = view
+        offset = HEADER.size
+        for _ in range(count):
+            tag, encoding, length = LAYER_HEADER.unpack_from(view, offset)
+            offset += LAYER_HEADER.size
+            tilemap._pending[tag] = (encoding, view[offset:offset + length])
+            offset += length
+        return tilemap
+
+    def close(self):
+        """Release the memory-mapped file. Raw layers read from it are unusable afterwards."""
+        if self._mmap is None:
+            return
+        for tag, data in list(self._layers.items()):
+            if isinstance(data, memoryview):
+                data.release()
+                del self._layers[tag]
+        for _, payload in self._pending.values():
+            payload.release()
+        self._pending = {}
+        self._view.release()
+        self._view = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass # A view handed out elsewhere is still alive, the mapping goes with its last reference
+        self._mmap = None
+
+    def save(self, path, encoding=ENCODING_RLE):
+        tags = list(self._layers) + [t for t in self._pending if t not in self._layers]
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.width, self.height, len(tags)))
+            for tag in tags:
+                data = self.layer(tag)
+                payload = encode_rle(data) if encoding == ENCODING_RLE else bytes(data)
+                f.write(LAYER_HEADER.pack(tag, encoding, len(payload)))
+                f.write(payload)
+
+    def layer(self, tag):
+        data = self._layers.get(tag)
+        if data is None:
+            pending = self._pending.pop(tag, None)
+            if pending is None:
+                return None
+            encoding, payload = pending
+            if encoding == ENCODING_RLE:
+                data = decode_rle(payload, self.width * self.height)
+            else:
+                data = payload # Zero-copy slice of the mmap
+            self._layers[tag] = data
+        return data
+
+    def _get(self, tag, x, y, default=0):
+        data = self.layer(tag)
+        if data is None:
+            return default
+        return data[y * self.width + x]
+
+    def is_walkable(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self._get(LAYER_WALKABLE, x, y, 1) != 0
+        return False
+
+    def terrain(self, x, y):
+        return self._get(LAYER_TERRAIN, x, y, TERRAIN_GROUND)
+
+    def spawn_zone(self, x, y):
+        return self._get(LAYER_SPAWN, x, y, 1)
+
+    def walkable_count(self):
+        if self._walkable_count is None:
+            data = self.layer(LAYER_WALKABLE)
+            size = self.width * self.height
+            self._walkable_count = size if data is None else size - bytes(data).count(0)
+        return self._walkable_count
+
+    def set_walkable(self, x, y, walkable):
+        # Writable copy on first edit (mmap views are read-only)
+        data = self.layer(LAYER_WALKABLE)
+        if not isinstance(data, bytearray):
+            data = bytearray(data if data is not None else b"\x01" * (self.width * self.height))
+            self._layers[LAYER_WALKABLE] = data
+        data[y * self.width + x] = 1 if walkable else 0
+        self._walkable_count = None
+
+def generate(width, height, seed, start=(2, 2), obstacle_ratio=0.08, safe_radius=3):
+    """
+    Build a simple terrain layout: grass patches plus water/rock clusters.
+    Every walkable tile stays reachable from the player start tile.
+    """
+    rng = random.Random(seed)
+    size = width * height
+    terrain = bytearray(size)
+    walkable = bytearray(b"\x01" * size)
+    spawn = bytearray(b"\x01" * size)
+
+    def near_start(x, y, r):
+        return abs(x - start[0]) + abs(y - start[1]) <= r
+
+    # Grass patches (cosmetic)
+    for _ in range(max(1, size // 60)):
+        cx, cy = rng.randrange(width), rng.randrange(height)
+        for y in range(max(0, cy - 2), min(height, cy + 3)):
+            for x in range(max(0, cx - 2), min(width, cx + 3)):
+                if rng.random() < 0.7:
+                    terrain[y * width + x] = TERRAIN_GRASS
+
+    # Obstacle clusters, never on or right next to the start tile
+    target = int(size * obstacle_ratio)
+    placed = 0
+    while placed < target:
+        kind = rng.choice((TERRAIN_WATER, TERRAIN_ROCK))
+        x, y = rng.randrange(width), rng.randrange(height)
+        for _ in range(rng.randint(2, 6)):
+            if 0 <= x < width and 0 <= y < height and not near_start(x, y, 1):
+                i = y * width + x
+                if walkable[i]:
+                    walkable[i] = 0
+                    terrain[i] = kind
+                    placed += 1
+            dx, dy = rng.choice(((0, 1), (0, -1), (1, 0), (-1, 0)))
+            x, y = x + dx, y + dy
+
+    # Open up anything cut off from the start tile
+    seen = bytearray(size)
+    queue = deque([start])
+    seen[start[1] * width + start[0]] = 1
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height:
+                i = ny * width + nx
+                if walkable[i] and not seen[i]:
+                    seen[i] = 1
+                    queue.append((nx, ny))
+    for i in range(size):
+        if walkable[i] and not seen[i]:
+            walkable[i] = 0
+            terrain[i] = TERRAIN_ROCK
+
+    # Spawn zones: walkable tiles outside the start area
+    for i in range(size):
+        if not walkable[i] or near_start(i % width, i // width, safe_radius):
+            spawn[i] = 0
+
+    return TileMap(width, height, {LAYER_WALKABLE: walkable, LAYER_TERRAIN: terrain, LAYER_SPAWN: spawn})
+
+if __name__ == "__main__":
+    # Regenerate the bundled map files: python -m src.systems.world.tilemap
+    from src.data.maps_db import MAPS_DB, MAPS_DIR
+    os.makedirs(MAPS_DIR, exist_ok=True)
+    for key, data in MAPS_DB.items():
+        filename = data.get("tilemap")
+        if not filename:
+            continue
+        tilemap = generate(data["width"], data["height"], seed=key)
+        path = os.path.join(MAPS_DIR, filename)
+        tilemap.save(path)
+        print(f"{path}: {os.path.getsize(path)} bytes, {tilemap.walkable_count()} walkable")
@@ -3,6 +3,15 @@ import math
 import os
 import time
 import sys
+from src.systems.world.tilemap import TERRAIN_GROUND, TERRAIN_GRASS, TERRAIN_WATER, TERRAIN_ROCK
+
+# Tile background per terrain type
+TERRAIN_COLORS = {
+    TERRAIN_GROUND: (220, 220, 220),
+    TERRAIN_GRASS: (200, 225, 190),
+    TERRAIN_WATER: (120, 160, 210),
+    TERRAIN_ROCK: (110, 105, 100),
+}
 
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -350,8 +359,9 @@ class Renderer:
                         self.screen.blit(txt, txt_rect)
                         
                 else:
-                    # Default ground tile
-                    self.draw_rounded_rect_with_text(screen_x, screen_y, "", (0,0,0), (220, 220, 220))
+                    # Ground tile, tinted by terrain type
+                    color = TERRAIN_COLORS.get(game_map.terrain_at(x, y), (220, 220, 220))
+                    self.draw_rounded_rect_with_text(screen_x, screen_y, "", (0,0,0), color)
 
     def draw_entity(self, entity, color, offset_x=50, offset_y=50):
         screen_x = offset_x + entity.x * (self.tile_size + self.margin)
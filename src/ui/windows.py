@@ -1,4 +1,19 @@
 import pygame
+from src.systems.equipment.inventory import POTION_POLICIES, POTION_SMALLEST_SUFFICIENT, POTION_LARGEST, POTION_PREFERRED
+from src.systems.world.targeting import TARGET_POLICIES
+
+POTION_POLICY_NAMES = {
+    POTION_SMALLEST_SUFFICIENT: "够用即可",
+    POTION_LARGEST: "大药优先",
+    POTION_PREFERRED: "指定药水",
+}
+
+TARGET_POLICY_NAMES = {
+    "nearest": "最近优先",
+    "lowest_hp": "残血优先",
+    "xp_per_second": "经验效率",
+    "quest_first": "任务优先",
+}
 
 
 class FloatingText:
@@ -415,11 +430,7 @@ class InputDialog(UIWindow):
             
         # Check Upgrade Stone
         # Find stone in inventory
-        stone_idx = -1
-        for i, it in enumerate(self.player.inventory.items):
-            if it and it.name == "强化石":
-                stone_idx = i
-                break
+        stone_idx = self.player.inventory.find_item_index("强化石")
                 
         if stone_idx == -1:
             if hasattr(self, 'game_engine') and self.game_engine:
@@ -431,12 +442,7 @@ class InputDialog(UIWindow):
         # Consume
         self.player.gold -= cost_gold
         # Remove 1 stone (handle stackable if needed, but UpgradeStone is usually stackable now)
-        # Check if stackable logic needs handling
-        stone_item = self.player.inventory.items[stone_idx]
-        if stone_item.stackable and stone_item.count > 1:
-            stone_item.count -= 1
-        else:
-            self.player.inventory.items[stone_idx] = None
+        self.player.inventory.take(stone_idx)
         
         # Success
         item.enhancement_level += 1
@@ -1273,23 +1279,11 @@ class EquipmentWindow(UIWindow):
                 self.player.ingots -= cost_ingots
                 
                 # Deduct Bone Powder
-                remaining_cost = cost_bone
-                for i in range(len(self.player.inventory.items)):
-                    it = self.player.inventory.items[i]
-                    if it and it.name == "骨粉":
-                        if it.count >= remaining_cost:
-                            it.count -= remaining_cost
-                            remaining_cost = 0
-                            if it.count == 0:
-                                self.player.inventory.items[i] = None
-                            break
-                        else:
-                            remaining_cost -= it.count
-                            self.player.inventory.items[i] = None
+                self.player.inventory.remove_by_name("骨粉", cost_bone)
                             
                 # Upgrade
                 self.player.equipment_slot_levels[self.selected_slot] = current_level + 1
-                self.player.recalculate_stats()
+                self.player.recalculate_stats((self.selected_slot,))
                 
                 if hasattr(self, 'game_engine') and self.game_engine:
                     self.game_engine.spawn_floating_text("锻体成功", self.player.x, self.player.y, (0, 255, 0))
@@ -1405,19 +1399,7 @@ class EquipmentWindow(UIWindow):
                 self.player.gold -= cost_gold
                 
                 # Deduct Stones
-                remaining_cost = cost_stone
-                for i in range(len(self.player.inventory.items)):
-                    it = self.player.inventory.items[i]
-                    if it and it.name == "强化石":
-                        if it.count >= remaining_cost:
-                            it.count -= remaining_cost
-                            remaining_cost = 0
-                            if it.count == 0:
-                                self.player.inventory.items[i] = None
-                            break
-                        else:
-                            remaining_cost -= it.count
-                            self.player.inventory.items[i] = None
+                self.player.inventory.remove_by_name("强化石", cost_stone)
                             
                 # Upgrade
                 item.enhancement_level = current_enh + 1
@@ -1927,38 +1909,27 @@ class InventoryWindow(UIWindow):
                     
                     stat_map = {
                         "attack": "攻击", "defense": "防御", "magic": "魔法",
-                        "taoism": "道术", "magic_defense": "魔防", "hp": "生命",
-                        "mp": "魔法", "accuracy": "准确", "dodge": "敏捷",
-                        "crit": "暴击", "luck": "幸运"
+                        "taoism": "道术", "magic_defense": "魔防", "max_hp": "生命",
+                        "max_mp": "魔法", "accuracy": "准确", "dodge": "敏捷",
+                        "crit": "暴击", "luck": "幸运", "attack_speed": "攻击速度",
+                        "cooldown_reduction": "冷却缩减"
                     }
+                    # Baseline from the same stat model, so diffs only show what the swap changes
+                    current_stats = self.player.preview_stats({})
 
                     for slot in compare_slots:
                         slot_lvl = self.player.equipment_slot_levels.get(slot, 0)
                         eq_item = self.player.equipment.get(slot)
                         
                         if eq_item:
-                            # Calculate Diffs
+                            # Calculate Diffs (whole character: forging, full body set and cultivation included)
                             current_diffs = {'gains': [], 'losses': []}
                             
-                            all_keys = set(self.hover_item.stats.keys()) | set(eq_item.stats.keys())
-                            for k in all_keys:
-                                # New Item Effective Stats
-                                base_new = self.hover_item.stats.get(k, 0)
-                                item_enh_new = getattr(self.hover_item, 'enhancement_level', 0)
-                                item_bonus_new = item_enh_new
-                                slot_bonus_new = int(base_new * slot_lvl * 0.01)
-                                if slot_lvl > 0 and slot_bonus_new < 1: slot_bonus_new = 1
-                                val_new = base_new + item_bonus_new + slot_bonus_new
-
-                                # Old Item Effective Stats
-                                base_old = eq_item.stats.get(k, 0)
-                                item_enh_old = getattr(eq_item, 'enhancement_level', 0)
-                                item_bonus_old = item_enh_old
-                                slot_bonus_old = int(base_old * slot_lvl * 0.01)
-                                if slot_lvl > 0 and slot_bonus_old < 1: slot_bonus_old = 1
-                                val_old = base_old + item_bonus_old + slot_bonus_old
-                                
-                                diff = val_new - val_old
+                            new_stats = self.player.preview_stats({"equip": {slot: self.hover_item}})
+                            for k, val_new in new_stats.items():
+                                diff = val_new - current_stats[k]
+                                if isinstance(diff, float) and diff.is_integer():
+                                    diff = int(diff)
                                 if diff != 0:
                                     cn_key = stat_map.get(k, k)
                                     sign = "+" if diff > 0 else ""
@@ -2164,7 +2135,7 @@ class InventoryWindow(UIWindow):
 
 class SettingsWindow(UIWindow):
     def __init__(self, renderer, game_engine):
-        super().__init__("游戏设置", 400, 150, 300, 350, renderer)
+        super().__init__("游戏设置", 400, 150, 300, 410, renderer)
         self.game_engine = game_engine
         
         # Auto Save
@@ -2178,6 +2149,12 @@ class SettingsWindow(UIWindow):
         self.mp_input_rect = pygame.Rect(self.rect.x + 160, self.rect.y + 190, 80, 25)
         # Enabled Checkbox
         self.ap_checkbox_rect = pygame.Rect(self.rect.x + 160, self.rect.y + 230, 20, 20)
+        # Potion policy (click to cycle)
+        self.policy_rect = pygame.Rect(self.rect.x + 160, self.rect.y + 255, 110, 20)
+        # Auto Equip Checkbox
+        self.ae_checkbox_rect = pygame.Rect(self.rect.x + 160, self.rect.y + 285, 20, 20)
+        # Auto-pilot target policy (click to cycle)
+        self.tp_rect = pygame.Rect(self.rect.x + 160, self.rect.y + 315, 110, 20)
         
         self.active_input = None # None, "as_interval", "hp_threshold", "mp_threshold"
         
@@ -2251,12 +2228,40 @@ class SettingsWindow(UIWindow):
             pygame.draw.line(screen, (0, 0, 0), (self.ap_checkbox_rect.x + 4, self.ap_checkbox_rect.y + 10), (self.ap_checkbox_rect.x + 8, self.ap_checkbox_rect.y + 16), 2)
             pygame.draw.line(screen, (0, 0, 0), (self.ap_checkbox_rect.x + 8, self.ap_checkbox_rect.y + 16), (self.ap_checkbox_rect.x + 16, self.ap_checkbox_rect.y + 4), 2)
 
+        # Potion policy
+        lbl_policy = small_font.render("喝药策略:", True, (0, 0, 0))
+        screen.blit(lbl_policy, (self.rect.x + 20, self.rect.y + 257))
+        pygame.draw.rect(screen, (240, 240, 240), self.policy_rect)
+        pygame.draw.rect(screen, (0, 0, 0), self.policy_rect, 1)
+        policy = self.game_engine.player.auto_potion_settings.get("potion_policy", POTION_SMALLEST_SUFFICIENT)
+        txt_surf = small_font.render(POTION_POLICY_NAMES.get(policy, policy), True, (0, 0, 0))
+        screen.blit(txt_surf, (self.policy_rect.x + 5, self.policy_rect.y + 2))
+
+        # Auto Equip Checkbox
+        lbl_ae_enable = font.render("自动穿戴装备:", True, (0, 0, 0))
+        screen.blit(lbl_ae_enable, (self.rect.x + 20, self.rect.y + 285))
+
+        pygame.draw.rect(screen, (255, 255, 255), self.ae_checkbox_rect)
+        pygame.draw.rect(screen, (0, 0, 0), self.ae_checkbox_rect, 1)
+        if self.game_engine.auto_equip_enabled:
+            pygame.draw.line(screen, (0, 0, 0), (self.ae_checkbox_rect.x + 4, self.ae_checkbox_rect.y + 10), (self.ae_checkbox_rect.x + 8, self.ae_checkbox_rect.y + 16), 2)
+            pygame.draw.line(screen, (0, 0, 0), (self.ae_checkbox_rect.x + 8, self.ae_checkbox_rect.y + 16), (self.ae_checkbox_rect.x + 16, self.ae_checkbox_rect.y + 4), 2)
+
+        # Target policy
+        lbl_tp = small_font.render("挂机目标:", True, (0, 0, 0))
+        screen.blit(lbl_tp, (self.rect.x + 20, self.rect.y + 317))
+        pygame.draw.rect(screen, (240, 240, 240), self.tp_rect)
+        pygame.draw.rect(screen, (0, 0, 0), self.tp_rect, 1)
+        target_policy = self.game_engine.target_policy
+        txt_surf = small_font.render(TARGET_POLICY_NAMES.get(target_policy, target_policy), True, (0, 0, 0))
+        screen.blit(txt_surf, (self.tp_rect.x + 5, self.tp_rect.y + 2))
+
         # Info
         info = small_font.render("关闭窗口或点击X即可保存设置", True, (100, 100, 100))
-        screen.blit(info, (self.rect.x + 20, self.rect.y + 280))
+        screen.blit(info, (self.rect.x + 20, self.rect.y + 345))
         
         info2 = small_font.render("注: 自动使用背包中可用的恢复药水", True, (100, 100, 100))
-        screen.blit(info2, (self.rect.x + 20, self.rect.y + 300))
+        screen.blit(info2, (self.rect.x + 20, self.rect.y + 365))
 
     def handle_click(self, pos, button=1):
         if not super().handle_click(pos, button):
@@ -2280,6 +2285,24 @@ class SettingsWindow(UIWindow):
         if self.ap_checkbox_rect.collidepoint(pos):
             enabled = self.game_engine.player.auto_potion_settings.get("enabled", False)
             self.game_engine.player.auto_potion_settings["enabled"] = not enabled
+            self.game_engine.player.refresh_potion_triggers()
+
+        if self.policy_rect.collidepoint(pos):
+            settings = self.game_engine.player.auto_potion_settings
+            policy = settings.get("potion_policy", POTION_SMALLEST_SUFFICIENT)
+            idx = POTION_POLICIES.index(policy) if policy in POTION_POLICIES else -1
+            settings["potion_policy"] = POTION_POLICIES[(idx + 1) % len(POTION_POLICIES)]
+
+        if self.ae_checkbox_rect.collidepoint(pos):
+            self.game_engine.auto_equip_enabled = not self.game_engine.auto_equip_enabled
+            if self.game_engine.auto_equip_enabled:
+                self.game_engine.perform_auto_equip()
+
+        if self.tp_rect.collidepoint(pos):
+            names = list(TARGET_POLICIES)
+            current = self.game_engine.target_policy
+            idx = names.index(current) if current in names else -1
+            self.game_engine.target_policy = names[(idx + 1) % len(names)]
             
         return True
 
@@ -2308,6 +2331,7 @@ class SettingsWindow(UIWindow):
                 if 0 <= val <= 100: self.game_engine.player.auto_potion_settings["hp_threshold"] = val
             elif self.active_input == "mp_threshold":
                 if 0 <= val <= 100: self.game_engine.player.auto_potion_settings["mp_threshold"] = val
+            self.game_engine.player.refresh_potion_triggers()
         except:
             pass
                 
@@ -0,0 +1,45 @@
+import pickle
+
+from src.systems.character.player import Player, Profession
+from src.systems.equipment.item import Equipment, ItemType
+
+
+def make_gear(name, item_type, **stats):
+    item = Equipment(name, item_type)
+    for stat, value in stats.items():
+        item.add_stat(stat, value)
+    return item
+
+
+def equip(player, item, slot=None):
+    # Gear is equipped from the bag
+    player.inventory.add_item(item)
+    ok, msg = player.equip_item(item, target_slot=slot)
+    assert ok, msg
+
+
+def geared_player():
+    player = Player("测试", Profession.WARRIOR)
+    player.level = 40
+    player.initialize_stats()
+    equip(player, make_gear("剑", ItemType.WEAPON, attack=5))
+    equip(player, make_gear("戒指", ItemType.RING, attack=2), "ring_l")
+    equip(player, make_gear("盔", ItemType.HELMET, defense=3))
+    return player
+
+
+def test_equip_after_load_keeps_other_slots():
+    player = pickle.loads(pickle.dumps(geared_player()))
+    equip(player, make_gear("甲", ItemType.ARMOR, defense=4))
+    attack, defense = player.attack, player.defense
+    player.recalculate_stats()
+    assert (player.attack, player.defense) == (attack, defense)
+    assert player.equipment["weapon"] is not None and player.equipment["ring_l"] is not None
+
+
+def test_in_place_stat_edit_is_picked_up():
+    player = geared_player()
+    attack = player.attack
+    player.equipment["weapon"].add_stat("attack", 15)
+    player.recalculate_stats()
+    assert player.attack == attack + 10